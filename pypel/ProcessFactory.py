@@ -11,6 +11,12 @@ class ProcessConfigMandatory(TypedDict):
 
 class ProcessConfig(ProcessConfigMandatory, total=False):
     name: str
+    chunksize: int
+    inplace: bool
+    workers: int
+    max_in_flight: int
+    pipelined: bool
+    parts: int
 
 
 class ProcessFactory:
@@ -34,21 +40,31 @@ class ProcessFactory:
         ...                                        "cafile": "path_to_cafile",
         ...                                        "scheme": "https",
         ...                                        "port": "9200",
-        ...                                        "host": "localhost"}}}
+        ...                                        "host": "localhost"}},
+        ...              "chunksize": 100000}
         This config would generate a process with the default Extractor, the transformers BaseTransformer
             AND MinimalTransformer and a loader `Loader` with instance parameters `backup` and `path_to_export_folder`
             set to `True` and `/` respectively. Loader will try to connect to elasticsearch using parameters from
-            "es_config".
+            "es_config". Files will be streamed through the process by chunks of 100 000 rows.
 
         :param process_config: Configuration of the process' E/T/L classes as a dictionnary
         :return: A Process instance with the E/T/L classes specified in the configuration
         """
-        extractor = self.create_subclasses(process_config.get("Extractor"))
+        extractor_config = process_config.get("Extractor")
+        if isinstance(extractor_config, dict) and isinstance(extractor_config.get("dtype_planner"), dict):
+            extractor_config["dtype_planner"].setdefault("name", process_config.get("name"))
+        extractor = self.create_subclasses(extractor_config)
         transformers = self.create_subclasses(process_config.get("Transformers"))
         loader = self.create_subclasses(process_config.get("Loader"))
         return Process(extractor=extractor,
                        transformer=transformers,
-                       loader=loader)
+                       loader=loader,
+                       chunksize=process_config.get("chunksize"),
+                       inplace=process_config.get("inplace", False),
+                       workers=process_config.get("workers", 1),
+                       max_in_flight=process_config.get("max_in_flight"),
+                       pipelined=process_config.get("pipelined", False),
+                       parts=process_config.get("parts"))
 
     def create_subclasses(self, class_config: Union[Dict[str, str], List[Dict[str, str]]]):
         if class_config is None:
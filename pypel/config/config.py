@@ -9,7 +9,9 @@ from typing import Dict, Any
 
 
 _conf = {"LOGS": True,
-         "LOGS_LEVEL": "INFO"}
+         "LOGS_LEVEL": "INFO",
+         "EXTRACTION_CACHE": True,
+         "REFERENTIAL_CACHE_SIZE": 512 * 1024 ** 2}
 
 
 def set_config(**kwargs) -> None:
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pypel.config.config import get_config
+from typing import Dict, Optional, Union, Any
+
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
+
+
+def _fingerprint(file_path: Union[str, os.PathLike], offset: int, prefix_size: int = 64 * 1024,
+                 suffix_size: int = 4 * 1024) -> str:
+    """
+    Returns a hash of the first `prefix_size` bytes of the file and of the `suffix_size` bytes preceding `offset`, so
+        that rewriting either the header or the already processed records changes it.
+
+    :param file_path: path to the file
+    :param offset: the offset up to which the file was processed
+    :param prefix_size: the number of bytes hashed from the start of the file
+    :param suffix_size: the number of bytes hashed before `offset`
+    :return: a hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        digest.update(file.read(min(prefix_size, offset)))
+        start = max(offset - suffix_size, min(prefix_size, offset))
+        file.seek(start)
+        digest.update(file.read(offset - start))
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """
+    Small JSON store of the byte offsets up to which files were processed, with a fingerprint of their content up to
+        that offset, used by incremental extractions to only parse the records appended since the last run.
+
+    Extractions stage the checkpoint of the file they read, the checkpoint is only saved by `commit`, which processes
+        call once the file is loaded : a run failing midway parses the same records again on the next run.
+
+    :param path: path to the JSON file holding the checkpoints, created on the first commit
+    """
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = path
+        self._staged: Dict[str, Dict[str, Any]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.isfile(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def get(self, file_path: Union[str, os.PathLike]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the committed checkpoint of the file, or None if it was never committed.
+
+        :param file_path: path to the file
+        :return: a dictionnary with the committed `offset` and the file's `fingerprint`
+        """
+        return self._load().get(os.path.abspath(file_path))
+
+    def staged(self, file_path: Union[str, os.PathLike]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the checkpoint staged by the last extraction of the file, or None if there is none.
+
+        :param file_path: path to the file
+        :return: a dictionnary with the extracted `offset` and the file's `fingerprint`
+        """
+        return self._staged.get(os.path.abspath(file_path))
+
+    def stage(self, file_path: Union[str, os.PathLike], checkpoint: Dict[str, Any]) -> None:
+        """
+        Stages the checkpoint of an extraction, to be saved by `commit` once the extracted records are loaded.
+
+        :param file_path: path to the file
+        :param checkpoint: a dictionnary with the extracted `offset` and the file's `fingerprint`
+        :return: None
+        """
+        self._staged[os.path.abspath(file_path)] = checkpoint
+
+    def commit(self, file_path: Union[str, os.PathLike], checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Saves the passed checkpoint, or the one staged for the file. Does nothing if there is none.
+
+        :param file_path: path to the file
+        :param checkpoint: the checkpoint to save, e.g. staged by an extraction in another process
+        :return: None
+        """
+        key = os.path.abspath(file_path)
+        checkpoint = checkpoint if checkpoint is not None else self._staged.pop(key, None)
+        if checkpoint is None:
+            return
+        checkpoints = self._load()
+        checkpoints[key] = checkpoint
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.path)}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoints, f, indent=2)
+        os.replace(tmp_path, self.path)
+        if get_config()["LOGS"]:
+            logger.debug(f"Committed offset {checkpoint['offset']} of file \'{file_path}\'")
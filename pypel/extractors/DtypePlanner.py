@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import warnings
+import numpy as np
+import pandas as pd
+from pypel.config.config import get_config
+from typing import Dict, Optional, List, Union, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
+
+_INTEGER_DTYPES = ["Int8", "Int16", "Int32", "Int64"]
+
+
+def _integer_dtype(column: pd.Series) -> Optional[str]:
+    """
+    Returns the smallest nullable integer dtype holding twice the sampled range of the column, or None if the column is
+        not made of integers.
+    """
+    values = column.dropna()
+    if values.empty or not np.array_equal(values, np.floor(values)):
+        return None
+    bound = 2 * max(abs(int(values.min())), abs(int(values.max())))  # python ints do not overflow
+    for dtype in _INTEGER_DTYPES:
+        if bound <= np.iinfo(dtype.lower()).max:
+            return dtype
+    return None
+
+
+def _float_dtype(column: pd.Series) -> str:
+    """Returns float32 if every sampled value keeps its decimal representation in float32, float64 otherwise."""
+    values = column.dropna().unique()
+    with np.errstate(over="ignore"):
+        if np.array_equal(values.astype(np.float32).astype(str).astype(np.float64), values):
+            return "float32"
+    return "float64"
+
+
+def _fits(column: pd.Series, dtype: str) -> bool:
+    """Whether every value of the parsed column is kept as is by the passed planned numeric dtype."""
+    if column.dtype.kind not in "iuf" and not pd.api.types.is_integer_dtype(column.dtype):
+        return False
+    values = column.dropna()
+    if values.empty:
+        return True
+    if dtype == "float32":
+        return _float_dtype(values) == "float32"
+    if not np.array_equal(values, np.floor(values)):
+        return False
+    info = np.iinfo(dtype.lower())
+    return info.min <= int(values.min()) and int(values.max()) <= info.max
+
+
+class DtypePlanner:
+    """
+    Infers memory-efficient dtypes from a sample of the extracted files, for the extractors to parse them with:
+        low-cardinality strings become categoricals, other strings pandas strings, integers the smallest nullable
+        integer holding twice their sampled range and floats float32 when no sampled value loses digits.
+
+    Strings dtypes are passed to the parser, while numeric columns are parsed with pandas' dtypes then downcast to
+        their planned dtype, cf `downcast` : values out of the sampled range keep the column in its parsed dtype.
+
+    The planned dtypes are saved as JSON in `schema_dir`, under the name of the process, along with the columns of the
+        file they were planned from : they are planned again when a file's columns differ.
+
+    :param name: the name the dtypes are saved under, defaults to the name of the process the extractor belongs to when
+        created from a configuration file
+    :param schema_dir: the folder holding the saved dtypes, dtypes are inferred at each extraction if None
+    :param sample_rows: the number of rows the dtypes are inferred from
+    :param max_category_ratio: strings columns with at most this ratio of distinct values become categoricals
+    """
+    def __init__(self, name: Optional[str] = None,
+                 schema_dir: Optional[Union[str, os.PathLike]] = None,
+                 sample_rows: int = 10000,
+                 max_category_ratio: float = 0.5):
+        self.name = name
+        self.schema_dir = schema_dir
+        self.sample_rows = sample_rows
+        self.max_category_ratio = max_category_ratio
+
+    @property
+    def schema_path(self) -> Optional[str]:
+        if self.schema_dir is None or self.name is None:
+            return None
+        return os.path.join(self.schema_dir, f"{self.name}.json")
+
+    def infer(self, sample: pd.DataFrame, skipped: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Returns the dtypes planned for the columns of the sample.
+
+        :param sample: the first rows of the file
+        :param skipped: columns left out of the plan, e.g. those with converters or parsed as dates
+        :return: a dictionnary of dtypes names keyed by column
+        """
+        dtypes = {}
+        for name, column in sample.items():
+            if name in (skipped or []) or not isinstance(name, str):
+                continue
+            if column.dtype.kind in "iuf":
+                dtype = _integer_dtype(column)
+                if dtype is None and column.dtype.kind == "f":
+                    dtype = _float_dtype(column)
+            elif column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) == "string":
+                values = column.dropna()
+                dtype = "category" if values.nunique() <= self.max_category_ratio * len(values) else "string"
+            else:
+                dtype = None
+            if dtype is not None:
+                dtypes[name] = dtype
+        return dtypes
+
+    def plan(self, read_sample: Callable[[int], pd.DataFrame], skipped: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Returns the saved dtypes if they were planned for the same columns, otherwise infers them from a sample and
+            saves them.
+
+        :param read_sample: function returning the first rows of the file, given their number
+        :param skipped: columns left out of the plan, e.g. those with converters or parsed as dates
+        :return: a dictionnary of dtypes names keyed by column
+        """
+        path = self.schema_path
+        if path is None:
+            return self.infer(read_sample(self.sample_rows), skipped)
+        columns = [str(column) for column in read_sample(0).columns]
+        if os.path.isfile(path):
+            with open(path) as f:
+                schema = json.load(f)
+            if schema.get("columns") == columns:
+                return schema["dtypes"]
+            logger.info(f"Columns changed since the dtypes saved in \'{path}\' were planned, planning them again")
+        dtypes = self.infer(read_sample(self.sample_rows), skipped)
+        os.makedirs(self.schema_dir, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"columns": columns, "dtypes": dtypes}, f, indent=2)
+        if get_config()["LOGS"]:
+            logger.debug(f"Saved planned dtypes to \'{path}\'")
+        return dtypes
+
+    def apply(self, read_sample: Callable[[int], pd.DataFrame],
+              converters: Optional[Dict[str, Any]],
+              dates: Optional[List[str]],
+              kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Returns the extraction's pandas args with the planned strings dtypes added to `dtype`, and the planned numeric
+            dtypes, to be applied once parsed by `downcast`. Dtypes passed explicitly win.
+
+        :param read_sample: function returning the first rows of the file, given their number
+        :param converters: the extraction's converters, whose columns are not planned
+        :param dates: the extraction's dates, whose columns are not planned
+        :param kwargs: the extraction's additional pandas args
+        :return: the updated pandas args, and the numeric dtypes keyed by column
+        """
+        if not isinstance(kwargs.get("dtype") or {}, dict):  # a single dtype for all columns
+            return kwargs, {}
+        skipped = list(converters or {}) + list(dates or [])
+        planned = self.plan(read_sample, skipped)
+        if "usecols" in kwargs and kwargs["usecols"] is not None and not callable(kwargs["usecols"]):
+            planned = {name: dtype for name, dtype in planned.items() if name in kwargs["usecols"]}
+        explicit = kwargs.get("dtype") or {}
+        planned = {name: dtype for name, dtype in planned.items() if name not in explicit}
+        numeric = {name: dtype for name, dtype in planned.items() if dtype in _INTEGER_DTYPES or dtype == "float32"}
+        strings = {name: dtype for name, dtype in planned.items() if name not in numeric}
+        return {**kwargs, "dtype": {**strings, **explicit}}, numeric
+
+    @staticmethod
+    def downcast(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+        """
+        Casts the parsed columns to their planned numeric dtypes, keeping the columns holding values these dtypes
+            cannot (e.g. out of the sampled range) in their parsed dtype, with a warning.
+
+        :param df: the parsed dataframe
+        :param dtypes: the numeric dtypes returned by `apply`
+        :return: the downcast dataframe
+        """
+        for name, dtype in dtypes.items():
+            if name not in df.columns or df[name].dtype == dtype:
+                continue
+            if _fits(df[name], dtype):
+                df[name] = df[name].astype(dtype)
+            else:
+                warnings.warn(f"Column {name} holds values its planned dtype {dtype} cannot, it is kept as "
+                              f"{df[name].dtype}. Plan the dtypes again from a larger sample.")
+        return df
@@ -0,0 +1,160 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import types
+import uuid
+import pandas as pd
+from pypel.config.config import get_config
+from typing import Dict, Optional, Set, Union, Any
+
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
+
+
+try:
+    from pyarrow import ArrowException
+except ImportError:  # pragma: no cover, the cache cannot write parquet files without pyarrow anyway
+    ArrowException = ValueError
+
+
+def _cell_contents(cell: Any) -> Any:
+    try:
+        return cell.cell_contents
+    except ValueError:  # the variable is not assigned yet
+        return "<empty>"
+
+
+def _describe(value: Any, _seen: Optional[Set[int]] = None) -> Any:
+    """
+    Returns a json-serializable description of an extraction parameter, stable across runs. Functions are described
+        by their name and a hash of their code, constants, closure & default values, so that two lambdas with different
+        bodies get different descriptions.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:  # e.g. a recursive function found in its own closure
+        return "<recursion>"
+    if isinstance(value, dict):
+        return {str(k): _describe(v, seen) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(v, seen) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_describe(v, seen) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, types.CodeType):
+        return [value.co_code.hex(), _describe(value.co_consts, seen), list(value.co_names)]
+    if isinstance(value, functools.partial):
+        return [_describe(value.func, seen), _describe(value.args, seen), _describe(value.keywords, seen)]
+    if callable(value):
+        name = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+        function = getattr(value, "__func__", value)  # bound methods
+        code = getattr(function, "__code__", None)
+        if code is None:  # classes & builtins
+            return name
+        seen = seen | {id(value)}
+        closure = [_cell_contents(cell) for cell in function.__closure__ or ()]
+        description = [_describe(code, seen), _describe(closure, seen), _describe(function.__defaults__, seen),
+                       _describe(function.__kwdefaults__, seen)]
+        digest = hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+        return f"{name}:{digest}"
+    return repr(value)
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted dataframes, stored as parquet files so that later extractions are memory-mapped reads.
+        Entries are keyed by the file's absolute path, size & modification time (plus its content's hash if
+        `hash_content` is True) and the extraction parameters. Least recently used entries are evicted once the cache
+        grows over `max_size` bytes. Requires pyarrow.
+
+    The cache can be bypassed without changing the extractors' configuration with `set_config(EXTRACTION_CACHE=False)`
+        or the `--no-cache` command line flag.
+
+    :param cache_dir: the folder holding the cached files, created if missing
+    :param max_size: the maximum size of the cache in bytes
+    :param hash_content: if True, the file's content is hashed into the key, catching rewrites preserving the size and
+        modification time at the cost of a full read of the file
+    """
+    def __init__(self, cache_dir: Union[str, os.PathLike], max_size: int = 1024 ** 3, hash_content: bool = False):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hash_content = hash_content
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, file_path: Union[str, os.PathLike], params: Dict[str, Any]) -> str:
+        """
+        Returns the key of the passed file extracted with the passed parameters.
+
+        :param file_path: path to the extracted file
+        :param params: the extraction parameters
+        :return: a hexadecimal digest
+        """
+        stat = os.stat(file_path)
+        fingerprint = [os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, _describe(params)]
+        if self.hash_content:
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as file:
+                for block in iter(lambda: file.read(1024 ** 2), b""):
+                    digest.update(block)
+            fingerprint.append(digest.hexdigest())
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+    def get(self, file_path: Union[str, os.PathLike], params: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached dataframe for the passed file & parameters, or None if there is none.
+
+        :param file_path: path to the extracted file
+        :param params: the extraction parameters
+        :return: the cached dataframe, or None
+        """
+        path = self._path(self.key(file_path, params))
+        if not os.path.isfile(path):
+            return None
+        os.utime(path)  # marks the entry as recently used
+        logger.debug(f"Extraction cache hit for file \'{file_path}\'")
+        return pd.read_parquet(path, memory_map=True)
+
+    def put(self, file_path: Union[str, os.PathLike], params: Dict[str, Any], df: pd.DataFrame) -> None:
+        """
+        Stores the dataframe extracted from the passed file with the passed parameters, then evicts the least recently
+            used entries if the cache is over its maximum size. Dataframes parquet cannot store (e.g. non-string column
+            names or mixed-type columns) are not cached.
+
+        :param file_path: path to the extracted file
+        :param params: the extraction parameters
+        :param df: the extracted dataframe
+        :return: None
+        """
+        path = self._path(self.key(file_path, params))
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            df.to_parquet(tmp_path)
+        except (ValueError, TypeError, ArrowException) as e:
+            logger.debug(f"Could not cache the extraction of file \'{file_path}\' : {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache's size is under `self.max_size`.
+
+        :return: None
+        """
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".parquet")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            size -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
@@ -1,16 +1,534 @@
 import abc
+import bz2
+import concurrent.futures
+import contextlib
+import gzip
+import io
+import lzma
+import operator
+import os
+import numpy as np
 import pandas as pd
 import re
 import openpyxl
+from pandas.io.parsers import TextParser
 from pypel.utils.utils import arrayer
+from pypel.extractors.ExtractionCache import ExtractionCache
+from pypel.extractors.DtypePlanner import DtypePlanner
+from pypel.extractors.Checkpoints import CheckpointStore, _fingerprint
 import warnings
 import logging
 from pypel.config.config import get_config
-from typing import Dict, Optional, List, Union, Any
+from typing import Dict, Optional, List, Union, Any, Iterator, Callable, Tuple, Sequence, ContextManager, IO
 
 logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
 
+_COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+_OPERATORS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt,
+              ">=": operator.ge, "in": lambda column, values: column.isin(values),
+              "not in": lambda column, values: ~column.isin(values)}
+
+
+def _excel_column_names(header: Sequence[Any]) -> List[Any]:
+    """
+    Returns the column names `pandas.read_excel` gives to the passed header row, parsing it with the same pandas
+        parser : empty cells are named `Unnamed: i` and duplicated names are suffixed with `.1`, `.2`...
+    """
+    with TextParser([["" if name is None else name for name in header]], header=0) as parser:
+        return list(parser.read().columns)
+
+
+def _split_compression(file_path: Union[str, bytes]) -> Tuple[Union[str, bytes], Optional[str]]:
+    """Returns the file path without its compression extension, and the compression, None if it is not compressed."""
+    for extension, compression in _COMPRESSIONS.items():
+        if file_path.endswith(extension):
+            return file_path[:-len(extension)], compression
+    return file_path, None
+
+
+def _open_compressed(file_path: Union[str, bytes], compression: str) -> IO[bytes]:
+    """Opens the compressed file as a stream of its decompressed bytes, decompressed as they are read."""
+    if compression == "gzip":
+        return gzip.open(file_path, "rb")
+    elif compression == "bz2":
+        return bz2.open(file_path, "rb")
+    elif compression == "xz":
+        return lzma.open(file_path, "rb")
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Reading zstd compressed files requires zstandard, install it with "
+                          "`pip install pypel[zstd]`") from e
+    return zstandard.open(file_path, "rb")
+
+
+def _log_xlsx_rows(file_path: Union[str, bytes], sheet_name: Union[None, int, str, List[Union[int, str]]]) -> None:
+    """
+    Logs the number of rows of the targeted sheet(s) of the xlsx file. The workbook is opened in read-only mode so the
+        row count comes from the sheets' dimension metadata, without parsing their cells.
+
+    :param file_path: absolute path to the file
+    :param sheet_name: the sheet(s) to log the row count of, as passed to pandas' read_excel
+    :return: None
+    """
+    try:
+        file_name = re.findall(r"(?<=/)[.\s\w_-]+$", file_path)[0]
+    except IndexError:
+        warnings.warn(f"Could not get file name from file path :"
+                      f"{file_path}")
+        file_name = "ERROR"
+    wb = openpyxl.load_workbook(filename=file_path, read_only=True)
+    try:
+        if sheet_name is None:
+            sheets = wb.worksheets
+        else:
+            names = sheet_name if isinstance(sheet_name, list) else [sheet_name]
+            sheets = [wb.worksheets[name] if isinstance(name, int) else wb[name] for name in names]
+        for sheet in sheets:
+            excel_rows = sheet.max_row if sheet.max_row is not None else "an unknown number of"
+            logger.debug(f"{excel_rows} rows in the excel sheet \'{sheet.title}\'   from file \'{file_name}\'")
+    finally:
+        wb.close()
+
+
+def _log_csv_rows(file_path: Union[str, bytes], row_count: int) -> None:
+    """
+    Logs the number of rows parsed from the csv. The count comes from the parse itself so the file is never read twice.
+
+    :param file_path: path to the file
+    :param row_count: the number of rows parsed, header excluded
+    :return: None
+    """
+    file_name = re.findall(r"(?<=/)[^/]*$", file_path)[0]
+    logger.debug(f"{row_count} rows (excluding header) read from the csv {file_name}")
+
+
+def _read_excel_sheet(file_path: Union[str, bytes],
+                      sheet_name: Union[int, str],
+                      converters: Optional[Dict[str, Any]],
+                      skiprows: Optional[int],
+                      engine: Optional[str],
+                      kwargs: Dict[str, Any]) -> pd.DataFrame:
+    """Reads a single sheet, with the same skiprows semantics as the extractors. Executed in worker processes."""
+    if skiprows is not None:
+        skiprows = arrayer(skiprows)
+    return pd.read_excel(io=file_path,
+                         skiprows=skiprows,
+                         sheet_name=sheet_name,
+                         converters=converters,
+                         engine=engine,
+                         **kwargs)
+
+
+def _extract_sheets(file_path: Union[str, bytes],
+                    sheet_names: Optional[List[Union[int, str]]],
+                    workers: Optional[int],
+                    sheet_column: Optional[str],
+                    converters: Optional[Dict[str, Any]],
+                    skiprows: Optional[int],
+                    engine: Optional[str],
+                    kwargs: Dict[str, Any]) -> Union[Dict[Union[int, str], pd.DataFrame], pd.DataFrame]:
+    """
+    Parses the sheets of an excel file in parallel worker processes, one sheet per task.
+
+    :return: a dictionnary of dataframes keyed by sheet, or a single dataframe if `sheet_column` is passed
+    """
+    if sheet_names is None:
+        with pd.ExcelFile(file_path, engine=engine) as excel_file:
+            sheet_names = excel_file.sheet_names
+    if get_config()["LOGS"]:
+        logger.debug(f"Extracting {len(sheet_names)} sheets from file \'{file_path}\' in parallel")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read_excel_sheet, file_path, name, converters, skiprows, engine, kwargs)
+                   for name in sheet_names]
+        frames = {name: future.result() for name, future in zip(sheet_names, futures)}
+    if sheet_column is None:
+        return frames
+    return pd.concat([df.assign(**{sheet_column: name}) for name, df in frames.items()], ignore_index=True)
+
+
+def _extract_with_cache(cache: Optional[ExtractionCache],
+                        file_path: Union[str, bytes],
+                        params: Dict[str, Any],
+                        read: Callable[[], Any]) -> Any:
+    """
+    Returns the cached extraction of the file with the passed parameters if any, otherwise calls `read` and caches its
+        result. Multi-sheets results (dictionnaries of dataframes) are not cached.
+    """
+    if cache is None or not get_config()["EXTRACTION_CACHE"]:
+        return read()
+    df = cache.get(file_path, params)
+    if df is None:
+        df = read()
+        if isinstance(df, pd.DataFrame):
+            cache.put(file_path, params, df)
+    return df
+
+
+def _check_arrow_strings() -> None:
+    """Raises if this pandas version has no arrow-backed string dtype."""
+    try:
+        pd.StringDtype("pyarrow")
+    except TypeError as e:
+        raise ValueError(f"arrow_strings requires pandas>=1.3, pandas {pd.__version__} is installed") from e
+
+
+def _to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts the object columns holding only strings (and missing values) to arrow-backed string columns."""
+    for column in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[column], skipna=True) == "string":
+            df[column] = df[column].astype(pd.StringDtype("pyarrow"))
+    return df
+
+
+def _is_str_dtype(dtype: Any) -> bool:
+    """Whether pandas reads columns of the passed dtype as python strings, e.g. str or object."""
+    dtype = pd.api.types.pandas_dtype(dtype)
+    return isinstance(dtype, np.dtype) and dtype.kind in "OU"
+
+
+def _arrow_type(dtype: Any) -> Any:
+    """Returns the arrow type to read a column of the passed pandas dtype as, None to let pyarrow infer it."""
+    import pyarrow as pa
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if _is_str_dtype(dtype) or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+        return pa.string()
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return pa.from_numpy_dtype(dtype)
+    return None
+
+
+class _Prefixed(io.RawIOBase):
+    """Readable stream of the passed bytes followed by the rest of the passed stream."""
+    def __init__(self, prefix: bytes, stream: IO[bytes]):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _arrow_csv_options(file_path: Union[str, bytes, IO[bytes]],
+                       converters: Dict[str, Any],
+                       dates: Optional[List[str]],
+                       skiprows: Optional[int],
+                       sep: str,
+                       encoding: str,
+                       quotechar: str,
+                       header: Optional[int],
+                       usecols: Optional[List[str]],
+                       dtype: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    """
+    Translates the pandas args of `_read_csv_arrow` to pyarrow's csv options. The columns pyarrow infers as dates or
+        times from the file's first block are read as strings unless listed in `dates`.
+
+    :return: the source to read, as a stream replaying the sampled block if a stream is passed, and pyarrow's read,
+        parse & convert options
+    """
+    import pyarrow as pa
+    import pyarrow.csv
+
+    def arrow_name(column: Any) -> str:
+        return f"f{column}" if header is None else str(column)
+
+    column_types = {arrow_name(column): _arrow_type(type_) for column, type_ in dtype.items()}
+    column_types = {column: type_ for column, type_ in column_types.items() if type_ is not None}
+    column_types.update({arrow_name(column): pa.string() for column in converters})
+    read_options = pyarrow.csv.ReadOptions(use_threads=True, skip_rows=skiprows or 0,
+                                           autogenerate_column_names=header is None, encoding=encoding)
+    parse_options = pyarrow.csv.ParseOptions(delimiter=sep, quote_char=quotechar)
+    if isinstance(file_path, (str, bytes, os.PathLike)):
+        with open(file_path, "rb") as file:
+            sample = file.read(read_options.block_size)
+        source = file_path
+    else:
+        sample = file_path.read(read_options.block_size)
+        source = io.BufferedReader(_Prefixed(sample, file_path))
+    try:
+        inferred = pyarrow.csv.read_csv(io.BytesIO(sample[:sample.rfind(b"\n") + 1] or sample), read_options,
+                                        parse_options,
+                                        pyarrow.csv.ConvertOptions(column_types=column_types, include_columns=usecols,
+                                                                   strings_can_be_null=True)).schema
+    except pa.ArrowInvalid:  # left for the full read to raise
+        inferred = pa.schema([])
+    date_names = {arrow_name(column) for column in dates or []}
+    for field in inferred:
+        if pa.types.is_temporal(field.type) and field.name not in column_types and field.name not in date_names:
+            column_types[field.name] = pa.string()
+    convert_options = pyarrow.csv.ConvertOptions(column_types=column_types, include_columns=usecols,
+                                                 strings_can_be_null=True)
+    return source, read_options, parse_options, convert_options
+
+
+def _read_csv_arrow(file_path: Union[str, bytes, IO[bytes]],
+                    converters: Optional[Dict[str, Any]] = None,
+                    dates: Optional[List[str]] = False,
+                    skiprows: Optional[int] = None,
+                    arrow_strings: bool = False,
+                    sep: str = ",",
+                    encoding: str = "utf-8",
+                    quotechar: str = '"',
+                    header: Optional[int] = 0,
+                    usecols: Optional[List[str]] = None,
+                    dtype: Optional[Dict[str, Any]] = None,
+                    **kwargs) -> pd.DataFrame:
+    """
+    Reads the csv with pyarrow's multi-threaded reader. Converters' columns are read as raw strings, empty cells as
+        empty strings, then converted cell by cell so that converters get the same values as with pandas' parser.
+        `dtype` is passed to pyarrow, so that e.g. `str` columns keep their leading zeros. Like pandas, only `dates`
+        columns are parsed as dates : the columns pyarrow infers as dates or times from the file's first megabyte are
+        read as strings otherwise. Only the pandas args listed in the signature are supported.
+
+    :return: pandas.Dataframe object
+    """
+    if kwargs:
+        raise ValueError(f"Arguments {sorted(kwargs)} are not supported by the pyarrow csv engine")
+    if header not in (0, None):
+        raise ValueError("The pyarrow csv engine only supports header=0 or header=None")
+    try:
+        import pyarrow as pa
+        import pyarrow.csv
+    except ImportError as e:
+        raise ImportError("The pyarrow csv engine requires pyarrow, install it with `pip install pypel[arrow]`") from e
+    converters = converters or {}
+    dtype = dtype or {}
+    table = pyarrow.csv.read_csv(*_arrow_csv_options(file_path, converters, dates, skiprows, sep, encoding, quotechar,
+                                                     header, usecols, dtype))
+    types_mapper = {pa.string(): pd.StringDtype("pyarrow")}.get if arrow_strings else None
+    df = table.to_pandas(types_mapper=types_mapper)
+    if header is None:
+        df.columns = range(len(df.columns))
+    for column, converter in converters.items():
+        if column in df.columns:
+            df[column] = df[column].astype(object).where(df[column].notnull(), "").map(converter)
+    for column in dates or []:
+        df[column] = pd.to_datetime(df[column])
+    dtype = {column: type_ for column, type_ in dtype.items() if column in df.columns and not _is_str_dtype(type_)}
+    if dtype:
+        df = df.astype(dtype)
+    return _to_arrow_strings(df) if arrow_strings and converters else df
+
+
+def _record_boundaries(file_path: Union[str, bytes],
+                       offsets: List[int],
+                       quotechar: bytes = b'"',
+                       block_size: int = 1024 ** 2) -> List[int]:
+    """
+    Returns, for each of the passed offsets, the offset following the first line break at or after it that is not
+        inside a quoted field, or the file's size if there is none. Quotes are counted from the start of the file, block
+        by block, so that line breaks inside quoted fields never split a record. Escaped quotes ("") count twice and
+        thus leave the parity unchanged.
+
+    :param file_path: path to the csv file
+    :param offsets: the byte offsets to align on record boundaries, in increasing order
+    :param quotechar: the csv's quote character
+    :param block_size: the number of bytes read at a time
+    :return: the aligned offsets, in the same order
+    """
+    boundaries = []
+    pending = iter(offsets)
+    target = next(pending, None)
+    position, in_quotes = 0, False
+    with open(file_path, "rb") as file:
+        while target is not None:
+            block = file.read(block_size)
+            if not block:
+                break
+            start = 0
+            while target is not None and target < position + len(block):
+                if boundaries and target < boundaries[-1]:  # already aligned on the previous boundary
+                    boundaries.append(boundaries[-1])
+                    target = next(pending, None)
+                    continue
+                start_ = max(target - position, start)
+                in_quotes ^= block.count(quotechar, start, start_) % 2 == 1
+                start = start_
+                line_break = block.find(b"\n", start)
+                while line_break != -1:
+                    in_quotes ^= block.count(quotechar, start, line_break) % 2 == 1
+                    start = line_break + 1
+                    if not in_quotes:
+                        break
+                    line_break = block.find(b"\n", start)
+                if line_break == -1:  # the record goes on in the next block
+                    break
+                boundaries.append(position + start)
+                target = next(pending, None)
+            in_quotes ^= block.count(quotechar, start) % 2 == 1
+            position += len(block)
+    return boundaries + [position] * (len(offsets) - len(boundaries))
+
+
+def _last_record_end(file_path: Union[str, bytes],
+                     start: int,
+                     end: int,
+                     quotechar: bytes = b'"',
+                     block_size: int = 1024 ** 2) -> int:
+    """
+    Returns the offset following the last line break between `start` & `end` that is not inside a quoted field, `start`
+        is assumed to be on a record boundary. Only the bytes between both offsets are read.
+
+    :param file_path: path to the csv file
+    :param start: offset of a record's first byte
+    :param end: offset after which the file is not read
+    :param quotechar: the csv's quote character
+    :param block_size: the number of bytes read at a time
+    :return: the offset following the last complete record, `start` if there is none
+    """
+    last, position, in_quotes = start, start, False
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        while position < end:
+            block = file.read(min(block_size, end - position))
+            if not block:
+                break
+            index = 0
+            line_break = block.find(b"\n")
+            while line_break != -1:
+                in_quotes ^= block.count(quotechar, index, line_break) % 2 == 1
+                index = line_break + 1
+                if not in_quotes:
+                    last = position + index
+                line_break = block.find(b"\n", index)
+            in_quotes ^= block.count(quotechar, index) % 2 == 1
+            position += len(block)
+    return last
+
+
+class _RecordsRange(io.RawIOBase):
+    """Readable stream of a csv's header followed by the records between two offsets of the file."""
+    def __init__(self, file_path: Union[str, bytes], header: bytes, start: int, end: int):
+        self._file = open(file_path, "rb")
+        self._file.seek(start)
+        self._header = header
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._header:
+            size = min(len(buffer), len(self._header))
+            buffer[:size] = self._header[:size]
+            self._header = self._header[size:]
+            return size
+        data = self._file.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _as_checkpoints(checkpoints: Union[CheckpointStore, str, None]) -> Optional[CheckpointStore]:
+    """Instantiates the store from its path if a string is passed, e.g. from a configuration file."""
+    return CheckpointStore(checkpoints) if isinstance(checkpoints, str) else checkpoints
+
+
+def _check_filters(filters: Optional[Sequence[Sequence[Any]]]) -> Optional[List[Tuple[str, str, Any]]]:
+    """Returns the filters as (column, operator, value) tuples, raising a ValueError if one of them is malformed."""
+    if filters is None:
+        return None
+    checked = []
+    for filter_ in filters:
+        if len(filter_) != 3 or filter_[1] not in _OPERATORS:
+            raise ValueError(f"Bad filter {filter_}, filters must be [column, operator, value] lists with an operator "
+                             f"among {list(_OPERATORS)}")
+        checked.append(tuple(filter_))
+    return checked
+
+
+def _project(columns: Optional[List[str]],
+             filters: Optional[List[Tuple[str, str, Any]]],
+             kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the pandas args with `usecols` set to the allowed columns plus the columns filtered on, unless `usecols` is
+        passed explicitly.
+    """
+    if columns is None or "usecols" in kwargs:
+        return kwargs
+    return {**kwargs, "usecols": list(columns) + [column for column, _, _ in filters or [] if column not in columns]}
+
+
+def _select(df: pd.DataFrame,
+            columns: Optional[List[str]],
+            filters: Optional[List[Tuple[str, str, Any]]]) -> pd.DataFrame:
+    """Returns the rows of the dataframe matching all the filters, without the columns only read to filter on."""
+    if not filters:
+        return df
+    mask = np.ones(len(df.index), dtype=bool)
+    for column, operator_, value in filters:
+        mask &= _OPERATORS[operator_](df[column], value).to_numpy(dtype=bool, na_value=False)
+    df = df[mask]
+    if columns is not None:
+        df = df.drop(columns=[column for column, _, _ in filters if column not in columns and column in df.columns])
+    return df
+
+
+def _select_sheets(frames: Union[pd.DataFrame, Dict[Union[int, str], pd.DataFrame]],
+                   columns: Optional[List[str]],
+                   filters: Optional[List[Tuple[str, str, Any]]]
+                   ) -> Union[pd.DataFrame, Dict[Union[int, str], pd.DataFrame]]:
+    """Applies `_select` to the extracted sheet, or to each sheet of a multi-sheets extraction."""
+    if not filters:
+        return frames
+    if isinstance(frames, dict):
+        return {name: _select(df, columns, filters).reset_index(drop=True) for name, df in frames.items()}
+    return _select(frames, columns, filters).reset_index(drop=True)
+
+
+def _as_planner(dtype_planner: Union[DtypePlanner, Dict[str, Any], None]) -> Optional[DtypePlanner]:
+    """Instantiates the planner from its configuration if a dictionnary is passed, e.g. from a configuration file."""
+    return DtypePlanner(**dtype_planner) if isinstance(dtype_planner, dict) else dtype_planner
+
+
+def _planner_configuration(planner: Optional[DtypePlanner]) -> Optional[Dict[str, Any]]:
+    """
+    Returns the planner's configuration, which keys cached extractions instead of the planned dtypes : cached
+        extractions are thus found without sampling the file.
+    """
+    return dict(vars(planner)) if planner is not None else None
+
+
+def _plan_excel_dtypes(planner: Optional[DtypePlanner],
+                       file_path: Union[str, bytes],
+                       converters: Optional[Dict[str, Any]],
+                       dates: Optional[List[str]],
+                       sheet_name: Union[None, int, str, List[Union[int, str]]],
+                       skiprows: Optional[int],
+                       engine: Optional[str],
+                       kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Returns the pandas args with the dtypes planned for the sheet, and the numeric dtypes to downcast the parsed
+        columns to. Multi-sheets extractions are not planned.
+    """
+    if planner is None or not isinstance(sheet_name, (int, str)):
+        return kwargs, {}
+
+    def read_sample(rows: int) -> pd.DataFrame:
+        return pd.read_excel(io=file_path,
+                             skiprows=arrayer(skiprows) if isinstance(skiprows, int) else skiprows,
+                             sheet_name=sheet_name,
+                             converters=converters,
+                             engine=engine,
+                             nrows=rows,
+                             **{key: value for key, value in kwargs.items() if key != "nrows"})
+    return planner.apply(read_sample, converters, dates, kwargs)
+
 
 class BaseExtractor:
     @abc.abstractmethod
@@ -21,7 +539,41 @@ class BaseExtractor:
 class Extractor(BaseExtractor):
     """
     Encapsulates all the extracting, getting data logic.
+
+    :param cache_dir: if passed, excel extractions are cached as parquet files in this folder, cf
+        `pypel.extractors.ExtractionCache`
+    :param cache_max_size: the maximum size of the cache in bytes
+    :param engine: the csv parser, cf `CSVExtractor`
+    :param arrow_strings: if True, csv string columns are arrow-backed, cf `CSVExtractor`
+    :param dtype_planner: if passed, files are parsed with memory-efficient dtypes inferred from a sample, cf
+        `pypel.extractors.DtypePlanner`. Either a planner or its parameters as a dictionnary.
+    :param columns: if passed, only these columns are parsed
+    :param filters: if passed, only the rows matching all of these [column, operator, value] conditions are kept, e.g.
+        `[["DEPARTEMENT", "in", ["75", "92"]], ["MONTANT", ">", 1000]]`. Operators are ==, !=, <, <=, >, >=, in and
+        not in.
+    :param checkpoints: if passed, csv files are extracted incrementally, cf `CSVExtractor`
     """
+    cache = None
+    dtype_planner = None
+    checkpoints = None
+
+    def __init__(self, cache_dir: Optional[str] = None, cache_max_size: int = 1024 ** 3,
+                 engine: Optional[str] = None, arrow_strings: bool = False,
+                 dtype_planner: Union[DtypePlanner, Dict[str, Any], None] = None,
+                 columns: Optional[List[str]] = None,
+                 filters: Optional[List[List[Any]]] = None,
+                 checkpoints: Union[CheckpointStore, str, None] = None):
+        if arrow_strings:
+            _check_arrow_strings()
+        if cache_dir is not None:
+            self.cache = ExtractionCache(cache_dir, cache_max_size)
+        self.engine = engine
+        self.arrow_strings = arrow_strings
+        self.dtype_planner = _as_planner(dtype_planner)
+        self.columns = columns
+        self.filters = _check_filters(filters)
+        self.checkpoints = _as_checkpoints(checkpoints)
+
     def extract(self, file_path: Union[str, bytes],
                 converters: Optional[Dict[str, type]] = None,
                 dates: Optional[List[str]] = False,
@@ -43,56 +595,222 @@ class Extractor(BaseExtractor):
         :param kwargs: additional pandas args
         :return: pandas.Dataframe object
         """
-        if file_path.endswith(".csv"):
-            if get_config()["LOGS"]:
-                with open(file_path) as file:
-                    row_count = sum(1 for row in file)
-                file_name = re.findall(r"(?<=/)[^/]*$", file_path)[0]
-                logger.debug(f"{row_count} rows (including header)"
-                             f"detected in the csv {file_name}")
-            return pd.read_csv(file_path,
-                               converters=converters,
-                               parse_dates=dates,
-                               **kwargs)
+        uncompressed_path, compression = _split_compression(file_path)
+        if uncompressed_path.endswith(".csv"):
+            return self._csv_extractor().extract(file_path, converters, dates, **kwargs)
+        elif compression is not None:
+            raise ValueError("Only csv files can be extracted from compressed files")
         elif file_path.endswith(".xlsx"):
-            if get_config()["LOGS"]:
-                wb = openpyxl.load_workbook(filename=file_path)
-                if sheet_name != 0:
-                    sheet = wb[sheet_name]
-                else:
-                    sheet = wb[wb.sheetnames[0]]
-                    sheet_name = sheet.title
-                excel_rows = sheet.max_row
-                try:
-                    file_name = re.findall(r"(?<=/)[.\s\w_-]+$", file_path)[0]
-                except IndexError:
-                    warnings.warn(f"Could not get file name from file path :"
-                                  f"{file_path}")
-                    file_name = "ERROR"
-                logger.debug(f"{excel_rows} rows in the excel sheet \'{sheet_name}\'   from file \'{file_name}\'")
-            if skiprows is not None:
-                skiprows = arrayer(skiprows)
-            return pd.read_excel(io=file_path,
-                                 skiprows=skiprows,
-                                 sheet_name=sheet_name,
-                                 converters=converters,
-                                 **kwargs)
+            return self._excel_extractor(XLSXExtractor).extract(file_path, converters, dates, sheet_name, skiprows,
+                                                                **kwargs)
         elif file_path.endswith(".xls"):
-            if get_config()["LOGS"]:
-                logger.debug(f"Targeting file \'{file_path}\'")
-            if skiprows is not None:
-                skiprows = arrayer(skiprows)
-            return pd.read_excel(io=file_path,
-                                 skiprows=skiprows,
-                                 sheet_name=sheet_name,
-                                 converters=converters,
-                                 engine="xlrd",
-                                 **kwargs)
+            return self._excel_extractor(XLSExtractor).extract(file_path, converters, dates, sheet_name, skiprows,
+                                                               **kwargs)
+        else:
+            raise ValueError("File has unsupported file extension")
+
+    def extract_iter(self, file_path: Union[str, bytes],
+                     chunksize: int = 100000,
+                     converters: Optional[Dict[str, type]] = None,
+                     dates: Optional[List[str]] = False,
+                     sheet_name: Union[None, int, str, List[Union[int, str]]] = 0,
+                     skiprows: Optional[int] = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Read the passed file and yield it as dataframes of at most `chunksize` rows.
+        csv & xlsx files are read chunk by chunk, xls files are still read at once and yielded as a single dataframe.
+
+        :param file_path: absolute path to the file
+        :param chunksize: maximum number of rows per yielded dataframe
+        :param converters:
+            cf [pandas' doc](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_excel.html)
+        :param dates: this is equivalent to pandas' `parse_dates` in
+             [read_excel](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_excel.html)
+        :param sheet_name:
+            cf [pandas' doc](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_excel.html)
+        :param skiprows:
+            cf [pandas' doc](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_excel.html)
+        :param kwargs: additional pandas args
+        :return: iterator of pandas.Dataframe objects
+        """
+        uncompressed_path, compression = _split_compression(file_path)
+        if uncompressed_path.endswith(".csv"):
+            yield from self._csv_extractor().extract_iter(file_path, chunksize, converters, dates, skiprows, **kwargs)
+        elif file_path.endswith(".xlsx"):
+            yield from self._excel_extractor(XLSXExtractor).extract_iter(file_path, chunksize, converters, dates,
+                                                                         sheet_name, skiprows, **kwargs)
+        elif compression is not None:
+            raise ValueError("Only csv files can be extracted from compressed files")
+        else:
+            yield self.extract(file_path, converters, dates, sheet_name, skiprows, **kwargs)
+
+    def checkpoint(self, file_path: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the checkpoint staged by the last incremental extraction of the file, None if there is none.
+
+        :param file_path: path to the file
+        :return: the staged checkpoint
+        """
+        return self._csv_extractor().checkpoint(file_path)
+
+    def commit(self, file_path: Union[str, bytes], checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Saves the checkpoint of the last incremental extraction of the file, cf `CSVExtractor.commit`.
+
+        :param file_path: path to the file
+        :param checkpoint: the checkpoint to save, defaults to the one staged by the last extraction
+        :return: None
+        """
+        self._csv_extractor().commit(file_path, checkpoint)
+
+    def _csv_extractor(self) -> "CSVExtractor":
+        return CSVExtractor(self.engine, self.arrow_strings, self.dtype_planner, self.columns, self.filters,
+                            self.checkpoints)
+
+    def _excel_extractor(self, class_: type) -> Union["XLSExtractor", "XLSXExtractor"]:
+        extractor = class_(dtype_planner=self.dtype_planner, columns=self.columns, filters=self.filters)
+        extractor.cache = self.cache
+        return extractor
+
+    def extract_sheets(self, file_path: Union[str, bytes],
+                       sheet_names: Optional[List[Union[int, str]]] = None,
+                       workers: Optional[int] = None,
+                       sheet_column: Optional[str] = None,
+                       converters: Optional[Dict[str, Any]] = None,
+                       skiprows: Optional[int] = None,
+                       **kwargs) -> Union[Dict[Union[int, str], pd.DataFrame], pd.DataFrame]:
+        """
+        Read several sheets of the passed excel file, each one in its own worker process.
+            Converters & additional pandas args must be picklable, e.g. no lambdas.
+
+        :param file_path: absolute path to the file
+        :param sheet_names: the names or positions of the sheets to read, defaults to all of them
+        :param workers: the number of worker processes, defaults to the number of processors
+        :param sheet_column: if passed, the sheets are concatenated in a single dataframe, with the sheet they come from
+            in a column of this name
+        :param converters:
+            cf [pandas' doc](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_excel.html)
+        :param skiprows: same as `extract`
+        :param kwargs: additional pandas args
+        :return: a dictionnary of dataframes keyed by sheet, or a single dataframe if `sheet_column` is passed
+        """
+        if file_path.endswith(".xlsx"):
+            engine = None
+        elif file_path.endswith(".xls"):
+            engine = "xlrd"
         else:
             raise ValueError("File has unsupported file extension")
+        return _extract_sheets(file_path, sheet_names, workers, sheet_column, converters, skiprows, engine, kwargs)
 
 
 class CSVExtractor(BaseExtractor):
+    """
+    Extracts csv files.
+
+    :param engine: the parser to use. "pyarrow" parses the file with pyarrow's multi-threaded reader (requires
+        pyarrow), any other value is passed to pandas' read_csv
+    :param arrow_strings: if True, string columns are arrow-backed instead of python objects (requires pyarrow and
+        pandas>=1.3)
+    :param dtype_planner: if passed, files are parsed with memory-efficient dtypes inferred from a sample, cf
+        `pypel.extractors.DtypePlanner`. Either a planner or its parameters as a dictionnary.
+    :param columns: if passed, only these columns are parsed
+    :param filters: if passed, only the rows matching all of these [column, operator, value] conditions are kept, e.g.
+        `[["DEPARTEMENT", "in", ["75", "92"]], ["MONTANT", ">", 1000]]`. Operators are ==, !=, <, <=, >, >=, in and
+        not in.
+        Rows are filtered chunk by chunk of `filter_chunksize` rows while reading.
+    :param checkpoints: if passed, files are extracted incrementally : only the records appended since the last
+        committed extraction are parsed, cf `pypel.extractors.CheckpointStore`. Either a store or the path of its JSON
+        file. Files whose content changed before the committed offset are parsed in full again. Trailing incomplete
+        records are left for the next run. Parsing by parts (`plan_parts`) always parses the whole file.
+    """
+    filter_chunksize = 100000
+
+    def __init__(self, engine: Optional[str] = None, arrow_strings: bool = False,
+                 dtype_planner: Union[DtypePlanner, Dict[str, Any], None] = None,
+                 columns: Optional[List[str]] = None,
+                 filters: Optional[List[List[Any]]] = None,
+                 checkpoints: Union[CheckpointStore, str, None] = None):
+        if arrow_strings:
+            _check_arrow_strings()
+        self.engine = engine
+        self.arrow_strings = arrow_strings
+        self.dtype_planner = _as_planner(dtype_planner)
+        self.columns = columns
+        self.filters = _check_filters(filters)
+        self.checkpoints = _as_checkpoints(checkpoints)
+
+    def _open(self, file_path: Union[str, bytes], quotechar: str = '"',
+              skiprows: Optional[int] = None) -> ContextManager[Union[str, bytes, IO]]:
+        """
+        Returns a context manager of what pandas should parse : the file itself, a stream of its decompressed bytes if
+            it is compressed (.gz, .bz2, .xz or .zst) or, if the extraction is incremental, a stream of its header
+            followed by its new complete records, staging the checkpoint of these records. Skipping rows is refused for
+            incremental extractions, as they would be skipped from the new records rather than from the file's start.
+        """
+        compression = _split_compression(file_path)[1]
+        if compression is not None:
+            if self.checkpoints is not None:
+                logger.debug(f"Compressed file '{file_path}' cannot be extracted incrementally, extracting it in full")
+            return _open_compressed(file_path, compression)
+        if self.checkpoints is None:
+            return contextlib.nullcontext(file_path)
+        if skiprows:
+            raise ValueError("skiprows cannot be combined with checkpoints : incremental extractions parse the file's "
+                             "header followed by its new records only")
+        quote = quotechar.encode()
+        size = os.path.getsize(file_path)
+        header_end = _record_boundaries(file_path, [0], quote)[0]
+        start = header_end
+        committed = self.checkpoints.get(file_path)
+        if committed is not None:
+            if committed["offset"] <= size and _fingerprint(file_path, committed["offset"]) == committed["fingerprint"]:
+                start = committed["offset"]
+            else:
+                logger.warning(f"File '{file_path}' changed since its last extraction, extracting it in full")
+        end = _last_record_end(file_path, start, size, quote)
+        self.checkpoints.stage(file_path, {"offset": end, "fingerprint": _fingerprint(file_path, end)})
+        if get_config()["LOGS"]:
+            logger.debug(f"Extracting bytes {start} to {end} of file '{file_path}'")
+        with open(file_path, "rb") as file:
+            header = file.read(header_end)
+        return io.BufferedReader(_RecordsRange(file_path, header, start, end))
+
+    def checkpoint(self, file_path: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the checkpoint staged by the last incremental extraction of the file, None if there is none.
+
+        :param file_path: path to the file
+        :return: the staged checkpoint
+        """
+        return self.checkpoints.staged(file_path) if self.checkpoints is not None else None
+
+    def commit(self, file_path: Union[str, bytes], checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Saves the checkpoint of the last incremental extraction of the file, so that the next one starts after it.
+            Called by processes once the extracted records are loaded.
+
+        :param file_path: path to the file
+        :param checkpoint: the checkpoint to save, defaults to the one staged by the last extraction
+        :return: None
+        """
+        if self.checkpoints is not None:
+            self.checkpoints.commit(file_path, checkpoint)
+
+    def _plan_dtypes(self, file_path: Union[str, bytes],
+                     converters: Optional[Dict[str, type]],
+                     dates: Optional[List[str]],
+                     kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Returns the pandas args with the dtypes planned for the file, and the numeric dtypes to downcast the parsed
+            columns to, if the extractor has a dtype planner.
+        """
+        if self.dtype_planner is None:
+            return kwargs, {}
+
+        def read_sample(rows: int) -> pd.DataFrame:
+            return pd.read_csv(file_path, converters=converters, parse_dates=dates, nrows=rows,
+                               **{key: value for key, value in kwargs.items() if key not in ("nrows", "chunksize")})
+        return self.dtype_planner.apply(read_sample, converters, dates, kwargs)
+
     def extract(self, file_path: Union[str, bytes],
                 converters: Optional[Dict[str, type]] = None,
                 dates: Optional[List[str]] = False,
@@ -111,19 +829,240 @@ class CSVExtractor(BaseExtractor):
         :param kwargs: additional pandas args
         :return: pandas.Dataframe object
         """
+        kwargs, downcasts = self._plan_dtypes(file_path, converters, dates,
+                                              _project(self.columns, self.filters, kwargs))
+        with self._open(file_path, kwargs.get("quotechar", '"'), skiprows) as source:
+            if self.engine == "pyarrow":
+                df = _read_csv_arrow(source, converters, dates, arrow_strings=self.arrow_strings, **kwargs)
+                df = _select(df, self.columns, self.filters).reset_index(drop=True)
+            elif self.filters:
+                with pd.read_csv(source,
+                                 converters=converters,
+                                 parse_dates=dates,
+                                 engine=self.engine,
+                                 chunksize=self.filter_chunksize,
+                                 **kwargs) as reader:
+                    chunks = [_select(chunk, self.columns, self.filters) for chunk in reader]
+                if chunks:
+                    df = pd.concat(chunks, ignore_index=True)
+                else:  # header-only file
+                    df = _select(pd.read_csv(file_path, converters=converters, parse_dates=dates, nrows=0, **kwargs),
+                                 self.columns, self.filters)
+            else:
+                df = pd.read_csv(source,
+                                 converters=converters,
+                                 parse_dates=dates,
+                                 engine=self.engine,
+                                 **kwargs)
+        if self.arrow_strings and self.engine != "pyarrow":
+            df = _to_arrow_strings(df)
+        if downcasts:
+            df = DtypePlanner.downcast(df, downcasts)
+        if get_config()["LOGS"]:
+            _log_csv_rows(file_path, len(df.index))
+        return df
+
+    def extract_iter(self, file_path: Union[str, bytes],
+                     chunksize: int = 100000,
+                     converters: Optional[Dict[str, type]] = None,
+                     dates: Optional[List[str]] = False,
+                     skiprows: Optional[int] = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Read the passed file and yield it as dataframes of at most `chunksize` rows, so that memory usage depends on
+            `chunksize` rather than on the file's size. pyarrow's reader does not read by rows, chunks are always
+            parsed by pandas' default parser.
+
+        :param file_path: absolute path to the file
+        :param chunksize: maximum number of rows per yielded dataframe
+        :param converters:
+            cf [pandas' doc](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_csv.html)
+        :param dates: this is equivalent to pandas' `parse_dates` in
+             [read_csv](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_csv.html)
+        :param skiprows:
+            cf [pandas' doc](https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.read_csv.html)
+        :param kwargs: additional pandas args
+        :return: iterator of pandas.Dataframe objects
+        """
+        kwargs, downcasts = self._plan_dtypes(file_path, converters, dates,
+                                              _project(self.columns, self.filters, kwargs))
+        row_count = 0
+        with self._open(file_path, kwargs.get("quotechar", '"'), skiprows) as source, \
+                pd.read_csv(source,
+                            converters=converters,
+                            parse_dates=dates,
+                            skiprows=skiprows,
+                            chunksize=chunksize,
+                            engine=None if self.engine == "pyarrow" else self.engine,
+                            **kwargs) as reader:
+            for chunk in reader:
+                chunk = _select(chunk, self.columns, self.filters)
+                if downcasts:
+                    chunk = DtypePlanner.downcast(chunk, downcasts)
+                row_count += len(chunk.index)
+                yield _to_arrow_strings(chunk) if self.arrow_strings else chunk
+        if get_config()["LOGS"]:
+            _log_csv_rows(file_path, row_count)
+
+    def plan_parts(self, file_path: Union[str, bytes],
+                   parts: int,
+                   converters: Optional[Dict[str, type]] = None,
+                   dates: Optional[List[str]] = False,
+                   sample_rows: int = 10000,
+                   **kwargs) -> List[Dict[str, Any]]:
+        """
+        Splits the csv in about `parts` byte ranges aligned on record boundaries, to be parsed independently (e.g. in
+            worker processes) by `extract_part`. Every part is parsed with the file's header and with the dtypes
+            inferred from its first `sample_rows` rows, so that all parts have the same columns & dtypes. Parts holding
+            values the sampled dtypes cannot (e.g. integers with missing values further down the file) parse these
+            columns with the dtypes pandas infers, cf `extract_part` : pass `dtype` explicitly for the columns whose
+            type the sample does not settle.
+
+        :param file_path: absolute path to the file
+        :param parts: the number of byte ranges to split the file in, fewer are returned for small files
+        :param converters: same as `extract`
+        :param dates: same as `extract`
+        :param sample_rows: the number of rows the dtypes are inferred from
+        :param kwargs: additional pandas args, except those positioning rows (skiprows, header, nrows...)
+        :return: a list of keyword arguments for `extract_part`, one per part
+        """
+        if _split_compression(file_path)[1] is not None:
+            raise ValueError("Compressed csv files cannot be parsed by parts")
+        for arg in ("skiprows", "skipfooter", "header", "nrows", "chunksize", "iterator"):
+            if arg in kwargs:
+                raise ValueError(f"Argument {arg} is not supported when parsing a csv by parts")
+        kwargs, downcasts = self._plan_dtypes(file_path, converters, dates,
+                                              _project(self.columns, self.filters, kwargs))
+        quotechar = kwargs.get("quotechar", '"').encode(kwargs.get("encoding") or "utf-8")
+        size = os.path.getsize(file_path)
+        boundaries = _record_boundaries(file_path, [size * i // parts for i in range(parts)], quotechar)
+        with open(file_path, "rb") as file:
+            header = file.read(boundaries[0])
+        sample = DtypePlanner.downcast(pd.read_csv(file_path, converters=converters, parse_dates=dates,
+                                                   nrows=sample_rows, **kwargs), downcasts)
+        skipped = set(converters or {}) | set(dates or [])
+        dtype = kwargs.pop("dtype", None) or {}
+        sampled_dtype = {column: type_ for column, type_ in sample.dtypes.items()
+                         if column not in skipped and column not in dtype}
+        ranges = sorted(set(zip(boundaries, boundaries[1:] + [size])))
+        return [dict(file_path=file_path, header=header, start=start, end=end, converters=converters, dates=dates,
+                     dtype=dtype, sampled_dtype=sampled_dtype, **kwargs)
+                for start, end in ranges if end > start]
+
+    def extract_part(self, file_path: Union[str, bytes],
+                     header: bytes,
+                     start: int,
+                     end: int,
+                     converters: Optional[Dict[str, type]] = None,
+                     dates: Optional[List[str]] = False,
+                     dtype: Optional[Dict[str, Any]] = None,
+                     sampled_dtype: Optional[Dict[str, Any]] = None,
+                     **kwargs) -> pd.DataFrame:
+        """
+        Parses the records between the byte offsets `start` & `end` of the csv, as planned by `plan_parts`.
+            If the part holds values its sampled dtypes cannot, it is parsed again with pandas' inferred dtypes for the
+            columns failing to convert, and a warning is emitted : the part's dtypes then differ from the other parts',
+            `pandas.concat` upcasting them.
+
+        :param file_path: absolute path to the file
+        :param header: the header's bytes, prepended to the part
+        :param start: offset of the part's first byte
+        :param end: offset following the part's last byte
+        :param converters: same as `extract`
+        :param dates: same as `extract`
+        :param dtype: dtypes passed explicitly, which are always applied
+        :param sampled_dtype: dtypes inferred from the file's first rows
+        :param kwargs: additional pandas args
+        :return: pandas.Dataframe object
+        """
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            data = header + file.read(end - start)
+        dtype, sampled_dtype = dtype or {}, sampled_dtype or {}
+
+        def read(dtype_: Dict[str, Any]) -> pd.DataFrame:
+            if self.engine == "pyarrow":
+                return _read_csv_arrow(io.BytesIO(data), converters, dates, arrow_strings=self.arrow_strings,
+                                       dtype=dtype_, **kwargs)
+            return pd.read_csv(io.BytesIO(data), converters=converters, parse_dates=dates, engine=self.engine,
+                               dtype=dtype_, **kwargs)
+
+        try:
+            df = read({**sampled_dtype, **dtype})
+        except (ValueError, TypeError):
+            if not sampled_dtype:
+                raise
+            df = read(dtype)
+            failing = []
+            for column, type_ in sampled_dtype.items():
+                if column in df.columns and df[column].dtype != type_:
+                    try:
+                        df[column] = df[column].astype(type_)
+                    except (ValueError, TypeError):
+                        failing.append(column)
+            warnings.warn(f"Columns {failing} of bytes {start} to {end} of file '{file_path}' do not fit the dtypes "
+                          f"sampled from the file's first rows, pass their dtype explicitly")
+        df = _select(df, self.columns, self.filters)
+        return _to_arrow_strings(df) if self.arrow_strings and self.engine != "pyarrow" else df
+
+    def extract_parts(self, file_path: Union[str, bytes],
+                      parts: Optional[int] = None,
+                      workers: Optional[int] = None,
+                      converters: Optional[Dict[str, type]] = None,
+                      dates: Optional[List[str]] = False,
+                      **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Parses the csv by byte ranges in a pool of worker processes, cf `plan_parts`, and yields the parts in order.
+            Converters & additional pandas args must be picklable, e.g. no lambdas.
+
+        :param file_path: absolute path to the file
+        :param parts: the number of byte ranges to split the file in, defaults to 4 per worker
+        :param workers: the number of worker processes, defaults to the number of processors
+        :param converters: same as `extract`
+        :param dates: same as `extract`
+        :param kwargs: additional pandas args, cf `plan_parts`
+        :return: iterator of pandas.Dataframe objects
+        """
+        workers = workers or os.cpu_count()
+        plan = self.plan_parts(file_path, parts or 4 * workers, converters, dates, **kwargs)
+        row_count = 0
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for df in executor.map(self._extract_planned_part, plan):
+                row_count += len(df.index)
+                yield df
         if get_config()["LOGS"]:
-            with open(file_path) as file:
-                row_count = sum(1 for row in file)
-            file_name = re.findall(r"(?<=/)[^/]*$", file_path)[0]
-            logger.debug(f"{row_count} rows (including header)"
-                         f"detected in the csv {file_name}")
-        return pd.read_csv(file_path,
-                           converters=converters,
-                           parse_dates=dates,
-                           **kwargs)
+            _log_csv_rows(file_path, row_count)
+
+    def _extract_planned_part(self, part: Dict[str, Any]) -> pd.DataFrame:
+        return self.extract_part(**part)
 
 
 class XLSExtractor(BaseExtractor):
+    """
+    Extracts xls files.
+
+    :param cache_dir: if passed, excel extractions are cached as parquet files in this folder, cf
+        `pypel.extractors.ExtractionCache`
+    :param cache_max_size: the maximum size of the cache in bytes
+    :param dtype_planner: if passed, sheets are parsed with memory-efficient dtypes inferred from a sample, cf
+        `pypel.extractors.DtypePlanner`. Either a planner or its parameters as a dictionnary.
+    :param columns: if passed, only these columns are parsed
+    :param filters: if passed, only the rows matching all of these [column, operator, value] conditions are kept, e.g.
+        `[["DEPARTEMENT", "in", ["75", "92"]], ["MONTANT", ">", 1000]]`. Operators are ==, !=, <, <=, >, >=, in and
+        not in.
+        Rows are filtered once the selected columns are parsed.
+    """
+    cache = None
+
+    def __init__(self, cache_dir: Optional[str] = None, cache_max_size: int = 1024 ** 3,
+                 dtype_planner: Union[DtypePlanner, Dict[str, Any], None] = None,
+                 columns: Optional[List[str]] = None,
+                 filters: Optional[List[List[Any]]] = None):
+        if cache_dir is not None:
+            self.cache = ExtractionCache(cache_dir, cache_max_size)
+        self.dtype_planner = _as_planner(dtype_planner)
+        self.columns = columns
+        self.filters = _check_filters(filters)
+
     def extract(self, file_path: Union[str, bytes],
                 converters: Optional[Dict[str, type]] = None,
                 dates: Optional[List[str]] = False,
@@ -145,19 +1084,54 @@ class XLSExtractor(BaseExtractor):
         :param kwargs: additional pandas args
         :return: pandas.Dataframe object
         """
-        if get_config()["LOGS"]:
-            logger.debug(f"Targeting file \'{file_path}\'")
-        if skiprows is not None:
-            skiprows = arrayer(skiprows)
-        return pd.read_excel(io=file_path,
-                             skiprows=skiprows,
-                             sheet_name=sheet_name,
-                             converters=converters,
-                             engine="xlrd",
-                             **kwargs)
+        def read():
+            if get_config()["LOGS"]:
+                logger.debug(f"Targeting file \'{file_path}\'")
+            planned, downcasts = _plan_excel_dtypes(self.dtype_planner, file_path, converters, dates, sheet_name,
+                                                    skiprows, "xlrd", kwargs)
+            df = _select_sheets(pd.read_excel(io=file_path,
+                                              skiprows=arrayer(skiprows) if skiprows is not None else None,
+                                              sheet_name=sheet_name,
+                                              converters=converters,
+                                              engine="xlrd",
+                                              **planned),
+                                self.columns, self.filters)
+            return DtypePlanner.downcast(df, downcasts) if downcasts else df
+
+        kwargs = _project(self.columns, self.filters, kwargs)
+        params = {"extractor": "xls", "converters": converters, "sheet_name": sheet_name, "skiprows": skiprows,
+                  "filters": self.filters, "dates": dates, "dtype_planner": _planner_configuration(self.dtype_planner),
+                  **kwargs}
+        return _extract_with_cache(self.cache, file_path, params, read)
 
 
 class XLSXExtractor(BaseExtractor):
+    """
+    Extracts xlsx files.
+
+    :param cache_dir: if passed, excel extractions are cached as parquet files in this folder, cf
+        `pypel.extractors.ExtractionCache`
+    :param cache_max_size: the maximum size of the cache in bytes
+    :param dtype_planner: if passed, sheets are parsed with memory-efficient dtypes inferred from a sample, cf
+        `pypel.extractors.DtypePlanner`. Either a planner or its parameters as a dictionnary.
+    :param columns: if passed, only these columns are parsed
+    :param filters: if passed, only the rows matching all of these [column, operator, value] conditions are kept, e.g.
+        `[["DEPARTEMENT", "in", ["75", "92"]], ["MONTANT", ">", 1000]]`. Operators are ==, !=, <, <=, >, >=, in and
+        not in.
+        Rows are filtered once the selected columns are parsed, or chunk by chunk by `extract_iter`.
+    """
+    cache = None
+
+    def __init__(self, cache_dir: Optional[str] = None, cache_max_size: int = 1024 ** 3,
+                 dtype_planner: Union[DtypePlanner, Dict[str, Any], None] = None,
+                 columns: Optional[List[str]] = None,
+                 filters: Optional[List[List[Any]]] = None):
+        if cache_dir is not None:
+            self.cache = ExtractionCache(cache_dir, cache_max_size)
+        self.dtype_planner = _as_planner(dtype_planner)
+        self.columns = columns
+        self.filters = _check_filters(filters)
+
     def extract(self, file_path: Union[str, bytes],
                 converters: Optional[Dict[str, type]] = None,
                 dates: Optional[List[str]] = False,
@@ -179,25 +1153,151 @@ class XLSXExtractor(BaseExtractor):
         :param kwargs: additional pandas args
         :return: pandas.Dataframe object
         """
+        def read():
+            if get_config()["LOGS"]:
+                _log_xlsx_rows(file_path, sheet_name)
+            planned, downcasts = _plan_excel_dtypes(self.dtype_planner, file_path, converters, dates, sheet_name,
+                                                    skiprows, None, kwargs)
+            df = _select_sheets(pd.read_excel(io=file_path,
+                                              skiprows=arrayer(skiprows) if skiprows is not None else None,
+                                              sheet_name=sheet_name,
+                                              converters=converters,
+                                              **planned),
+                                self.columns, self.filters)
+            return DtypePlanner.downcast(df, downcasts) if downcasts else df
+
+        kwargs = _project(self.columns, self.filters, kwargs)
+        params = {"extractor": "xlsx", "converters": converters, "sheet_name": sheet_name, "skiprows": skiprows,
+                  "filters": self.filters, "dates": dates, "dtype_planner": _planner_configuration(self.dtype_planner),
+                  **kwargs}
+        return _extract_with_cache(self.cache, file_path, params, read)
+
+    def extract_sheets(self, file_path: Union[str, bytes],
+                       sheet_names: Optional[List[Union[int, str]]] = None,
+                       workers: Optional[int] = None,
+                       sheet_column: Optional[str] = None,
+                       converters: Optional[Dict[str, Any]] = None,
+                       skiprows: Optional[int] = None,
+                       **kwargs) -> Union[Dict[Union[int, str], pd.DataFrame], pd.DataFrame]:
+        """Read several sheets of the passed xlsx file in parallel, cf `Extractor.extract_sheets`."""
+        return _extract_sheets(file_path, sheet_names, workers, sheet_column, converters, skiprows, None, kwargs)
+
+    def extract_iter(self, file_path: Union[str, bytes],
+                     chunksize: int = 100000,
+                     converters: Optional[Dict[str, Any]] = None,
+                     dates: Optional[List[str]] = False,
+                     sheet_name: Union[int, str] = 0,
+                     skiprows: Union[None, int, List[int]] = None,
+                     usecols: Optional[List[Union[int, str]]] = None,
+                     header: Optional[int] = 0,
+                     dtype: Optional[Dict[str, Any]] = None,
+                     **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Stream the passed sheet's rows with openpyxl's read-only mode and yield them as dataframes of at most
+            `chunksize` rows, so that the whole sheet is never held in memory. Trailing empty rows are dropped, columns
+            are named & indexed like `pandas.read_excel` does. If additional pandas args are passed, the sheet is read
+            at once by `extract` then yielded by chunks.
+
+        :param file_path: absolute path to the file
+        :param chunksize: maximum number of rows per yielded dataframe
+        :param converters: dictionnary of functions applied to the cells of the matching columns
+        :param dates: list of columns to parse as datetimes
+        :param sheet_name: name or position of the sheet to read
+        :param skiprows: same as `extract` : an int skips that many rows *plus one*, a list skips these row numbers
+        :param usecols: list of names (or positions, if header is None) of the columns to keep
+        :param header: the row (after skipped rows) to use as column names, None to name columns by position
+        :param dtype: dictionnary of dtypes to cast the matching columns to
+        :param kwargs: additional pandas args
+        :return: iterator of pandas.Dataframe objects
+        """
+        if not isinstance(sheet_name, (int, str)):
+            raise ValueError("Streaming xlsx extraction only reads a single sheet at a time")
+        if kwargs:
+            if dates:
+                kwargs = {"parse_dates": dates, **kwargs}
+            df = self.extract(file_path, converters, dates, sheet_name, skiprows, usecols=usecols, header=header,
+                              dtype=dtype, **kwargs)
+            for start in range(0, len(df.index), chunksize):
+                yield df.iloc[start:start + chunksize]
+            return
         if get_config()["LOGS"]:
-            wb = openpyxl.load_workbook(filename=file_path)
-            if sheet_name != 0:
-                sheet = wb[sheet_name]
-            else:
-                sheet = wb[wb.sheetnames[0]]
-                sheet_name = sheet.title
-            excel_rows = sheet.max_row
-            try:
-                file_name = re.findall(r"(?<=/)[.\s\w_-]+$", file_path)[0]
-            except IndexError:
-                warnings.warn(f"Could not get file name from file path :"
-                              f"{file_path}")
-                file_name = "ERROR"
-            logger.debug(f"{excel_rows} rows in the excel sheet \'{sheet_name}\'   from file \'{file_name}\'")
-        if skiprows is not None:
-            skiprows = arrayer(skiprows)
-        return pd.read_excel(io=file_path,
-                             skiprows=skiprows,
-                             sheet_name=sheet_name,
-                             converters=converters,
-                             **kwargs)
+            _log_xlsx_rows(file_path, sheet_name)
+        if usecols is None:
+            usecols = _project(self.columns, self.filters, {}).get("usecols")
+
+        def read_sample(rows: int) -> pd.DataFrame:  # streamed as well, pandas<1.3 parses whole sheets despite nrows
+            for columns, batch, _ in self._iter_rows(file_path, sheet_name, skiprows, header, max(rows, 1)):
+                return self._rows_to_dataframe(batch, columns, converters, None, usecols, dtype).iloc[:rows]
+            return pd.DataFrame()
+
+        kwargs, downcasts = {"usecols": usecols, "header": header, "dtype": dtype}, {}
+        if self.dtype_planner is not None:
+            kwargs, downcasts = self.dtype_planner.apply(read_sample, converters, dates, kwargs)
+        for columns, batch, start in self._iter_rows(file_path, sheet_name, skiprows, header, chunksize):
+            yield _select(self._rows_to_dataframe(batch, columns, converters, dates, usecols, kwargs["dtype"],
+                                                  downcasts, start),
+                          self.columns, self.filters)
+
+    @staticmethod
+    def _iter_rows(file_path: Union[str, bytes],
+                   sheet_name: Union[int, str],
+                   skiprows: Union[None, int, List[int]],
+                   header: Optional[int],
+                   chunksize: int) -> Iterator[Tuple[Optional[List[Any]], List[tuple], int]]:
+        """
+        Streams the sheet's rows with openpyxl's read-only mode, yielding the column names, batches of at most
+            `chunksize` rows and the position of their first row in the sheet. Trailing empty rows are dropped.
+        """
+        skipped = set(arrayer(skiprows) if isinstance(skiprows, int) else skiprows or [])
+        wb = openpyxl.load_workbook(filename=file_path, read_only=True, data_only=True)
+        try:
+            sheet = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+            rows = (row for i, row in enumerate(sheet.iter_rows(values_only=True)) if i not in skipped)
+            columns = None
+            if header is not None:
+                for _ in range(header + 1):
+                    columns = next(rows, None)
+                columns = _excel_column_names(columns) if columns is not None else []
+            batch, blank_rows, start = [], [], 0
+            for row in rows:
+                if all(value is None for value in row):  # kept only if followed by a non-empty row
+                    blank_rows.append(row)
+                    continue
+                batch.extend(blank_rows)
+                blank_rows = []
+                batch.append(row)
+                if len(batch) == chunksize:
+                    yield columns, batch, start
+                    batch, start = [], start + chunksize
+            if batch:
+                yield columns, batch, start
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _rows_to_dataframe(rows: List[tuple],
+                           columns: Optional[List[Any]],
+                           converters: Optional[Dict[str, Any]],
+                           dates: Optional[List[str]],
+                           usecols: Optional[List[Union[int, str]]],
+                           dtype: Optional[Dict[str, Any]],
+                           downcasts: Optional[Dict[str, str]] = None,
+                           start: int = 0) -> pd.DataFrame:
+        """
+        Builds a chunk's dataframe from its rows, applying column selection, converters, dates, dtypes & planned
+            downcasts. Rows are indexed from `start`, the position of the chunk's first row in the sheet.
+        """
+        width = len(columns) if columns is not None else max(len(row) for row in rows)
+        df = pd.DataFrame.from_records([row[:width] for row in rows],
+                                       columns=columns if columns is not None else range(width))
+        df.index = pd.RangeIndex(start, start + len(rows))
+        if usecols is not None:
+            df = df[list(usecols)]
+        for column, converter in (converters or {}).items():
+            if column in df.columns:
+                df[column] = df[column].map(converter)
+        for column in dates or []:
+            df[column] = pd.to_datetime(df[column])
+        if dtype:
+            df = df.astype({column: type_ for column, type_ in dtype.items() if column in df.columns})
+        return DtypePlanner.downcast(df, downcasts) if downcasts else df
@@ -1,4 +1,8 @@
 from .Extractors import BaseExtractor, Extractor, XLSExtractor, XLSXExtractor, CSVExtractor
+from .ExtractionCache import ExtractionCache
+from .DtypePlanner import DtypePlanner
+from .Checkpoints import CheckpointStore
 
 
-__all__ = ["BaseExtractor", "Extractor", "XLSExtractor", "XLSXExtractor", "CSVExtractor"]
+__all__ = ["BaseExtractor", "Extractor", "XLSExtractor", "XLSXExtractor", "CSVExtractor", "ExtractionCache",
+           "DtypePlanner", "CheckpointStore"]
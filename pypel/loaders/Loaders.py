@@ -1,11 +1,13 @@
 import elasticsearch.helpers
 import pandas as pd
+import numpy as np
 import logging
 import datetime as dt
+import json
 import os
 import abc
 from pypel.config.config import get_config
-from typing import Union, Optional, List, Any, TypedDict, Literal, overload
+from typing import Union, Optional, List, Any, TypedDict, Literal, Iterable, Iterator, Tuple, overload
 import ssl
 
 
@@ -33,8 +35,71 @@ class ElasticsearchSSL(ElasticsearchMinimal):
     port: str
 
 
+def _json_default(value: Any) -> Any:
+    """Fallback for values the json module cannot serialize, matching elasticsearch's serializer."""
+    if isinstance(value, (dt.date, dt.datetime, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Unable to serialize {value!r} (type: {type(value)})")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_column(column: pd.Series) -> np.ndarray:
+    """
+    Encodes a whole column as JSON values, working on the column's numpy values whenever its dtype allows it.
+        NaNs, NaTs, Nones and pd.NA are encoded as `null`, datetimes as ISO 8601 strings.
+
+    :param column: the column to encode
+    :return: an object array of JSON encoded values
+    """
+    values = column.to_numpy()
+    if isinstance(column.dtype, np.dtype):  # extension dtypes, e.g. nullable integers, go through factorize below
+        if column.dtype == bool:
+            return np.where(values, "true", "false").astype(object)
+        elif column.dtype.kind in "iu":
+            return values.astype(str).astype(object)
+        elif column.dtype.kind == "f":
+            encoded = values.astype(str).astype(object)
+            encoded[~np.isfinite(values)] = "null"
+            return encoded
+        elif column.dtype.kind == "M":
+            unit = "s" if (values[~np.isnat(values)].astype("int64") % 10 ** 9 == 0).all() else "us"
+            encoded = '"' + np.datetime_as_string(values, unit=unit).astype(object) + '"'
+            encoded[np.isnat(values)] = "null"
+            return encoded
+    try:
+        codes, uniques = pd.factorize(column)
+    except TypeError:  # unhashable values such as lists or dicts
+        return np.array(["null" if value is None or value is pd.NA or value != value else _dumps(value)
+                         for value in column], dtype=object)
+    return np.array([_dumps(value) for value in uniques] + ["null"], dtype=object)[codes]
+
+
+def _encode_records(df: pd.DataFrame) -> List[str]:
+    """
+    Encodes every row of the dataframe as a JSON document, column by column.
+
+    :param df: the dataframe to encode
+    :return: the list of JSON documents, one per row
+    """
+    columns = [_dumps(str(name)) + ":" + _encode_column(df.iloc[:, i]) for i, name in enumerate(df.columns)]
+    return ["{" + ",".join(row) + "}" for row in zip(*columns)] if columns else ["{}"] * len(df.index)
+
+
 class BaseLoader:
-    """Dummy class that all Loaders should inherit from."""
+    """
+    Dummy class that all Loaders should inherit from.
+
+    `supports_chunks` must be set to True by loaders implementing `load_iter`, allowing their use in streaming
+        Processes. `load` & `load_iter` may return the number of documents that failed to load, Processes only
+        committing incremental extractions (cf `pypel.extractors.CheckpointStore`) when it is 0 or None.
+    """
+    supports_chunks = False
+
     @abc.abstractmethod
     def load(self, *args, **kwargs) -> Any:
         """This method must be implemented"""
@@ -51,7 +116,14 @@ class Loader(BaseLoader):
     :param backup:
     :param name_export:
     :param overwrite:  if True, indice with the same name will be trashed and re-created
+    :param thread_count: the number of bulk requests sent concurrently to elasticsearch, 1 sends them one at a time
+    :param chunk_size: the maximum number of documents per bulk request
+    :param max_chunk_bytes: the maximum size in bytes of a bulk request
+    :param columnar: if True, documents are serialized to JSON column by column straight from the dataframe instead of
+        going through one python dict per row. NaNs & NaTs are serialized as null and datetimes as ISO 8601 strings.
     """
+    supports_chunks = True
+
     @overload
     def __init__(self,
                  es_conf: ElasticsearchMinimal,
@@ -60,7 +132,11 @@ class Loader(BaseLoader):
                  path_to_export_folder: Union[None, str, bytes, os.PathLike] = None,
                  backup: bool = False,
                  name_export: Optional[str] = None,
-                 overwrite: bool = False) -> None: ...
+                 overwrite: bool = False,
+                 thread_count: int = 1,
+                 chunk_size: int = 500,
+                 max_chunk_bytes: int = 100 * 1024 * 1024,
+                 columnar: bool = False) -> None: ...
 
     def __init__(self,
                  es_conf: ElasticsearchSSL,
@@ -69,7 +145,11 @@ class Loader(BaseLoader):
                  path_to_export_folder: Union[None, str, bytes, os.PathLike] = None,
                  backup: bool = False,
                  name_export: Optional[str] = None,
-                 overwrite: bool = False) -> None:
+                 overwrite: bool = False,
+                 thread_count: int = 1,
+                 chunk_size: int = 500,
+                 max_chunk_bytes: int = 100 * 1024 * 1024,
+                 columnar: bool = False) -> None:
         if backup:
             if path_to_export_folder is None:
                 raise ValueError("No export folder passed but backup set to true !")
@@ -82,33 +162,79 @@ class Loader(BaseLoader):
         self.time_frequency = time_freq
         self.indice = indice + self._get_date()
         self.overwrite = overwrite
-
-    def load(self, dataframe: pd.DataFrame) -> None:
+        if thread_count < 1:
+            raise ValueError("thread_count must be at least 1 !")
+        self.thread_count = thread_count
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.columnar = columnar
+
+    def load(self, dataframe: pd.DataFrame) -> int:
         """
         Load passed dataframe using current Loader's parameters
 
         :param dataframe:
             the dataframe to load
-        :return: None
+        :return: the number of documents elasticsearch rejected
         """
-        df = dataframe.copy()
         if self.overwrite:
             self._recreate_indice()
         if self.backup_uploaded_data:
-            self._export_csv(df)
-        actions = self._wrap_df_in_actions(df)
-        self._bulk_into_elastic(actions)
+            self._export_csv(dataframe)
+        actions = self._wrap_df_in_actions(dataframe)
+        return self._bulk_into_elastic(actions)
+
+    def load_iter(self, dataframes: Iterable[pd.DataFrame]) -> int:
+        """
+        Load passed dataframes as a single stream using current Loader's parameters. Each dataframe is only wrapped in
+            actions once the previous ones have been sent, so that a single dataframe is held in memory at a time.
+
+        :param dataframes:
+            iterable of the dataframes to load, typically chunks of a single file
+        :return: the number of documents elasticsearch rejected
+        """
+        if self.overwrite:
+            self._recreate_indice()
+        return self._bulk_into_elastic(self._wrap_dfs_in_actions(dataframes))
+
+    def _wrap_dfs_in_actions(self, dataframes: Iterable[pd.DataFrame]) -> Iterator[Action]:
+        """
+        Lazily wraps each passed dataframe in actions, backing it up beforehand if self.backup is True. The backup's
+            header is only written for the first dataframe.
 
-    def _bulk_into_elastic(self, actions: List[Action]):
+        :param dataframes: iterable of the dataframes to upload
+        :return: an iterator of actions (cf Elasticsearch python API documentation)
+        """
+        for i, df in enumerate(dataframes):
+            if self.backup_uploaded_data:
+                self._export_csv(df, header=i == 0)
+            yield from self._wrap_df_in_actions(df)
+
+    def _bulk_into_elastic(self, actions: Iterable[Action]) -> int:
         """
         Attempts to load actions into elasticsearch using the bulk API.
         Successful loads are logged, errors are sent as warnings
+        If self.thread_count is greater than 1, up to self.thread_count bulk requests are sent concurrently.
 
-        :param actions: a list of elasticsearch actions
-        :return: None
+        :param actions: an iterable of elasticsearch actions
+        :return: the number of actions that failed
         """
         success, failed, errors = 0, 0, []
-        for ok, item in elasticsearch.helpers.streaming_bulk(self.es, actions, raise_on_error=False):
+        kwargs = {"expand_action_callback": self._expand_encoded_action} if self.columnar else {}
+        if self.thread_count > 1:
+            results = elasticsearch.helpers.parallel_bulk(self.es, actions,
+                                                          thread_count=self.thread_count,
+                                                          chunk_size=self.chunk_size,
+                                                          max_chunk_bytes=self.max_chunk_bytes,
+                                                          raise_on_error=False,
+                                                          **kwargs)
+        else:
+            results = elasticsearch.helpers.streaming_bulk(self.es, actions,
+                                                           chunk_size=self.chunk_size,
+                                                           max_chunk_bytes=self.max_chunk_bytes,
+                                                           raise_on_error=False,
+                                                           **kwargs)
+        for ok, item in results:
             if not ok:
                 errors.append(item)
                 failed += 1
@@ -118,28 +244,44 @@ class Loader(BaseLoader):
         if errors:
             logger.warning(f"{failed} errors detected")
             logger.debug(f"Error details : {errors}")
+        return failed
 
-    def _wrap_df_in_actions(self, df: pd.DataFrame) -> List[Action]:
+    def _wrap_df_in_actions(self, df: pd.DataFrame, batch_size: int = 10000) -> Iterator[Action]:
         """
-        Reformats the dataframe object as a list of Elasticsearch actions, fit for elasticsearch's bulk API.
-        If self.backup is True, save a copy of the dataframe as csv for debugging.
+        Lazily reformats the dataframe object as Elasticsearch actions, fit for elasticsearch's bulk API.
+            Rows are converted `batch_size` at a time, so that actions are sent as soon as the first batch is ready and
+            at most `batch_size` rows are held as python objects at once. Every row is wrapped, even if the dataframe's
+            index has duplicates.
 
         :param df: pd.DataFrame
             the DataFrame to upload
-        :return: returns a list of actions (cf Elasticsearch python API documentation)
+        :param batch_size: the number of rows to convert at a time
+        :return: returns an iterator of actions (cf Elasticsearch python API documentation)
         """
         logger.info(f"{len(df.index)} rows in the dataframe")
-        data_dict = df.to_dict(orient="index")
-        actions = [
-            {
-                "_index": self.indice,
-                "_source": value
-            }
-            for value in data_dict.values()
-        ]
-        return actions
-
-    def _export_csv(self, df: pd.DataFrame, sep: str = '|') -> None:
+        for start in range(0, len(df.index), batch_size):
+            batch = df.iloc[start:start + batch_size]
+            if self.columnar:
+                values = _encode_records(batch)
+            else:
+                values = batch.to_dict(orient="records")
+            for value in values:
+                yield {
+                    "_index": self.indice,
+                    "_source": value
+                }
+
+    def _expand_encoded_action(self, action: Action) -> Tuple[str, str]:
+        """
+        Returns the bulk API's action & source lines of an action whose `_source` is an already JSON encoded document,
+            cf elasticsearch.helpers.expand_action. Strings are sent as is by elasticsearch's serializer.
+
+        :param action: the action to expand
+        :return: the pre-encoded action line & document line
+        """
+        return _dumps({"index": {"_index": action["_index"]}}), action["_source"]
+
+    def _export_csv(self, df: pd.DataFrame, sep: str = '|', header: bool = True) -> None:
         """
         Appends the dataframe to the csv located in the loader's backup folder `self.path_to_folder`, creating said csv
             if missing. Filename is `exported_data_` OR Loader's name_export_file parameter, followed by target indice
@@ -159,6 +301,7 @@ class Loader(BaseLoader):
         :param df: the dataframe to save
             the elasticserach indice in which data is to be loaded
         :param sep: a single character to use as separator in the resulting csv file
+        :param header: whether to write the column names, False for the chunks following the first one of a file
         :return: None
         """
         if not self.name_export_file:
@@ -166,7 +309,7 @@ class Loader(BaseLoader):
         else:
             name_file = f"{self.name_export_file}{self.indice}{self._get_date()}.csv"
         path_to_csv = os.path.join(self.path_to_folder, name_file)
-        df.to_csv(path_to_csv, sep=sep, index=False, mode='a')
+        df.to_csv(path_to_csv, sep=sep, index=False, mode='a', header=header)
 
     def _get_date(self) -> str:
         return dt.datetime.today().strftime(self.time_frequency)
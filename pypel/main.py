@@ -4,8 +4,9 @@ import pathlib
 import sys
 import argparse
 from pypel.ProcessFactory import ProcessFactory, ProcessConfig
+from pypel.config.config import set_config
 import logging
-from typing import List, TypedDict, Union
+from typing import List, TypedDict, Union, Optional
 
 logger = logging.getLogger(__name__)
 logger.setLevel(os.environ.get("PYPEL_LOGS", "INFO"))
@@ -17,7 +18,9 @@ class Config(TypedDict):
 
 def select_process_from_config(processes: Config,
                                process: str,
-                               files: Union[pathlib.Path, str]):
+                               files: Union[pathlib.Path, str],
+                               chunksize: Optional[int] = None,
+                               workers: Optional[int] = None):
     """
     Given a pair of configurations (global & process configuration `conf`and mapping configuration
     `mappings`), load all processes related to `process`, or all of them if `process` is omitted in to the Elasticsearch
@@ -26,6 +29,8 @@ def select_process_from_config(processes: Config,
     :param processes: the configuration file
     :param process: the process to execute
     :param files: file or list of files to load
+    :param chunksize: if set, overrides the processes' `chunksize` configuration
+    :param workers: if set, overrides the processes' `workers` configuration
     :return: does not return
     """
     if processes is None:
@@ -38,26 +43,42 @@ def select_process_from_config(processes: Config,
                              "have a single Process") from e_
     if process == "all":
         for proc in processes:
-            process_from_config(proc, files)
+            process_from_config(_override(proc, chunksize=chunksize, workers=workers), files)
     else:
         if process in [conf.get("name") for conf in processes]:
-            process_from_config([conf for conf in processes if conf.get("name") == process][0], files)
+            proc = [conf for conf in processes if conf.get("name") == process][0]
+            process_from_config(_override(proc, chunksize=chunksize, workers=workers), files)
         else:
             raise ValueError(f"process {process} not found in the configuration file !")
 
 
-def process_from_config(process: ProcessConfig, files: Union[pathlib.Path, str]):
+def _override(process: ProcessConfig, **overrides) -> ProcessConfig:
+    """Returns the process configuration with its keys replaced by the passed keyword arguments that are not None."""
+    overrides = {key: value for key, value in overrides.items() if value is not None}
+    if not overrides:
+        return process
+    return {**process, **overrides}
+
+
+def process_from_config(process: ProcessConfig, files: Union[pathlib.Path, str], chunksize: Optional[int] = None,
+                        workers: Optional[int] = None):
     """
     Instantiate the process from its passed configuration, and execute it on passed file or directory
 
     :param process: the configuration of the process to instantiate
     :param files: the file or directory to process (on)
+    :param chunksize: if set, overrides the process' `chunksize` configuration, streaming files by chunks of
+        `chunksize` rows
+    :param workers: if set, overrides the process' `workers` configuration, the number of worker processes extracting
+        & transforming the files of a directory
     :return: None
     """
-    processor = ProcessFactory().create_process(process)
+    processor = ProcessFactory().create_process(_override(process, chunksize=chunksize, workers=workers))
     if os.path.isdir(files):
         file_paths = [os.path.join(files, f_).__str__() for f_ in os.listdir(files)]
-        processor.bulk(file_paths)
+        failures = processor.bulk(file_paths, continue_on_error=True)
+        if failures:
+            raise RuntimeError(f"{len(failures)} files could not be processed : {list(failures)}")
     elif os.path.isfile(files):
         processor.process(files)
     else:
@@ -72,6 +93,12 @@ def get_args(args_):
     parser.add_argument("-c", "--config-file", default="./conf/config.json", type=str,
                         help="get the path to the config file to load from")
     parser.add_argument("-p", "--process", default="all", help="specify the process(es) to execute")
+    parser.add_argument("-s", "--chunksize", default=None, type=int,
+                        help="stream files by chunks of this many rows instead of loading them whole")
+    parser.add_argument("-w", "--workers", default=None, type=int,
+                        help="number of worker processes extracting & transforming the files of a directory")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass the extraction & referential caches, re-parsing every file")
     return parser.parse_args(args_)
 
 
@@ -79,6 +106,8 @@ if __name__ == "__main__":  # pragma: no cover
     args = get_args(sys.argv[1:])
     for arg in args.__dict__:
         logger.debug(arg, args.__getattribute__(arg))
+    if args.no_cache:
+        set_config(EXTRACTION_CACHE=False, REFERENTIAL_CACHE_SIZE=0)
     path_to_conf = os.path.join(os.getcwd(), args.config_file)
     try:
         with open(path_to_conf) as f:
@@ -87,4 +116,5 @@ if __name__ == "__main__":  # pragma: no cover
         raise ValueError("Cannot find file passed through the -c / --config-file argument") from e
     logger.info(config)
     logger.debug(config.get("Processes"))
-    select_process_from_config(config.get("Processes"), args.process, args.source_path)
+    select_process_from_config(config.get("Processes"), args.process, args.source_path, args.chunksize,
+                               args.workers)
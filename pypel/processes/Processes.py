@@ -1,11 +1,58 @@
 import os
+import copy
+import logging
+import concurrent.futures
+import queue
+import threading
 from pypel.extractors.Extractors import BaseExtractor, CSVExtractor
 from pypel.transformers.Transformers import Transformer, BaseTransformer
 from pypel.loaders.Loaders import Loader, BaseLoader
+from pypel.config.config import get_config
 import warnings
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Iterable, Iterator, Dict, Any, Tuple
 from pandas import DataFrame
 
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
+
+
+class _EndOfFile:
+    """Marker put in pipelined bulks' queues after the last dataframe of a file."""
+
+
+class _EndOfStream:
+    """Marker put in pipelined bulks' queues once no more files will be extracted."""
+
+
+class _StageError:
+    """Put in pipelined bulks' queues in place of the remaining dataframes of a file when a stage fails on it."""
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _extract_and_transform(process: "Process",
+                           file_path: Union[str, bytes, os.PathLike]) -> Tuple[DataFrame, Optional[Dict[str, Any]]]:
+    """
+    Extracts & transforms the file using the passed process. Executed in worker processes by `Process.bulk`.
+
+    :return: the transformed dataframe and the extractor's checkpoint of the file, for the loading process to commit
+    """
+    df = process.transform(process.extract(file_path))
+    checkpoint = getattr(process.extractor, "checkpoint", None)
+    return df, checkpoint(file_path) if callable(checkpoint) else None
+
+
+def _extract_and_transform_part(process: "Process", part: Dict[str, Any]) -> DataFrame:
+    """Extracts & transforms a byte range of a csv. Executed in worker processes by `Process.process_in_parts`."""
+    return process.transform(process.extractor.extract_part(**part))
+
+
+def _inplace_copy(transformer: BaseTransformer) -> BaseTransformer:
+    """Returns a shallow copy of the transformer, set to modify the dataframes it receives."""
+    transformer = copy.copy(transformer)
+    transformer.inplace = True
+    return transformer
+
 
 class Process:
     """
@@ -21,6 +68,26 @@ class Process:
         if list-like, will be for-in looped on, so mind the order.
     :param loader: Union[pypel.loaders.BaseLoader, type, None]
         Loader instance or class to use for loading data. MUST be derived from pypel.loaders.BaseLoader
+    :param chunksize: Optional[int]
+        if set, `process` streams files through the E/T/L classes by dataframes of at most `chunksize` rows, so that
+        memory usage does not depend on the file's size. The extractor must implement `extract_iter`, the transformers
+        and the loader must have `supports_chunks` set to True.
+    :param inplace: bool
+        if True, each transformer takes ownership of the dataframe it receives and modifies it instead of copying it,
+        so that a single copy of the data is held at a time. Dataframes passed to `transform` are then modified.
+        The process works on shallow copies of the passed transformer instances, which are left unchanged.
+    :param workers: int
+        default number of worker processes used by `bulk` to extract & transform files in parallel.
+    :param max_in_flight: Optional[int]
+        default maximum number of files being extracted, transformed or waiting to be loaded at the same time in `bulk`,
+        defaults to `workers`. This bounds the memory used by parallel bulks. For pipelined bulks, the maximum number of
+        dataframes waiting between two stages, defaults to 2.
+    :param pipelined: bool
+        default for `bulk`'s `pipelined` parameter : if True, a single-worker bulk runs extraction, transformation &
+        loading in separate threads, so that the next file (or chunk) is parsed while the previous one is loaded.
+    :param parts: Optional[int]
+        if set, `process` splits csv files in this many byte ranges, extracted & transformed by `workers` processes and
+        streamed into the loader, cf `Process.process_in_parts`.
 
     Examples
     --------
@@ -35,14 +102,30 @@ class Process:
     ...       pass
     >>> my_extractor_instance = MyExtractor()
     >>> my_process2 = pypel.processes.Process(extractor=my_extractor_instance)
+
+    Instanciate a Process streaming files by chunks of 100 000 rows
+
+    >>> my_process3 = pypel.processes.Process(chunksize=100000)
     """
     def __init__(self,
                  extractor: Optional[BaseExtractor] = None,
                  transformer: Union[BaseTransformer, type, List[BaseTransformer], None] = None,
-                 loader: Union[Loader, type, None] = None):
+                 loader: Union[Loader, type, None] = None,
+                 chunksize: Optional[int] = None,
+                 inplace: bool = False,
+                 workers: int = 1,
+                 max_in_flight: Optional[int] = None,
+                 pipelined: bool = False,
+                 parts: Optional[int] = None):
         self.extractor = extractor if extractor is not None else CSVExtractor()
         self.transformer = transformer if transformer is not None else Transformer
         self.loader = loader if loader is not None else Loader
+        self.chunksize = chunksize
+        self.inplace = inplace
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.pipelined = pipelined
+        self.parts = parts
         try:
             assert isinstance(self.extractor, BaseExtractor)
         except AssertionError as e:
@@ -72,16 +155,143 @@ class Process:
                 self.__loader_is_instanced = True
         except AssertionError as e:
             raise ValueError("Bad loader argument") from e
+        if self.chunksize is not None:
+            self._check_supports_chunks()
+        if self.parts is not None:
+            self._check_supports_chunks("plan_parts")
+        if self.inplace:  # on copies, the caller's transformers keep working on copies of their input elsewhere
+            if self.__multiple_transformers:
+                self.transformer = [_inplace_copy(t) for t in self.transformer]
+            elif self.__transformer_is_instanced:
+                self.transformer = _inplace_copy(self.transformer)
+
+    def _check_supports_chunks(self, extractor_method: str = "extract_iter") -> None:
+        """
+        Raises a ValueError if any of the E/T/L classes cannot be used to stream dataframes by chunks.
+
+        :param extractor_method: the method the extractor must implement to produce the chunks
+        :return: None
+        """
+        if not callable(getattr(self.extractor, extractor_method, None)):
+            raise ValueError(f"Extractor {type(self.extractor).__name__} does not implement {extractor_method}, "
+                             f"cannot stream by chunks")
+        transformers = self.transformer if self.__multiple_transformers else [self.transformer]
+        for transformer in transformers:
+            if not transformer.supports_chunks:
+                name = transformer.__name__ if isinstance(transformer, type) else type(transformer).__name__
+                raise ValueError(f"Transformer {name} does not support chunks")
+        if not self.loader.supports_chunks:
+            name = self.loader.__name__ if isinstance(self.loader, type) else type(self.loader).__name__
+            raise ValueError(f"Loader {name} does not support chunks")
 
     def process(self, file_path: Union[str, bytes, os.PathLike]) -> None:
         """
         Conveniance wrapper around Process.extract, Process.transform & Process.load. Relies on instanced E/T/L classes.
+            If the Process has a chunksize, the file is streamed by chunks instead, cf `Process.stream`. If it has
+            parts, the file is split & processed in parallel, cf `Process.process_in_parts`.
 
         :param file_path:
             path to the file to be extracted
         :return: None
         """
-        self.load(self.transform(self.extract(file_path)))
+        if self.parts is not None:
+            self.process_in_parts(file_path)
+        elif self.chunksize is not None:
+            self.stream(file_path)
+        else:
+            self._commit_if_loaded(file_path, self.load(self.transform(self.extract(file_path))))
+
+    def stream(self, file_path: Union[str, bytes, os.PathLike]) -> None:
+        """
+        Extracts, transforms & loads the file by chunks of `self.chunksize` rows, each chunk going through the whole
+            transformer list and into the loader before the next one is read.
+
+        :param file_path:
+            path to the file to be extracted
+        :return: None
+        """
+        if self.chunksize is None:
+            raise ValueError("Process has no chunksize, cannot stream")
+        errors = self.load_iter(self.transform(chunk) for chunk in self.extract_iter(file_path))
+        self._commit_if_loaded(file_path, errors)
+
+    def commit(self, file_path: Union[str, bytes, os.PathLike], checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Tells the extractor the file's extraction was loaded, for incremental extractors to save their checkpoint of
+            the file. Does nothing if the extractor does not implement `commit`.
+
+        :param file_path:
+            path to the extracted file
+        :param checkpoint:
+            the checkpoint to save, defaults to the one staged by the extractor, cf `CSVExtractor.commit`
+        :return: None
+        """
+        commit = getattr(self.extractor, "commit", None)
+        if callable(commit):
+            commit(file_path, checkpoint)
+
+    def _commit_if_loaded(self, file_path: Union[str, bytes, os.PathLike], errors: Optional[int],
+                          checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """Commits the file's extraction unless the loader reported documents that failed to load."""
+        if errors:
+            logger.warning(f"{errors} documents of file {file_path} failed to load, its extraction is not committed so "
+                           f"that the next run extracts them again")
+        else:
+            self.commit(file_path, checkpoint)
+
+    def process_in_parts(self, file_path: Union[str, bytes, os.PathLike],
+                         parts: Optional[int] = None,
+                         workers: Optional[int] = None,
+                         max_in_flight: Optional[int] = None) -> None:
+        """
+        Splits a single csv in byte ranges aligned on records (cf `CSVExtractor.plan_parts`), extracts & transforms them
+            in a pool of worker processes and streams them into the loader as they complete, so that a single huge file
+            is parsed on several cores. Parts are loaded in completion order, not in the file's order.
+            The extractor & transformers must be picklable, the transformers & loader must support chunks.
+
+        :param file_path:
+            path to the csv file
+        :param parts: the number of byte ranges, defaults to `self.parts` or 4 per worker
+        :param workers: the number of worker processes, defaults to `self.workers`
+        :param max_in_flight: the maximum number of parts being processed or waiting to be loaded at the same time,
+            defaults to `self.max_in_flight` or twice the number of workers
+        :return: None
+        """
+        self._check_supports_chunks("plan_parts")
+        workers = workers or self.workers
+        plan = self.extractor.plan_parts(file_path, parts or self.parts or 4 * workers)  # noqa
+        if get_config()["LOGS"]:
+            logger.debug(f"Processing file '{file_path}' in {len(plan)} parts with {workers} workers")
+        self.load_iter(self._process_parts(plan, workers, max_in_flight or self.max_in_flight or 2 * workers))
+
+    def _process_parts(self, plan: List[Dict[str, Any]], workers: int, max_in_flight: int) -> Iterator[DataFrame]:
+        """Yields the planned parts, extracted & transformed in a pool of `workers` processes, as they complete."""
+        stage = copy.copy(self)
+        stage.loader = None  # the loader's connection stays in this process
+        parts = iter(plan)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = {executor.submit(_extract_and_transform_part, stage, part)
+                         for _, part in zip(range(max_in_flight), parts)}
+            while in_flight:
+                done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    next_part = next(parts, None)
+                    if next_part is not None:
+                        in_flight.add(executor.submit(_extract_and_transform_part, stage, next_part))
+
+    def extract_iter(self, file_path: Union[str, bytes, os.PathLike], **kwargs) -> Iterator[DataFrame]:
+        """
+        Returns an iterator over the `Dataframe` chunks obtained from the extractor
+
+        :param file_path: PathLike
+            the file to extract from
+        :param kwargs:
+            extra optional keyword parameters for custom extractor instanciation
+        :return: Iterator[pandas.Dataframe]
+            the extracted chunks
+        """
+        return self.extractor.extract_iter(file_path, chunksize=self.chunksize, **kwargs)  # noqa
 
     def extract(self, file_path: Union[str, bytes, os.PathLike], **kwargs) -> DataFrame:
         """
@@ -121,9 +331,12 @@ class Process:
                 warnings.warn("Instanced transformer receiving extra arguments !")
             return self.transformer.transform(dataframe)  # noqa
         else:
-            return self.transformer(*args, **kwargs).transform(dataframe)
+            transformer = self.transformer(*args, **kwargs)
+            if self.inplace:
+                transformer.inplace = True
+            return transformer.transform(dataframe)
 
-    def load(self, df, *args, **kwargs) -> None:
+    def load(self, df, *args, **kwargs) -> Optional[int]:
         """
         Loads the passed dataframe into the passed elasticsearch instance's indice es_indice.
 
@@ -133,19 +346,43 @@ class Process:
             optional positional parameters for custom loader instanciation
         :param kwargs:
             optional keyword parameters for custom loader instanciation
-        :return:
+        :return: the number of documents that failed to load, if the loader reports it
+        """
+        if self.__loader_is_instanced:
+            if len(args) + len(kwargs) > 0:
+                warnings.warn("Instanced loader receiving extra arguments !")
+            return self.loader.load(df)
+        else:
+            return self.loader(*args, **kwargs).load(df)
+
+    def load_iter(self, dataframes: Iterable[DataFrame], *args, **kwargs) -> Optional[int]:
+        """
+        Loads the passed dataframes as a single stream into the loader.
+
+        :param dataframes: Iterable[pd.Dataframe]
+            the dataframes to load, typically chunks of a single file
+        :param args:
+            optional positional parameters for custom loader instanciation
+        :param kwargs:
+            optional keyword parameters for custom loader instanciation
+        :return: the number of documents that failed to load, if the loader reports it
         """
         if self.__loader_is_instanced:
             if len(args) + len(kwargs) > 0:
                 warnings.warn("Instanced loader receiving extra arguments !")
-            self.loader.load(df)
+            return self.loader.load_iter(dataframes)
         else:
-            self.loader(*args, **kwargs).load(df)
+            return self.loader(*args, **kwargs).load_iter(dataframes)
 
-    def bulk(self,  file_list: List[str]) -> None:
+    def bulk(self, file_list: List[str], workers: Optional[int] = None,
+             max_in_flight: Optional[int] = None, pipelined: Optional[bool] = None,
+             continue_on_error: bool = False) -> Dict[str, Exception]:
         """
         Given a list of files, loads the files into the loader's indice.
             Only works for Process with instanced Extractors, Transformers and Loaders
+            By default the first failing file's exception is raised, as soon as the files in flight are done. With
+            `continue_on_error`, a file failing does not abort the other ones : failures are logged and returned once
+            all files are done.
 
         =======
         Example
@@ -158,15 +395,30 @@ class Process:
         Example in the second format
         >>> my_second_conf = ["covid_stats_2020.csv", "covid_stats_2021.csv"]
         >>> process.bulk(my_second_conf)
+        Extracting & transforming up to 4 files at a time in 4 worker processes
+        >>> process.bulk(my_second_conf, workers=4)
+        Parsing the next file while the previous one is loaded
+        >>> process.bulk(my_second_conf, pipelined=True)
 
         :param file_list: the list of files to be bulked into the loader's indice
-        :return: None
+        :param workers: the number of worker processes extracting & transforming files, defaults to `self.workers`.
+            With more than 1 worker, files are loaded by this process' loader as soon as they are transformed, reusing
+            its elasticsearch connection. The extractor & transformers must then be picklable.
+        :param max_in_flight: the maximum number of files being extracted, transformed or waiting to be loaded at the
+            same time, defaults to `self.max_in_flight` or the number of workers. For pipelined bulks, the maximum
+            number of dataframes waiting between two stages, defaults to `self.max_in_flight` or 2.
+        :param pipelined: if True and there is a single worker, extraction, transformation & loading run in separate
+            threads connected by bounded queues, cf `Process._bulk_pipelined`. Defaults to `self.pipelined`.
+        :param continue_on_error: if True, keeps processing the remaining files when one fails, and returns the failures
+        :return: a dictionnary of the files that failed, mapped to the raised exception, empty unless
+            `continue_on_error` is True
         """
+        transformer_is_instanced = self.__transformer_is_instanced or self.__multiple_transformers
         try:
-            assert (self.__transformer_is_instanced & self.__loader_is_instanced)
+            assert (transformer_is_instanced & self.__loader_is_instanced)
         except AssertionError:
             err = ""
-            if not self.__transformer_is_instanced:
+            if not transformer_is_instanced:
                 err = "Transformer"
             if not self.__loader_is_instanced:
                 if err:
@@ -174,5 +426,153 @@ class Process:
                 else:
                     err = "Loader"
             raise ValueError(f"{err} not instanced")
+        workers = workers if workers is not None else self.workers
+        if workers > 1:
+            if self.chunksize is not None:
+                raise ValueError("chunksize cannot be combined with more than 1 worker : worker processes send whole "
+                                 "files back, use pipelined=True to stream files by chunks")
+            max_in_flight = max_in_flight or self.max_in_flight or workers
+            failures = self._bulk_in_parallel(file_list, workers, max_in_flight, continue_on_error)
+        elif pipelined if pipelined is not None else self.pipelined:
+            failures = self._bulk_pipelined(file_list, max_in_flight or self.max_in_flight or 2, continue_on_error)
+        else:
+            failures = {}
+            for file in file_list:
+                try:
+                    self.process(file)
+                except Exception as e:
+                    if not continue_on_error:
+                        raise
+                    logger.error(f"Failed processing file {file} : {e!r}")
+                    failures[file] = e
+        if failures:
+            logger.warning(f"{len(failures)} out of {len(file_list)} files failed : {list(failures)}")
+            if not continue_on_error:
+                raise next(iter(failures.values()))
+        return failures
+
+    def _bulk_in_parallel(self, file_list: List[str], workers: int, max_in_flight: int,
+                          continue_on_error: bool = True) -> Dict[str, Exception]:
+        """
+        Extracts & transforms the files in a pool of `workers` processes, and loads them in the current process as soon
+            as they are transformed. No more than `max_in_flight` files are submitted to the pool or waiting to be
+            loaded at the same time.
+
+        :param file_list: the list of files to be bulked into the loader's indice
+        :param workers: the number of worker processes
+        :param max_in_flight: the maximum number of files in flight
+        :param continue_on_error: if False, no file is submitted once one failed
+        :return: a dictionnary of the files that failed, mapped to the raised exception
+        """
+        stage = copy.copy(self)
+        stage.loader = None  # the loader's connection stays in this process
+        failures = {}
+        files = iter(file_list)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            for file in files:
+                in_flight[executor.submit(_extract_and_transform, stage, file)] = file
+                if len(in_flight) >= max_in_flight:
+                    break
+            while in_flight:
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    file = in_flight.pop(future)
+                    try:
+                        df, checkpoint = future.result()
+                        self._commit_if_loaded(file, self.load(df), checkpoint)
+                    except Exception as e:
+                        logger.error(f"Failed processing file {file} : {e!r}")
+                        failures[file] = e
+                    next_file = next(files, None) if continue_on_error or not failures else None
+                    if next_file is not None:
+                        in_flight[executor.submit(_extract_and_transform, stage, next_file)] = next_file
+        return failures
+
+    def _bulk_pipelined(self, file_list: List[str], max_in_flight: int,
+                        continue_on_error: bool = True) -> Dict[str, Exception]:
+        """
+        Runs extraction, transformation & loading as three stages, each in its own thread, connected by queues holding
+            at most `max_in_flight` dataframes. Extraction of the next file (or chunk, if the process has a chunksize)
+            thus overlaps with the loading of the previous one, while blocking queues bound the memory used.
+
+        :param file_list: the list of files to be bulked into the loader's indice
+        :param max_in_flight: the maximum number of dataframes waiting in each queue
+        :param continue_on_error: if False, no file is extracted once one failed
+        :return: a dictionnary of the files that failed, mapped to the raised exception
+        """
+        extracted = queue.Queue(maxsize=max_in_flight)
+        transformed = queue.Queue(maxsize=max_in_flight)
+        stop = threading.Event()
+        threading.Thread(target=self._extract_stage, args=(file_list, extracted, stop), daemon=True).start()
+        threading.Thread(target=self._transform_stage, args=(extracted, transformed), daemon=True).start()
+        failures = {}
         for file in file_list:
-            self.process(file)
+            frames = self._dequeue_file(transformed)
+            try:
+                if self.chunksize is not None:
+                    errors = self.load_iter(frames)
+                else:
+                    errors = self.load(next(frames))
+                self._commit_if_loaded(file, errors)
+            except Exception as e:
+                logger.error(f"Failed processing file {file} : {e!r}")
+                failures[file] = e
+                if not continue_on_error:
+                    stop.set()
+                    while not isinstance(transformed.get(), _EndOfStream):  # drops what the stages already queued
+                        pass
+                    break
+            try:
+                for _ in frames:  # drops what is left of the file if loading failed midway
+                    pass
+            except Exception:  # the file already failed
+                pass
+        return failures
+
+    def _extract_stage(self, file_list: List[str], output: queue.Queue, stop: threading.Event) -> None:
+        """
+        Puts the dataframes (or chunks) extracted from each file in `output`, followed by an end of file marker, until
+            all files are extracted or `stop` is set.
+        """
+        for file in file_list:
+            if stop.is_set():
+                break
+            try:
+                frames = self.extract_iter(file) if self.chunksize is not None else [self.extract(file)]
+                for frame in frames:
+                    output.put(frame)
+                output.put(_EndOfFile())
+            except Exception as e:
+                output.put(_StageError(e))
+        output.put(_EndOfStream())
+
+    def _transform_stage(self, input_: queue.Queue, output: queue.Queue) -> None:
+        """Puts the transformed dataframes from `input_` in `output`, until the end of the stream."""
+        failed = False
+        while True:
+            item = input_.get()
+            if isinstance(item, _EndOfStream):
+                output.put(item)
+                return
+            if isinstance(item, (_EndOfFile, _StageError)):
+                if not failed:
+                    output.put(item)
+                failed = False
+            elif not failed:
+                try:
+                    output.put(self.transform(item))
+                except Exception as e:
+                    output.put(_StageError(e))
+                    failed = True
+
+    @staticmethod
+    def _dequeue_file(input_: queue.Queue) -> Iterator[DataFrame]:
+        """Yields the dataframes of a single file from `input_`, raising the error of the stage that failed on it."""
+        while True:
+            item = input_.get()
+            if isinstance(item, _EndOfFile):
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
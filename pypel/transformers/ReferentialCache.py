@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from pandas import DataFrame, Index, MultiIndex, concat
+from pypel.config.config import get_config
+from pypel.extractors.ExtractionCache import _describe
+from typing import Dict, Optional, List, Union, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
+
+
+def _as_keys(mergekey: Optional[Union[str, List[str]]]) -> Optional[List[str]]:
+    if mergekey is None:
+        return None
+    return [mergekey] if isinstance(mergekey, str) else list(mergekey)
+
+
+def _configuration(extractor: Any) -> str:
+    """
+    Returns a description of the extractor's configuration, e.g. its columns, filters or dtype planner, so that two
+        differently configured extractors of the same class don't share their referentials.
+    """
+    configuration = {}
+    for name, value in getattr(extractor, "__dict__", {}).items():
+        if hasattr(value, "__dict__") and not callable(value):  # e.g. the dtype planner or the extraction cache
+            value = [type(value).__qualname__, vars(value)]
+        configuration[name] = value
+    return json.dumps(_describe(configuration), sort_keys=True)
+
+
+def merge_indexed(df: DataFrame, index: Index, values: DataFrame, mergekey: Union[str, List[str]],
+                  how: str) -> DataFrame:
+    """
+    Returns `df.merge(referential, how=how, on=mergekey)` for a referential split into a unique index of its merge keys
+        and its other columns: matching rows are found through the index's hash table, which pandas keeps between
+        calls, instead of hashing the referential's keys at every merge. Unlike pandas<2.2's inner merges, inner
+        merges keep the rows in the order of `df`.
+
+    :param df: the dataframe to enrich
+    :param index: the referential's merge keys, unique
+    :param values: the referential's other columns, with a `RangeIndex`
+    :param mergekey: the merge keys
+    :param how: the merge type, `left` or `inner`
+    :return: the enriched dataframe
+    """
+    keys = _as_keys(mergekey)
+    indexer = index.get_indexer(df[keys[0]] if len(keys) == 1 else MultiIndex.from_frame(df[keys]))
+    if how == "inner":
+        matched = indexer != -1
+        df, right = df[matched], values.take(indexer[matched])
+    elif (indexer == -1).any():
+        right = values.reindex(indexer)
+    else:
+        right = values.take(indexer)
+    overlapping = df.columns.intersection(right.columns)
+    left = df.rename(columns={column: f"{column}_x" for column in overlapping}).reset_index(drop=True)
+    right = right.rename(columns={column: f"{column}_y" for column in overlapping}).set_axis(left.index)
+    return concat([left, right], axis=1)
+
+
+def _memory_usage(referential: Union[DataFrame, Tuple[Index, DataFrame]]) -> int:
+    if isinstance(referential, DataFrame):
+        return int(referential.memory_usage(deep=True).sum())
+    index, values = referential
+    return int(index.memory_usage(deep=True) + values.memory_usage(deep=True).sum())
+
+
+class ReferentialCache:
+    """
+    In-memory cache of the referentials extracted from files, shared by all the transformers of the running process
+        so that a directory's files are merged with a referential parsed once. Entries are keyed by the referential's
+        absolute path, size & modification time, the extractor's class, the extraction parameters and the merge keys,
+        and referentials whose merge keys are unique are stored indexed on them, cf `merge_indexed`. Least recently
+        used entries are evicted once the cached referentials use over `max_size` bytes.
+
+    The cache can be disabled with `set_config(REFERENTIAL_CACHE_SIZE=0)` or the `--no-cache` command line flag.
+        Cached referentials are shared: they must not be modified.
+
+    :param max_size: the maximum memory used by the cached referentials in bytes, defaults to
+        `get_config()["REFERENTIAL_CACHE_SIZE"]` when None
+    """
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._entries: "OrderedDict[Tuple, Tuple[Any, bool, int]]" = OrderedDict()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size if self._max_size is not None else get_config()["REFERENTIAL_CACHE_SIZE"]
+
+    @property
+    def size(self) -> int:
+        """The memory used by the cached referentials in bytes."""
+        return sum(size for _, _, size in self._entries.values())
+
+    def key(self, file_path: Union[str, os.PathLike], extractor: Any, params: Dict[str, Any],
+            mergekey: Optional[Union[str, List[str]]] = None) -> Tuple:
+        """
+        Returns the key of the passed referential extracted with the passed extractor & parameters.
+
+        :param file_path: path to the referential
+        :param extractor: the extractor used
+        :param params: the extraction parameters
+        :param mergekey: the merge keys
+        :return: a hashable key
+        """
+        stat = os.stat(file_path)
+        keys = _as_keys(mergekey)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, type(extractor).__qualname__,
+                _configuration(extractor), json.dumps(_describe(params), sort_keys=True),
+                tuple(keys) if keys is not None else None)
+
+    def get(self, file_path: Union[str, os.PathLike], extract: Callable[[], DataFrame], extractor: Any,
+            params: Dict[str, Any], mergekey: Optional[Union[str, List[str]]] = None) -> Tuple[Any, bool]:
+        """
+        Returns the cached referential, extracting and caching it if missing.
+
+        :param file_path: path to the referential
+        :param extract: function extracting the referential
+        :param extractor: the extractor used, part of the key
+        :param params: the extraction parameters, part of the key
+        :param mergekey: the merge keys the referential is indexed on if they are unique
+        :return: the referential and whether it is indexed on the merge keys, indexed referentials being split into
+            an index of their merge keys and a dataframe of their other columns, cf `merge_indexed`
+        """
+        key = self.key(file_path, extractor, params, mergekey)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            logger.debug(f"Referential cache hit for file \'{file_path}\'")
+            referential, indexed, _ = self._entries[key]
+            return referential, indexed
+        referential, indexed = extract(), False
+        keys = _as_keys(mergekey)
+        if keys is not None and all(key_ in referential.columns for key_ in keys):
+            index = Index(referential[keys[0]]) if len(keys) == 1 else MultiIndex.from_frame(referential[keys])
+            if index.is_unique:
+                referential = (index, referential.drop(columns=keys).reset_index(drop=True))
+                indexed = True
+        size = _memory_usage(referential)
+        if size <= self.max_size:
+            self._entries[key] = (referential, indexed, size)
+            self.evict()
+        return referential, indexed
+
+    def merge(self, df: DataFrame, file_path: Union[str, os.PathLike], extract: Callable[[], DataFrame],
+              extractor: Any, params: Dict[str, Any], mergekey: Optional[Union[str, List[str]]] = None,
+              how: str = "inner") -> DataFrame:
+        """
+        Returns `df.merge(extract(), how=how, on=mergekey)`, the referential being cached.
+
+        :param df: the dataframe to enrich
+        :param file_path: path to the referential
+        :param extract: function extracting the referential
+        :param extractor: the extractor used, part of the key
+        :param params: the extraction parameters, part of the key
+        :param mergekey: the merge keys (pandas merge's on parameter)
+        :param how: the merge type
+        :return: the enriched dataframe
+        """
+        if self.max_size <= 0:
+            return df.merge(extract(), how=how, on=mergekey)
+        referential, indexed = self.get(file_path, extract, extractor, params, mergekey)
+        if not indexed:
+            return df.merge(referential, how=how, on=mergekey)
+        index, values = referential
+        keys = _as_keys(mergekey)
+        dtypes = [index.dtype] if len(keys) == 1 else list(index.dtypes)
+        if how in ("left", "inner") and all(df[key_].dtype == dtype for key_, dtype in zip(keys, dtypes)):
+            return merge_indexed(df, index, values, mergekey, how)
+        return df.merge(concat([index.to_frame(index=False), values], axis=1), how=how, on=mergekey)
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache's size is under `self.max_size`.
+
+        :return: None
+        """
+        size = self.size
+        while self._entries and size > self.max_size:
+            _, (_, _, entry_size) = self._entries.popitem(last=False)
+            size -= entry_size
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._entries.clear()
+
+
+_referential_cache = ReferentialCache()
+
+
+def get_referential_cache() -> ReferentialCache:
+    """Returns the referential cache shared by the transformers of the running process."""
+    return _referential_cache
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+import pandas as pd
+from pypel.config.config import get_config
+from pypel.extractors.Extractors import Extractor
+from typing import Dict, Optional, List, Union, Any
+
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, get_config()["LOGS_LEVEL"]))
+
+_TABLE = "referential"
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _common_dtype(first: str, second: str) -> str:
+    """Returns the dtype of a column read as `first` in some chunks and `second` in others."""
+    if first == second:
+        return first
+    if first in ("int64", "float64") and second in ("int64", "float64"):
+        return "float64"
+    return "object"
+
+
+class ReferentialStore:
+    """
+    On-disk SQLite copy of a referential indexed on its merge keys, for referentials too large to be merged in memory:
+        `build` writes it chunk by chunk once, then `lookup` returns the rows matching a batch of keys, using memory
+        proportional to the batch rather than to the referential. Columns get their extracted dtypes back on lookup.
+
+    Rows with null keys never match, unlike in pandas merges. Each thread looking up keys gets its own connection to
+        the file, e.g. the loading thread of a pipelined `Process.bulk`.
+
+    :param path: path to the SQLite file, written by `build`
+    """
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = path
+        self._meta: Optional[Dict[str, Any]] = None
+        self._init_connections()
+
+    def _init_connections(self) -> None:
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:  # connections cannot be sent to worker processes
+        return {key: value for key, value in self.__dict__.items()
+                if key not in ("_local", "_connections", "_lock")}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_connections()
+
+    @classmethod
+    def build(cls, path: Union[str, os.PathLike],
+              referential: Union[str, os.PathLike],
+              mergekey: Union[str, List[str]],
+              extractor: Optional[Extractor] = None,
+              chunksize: int = 100000,
+              **kwargs) -> "ReferentialStore":
+        """
+        Extracts the referential chunk by chunk (cf `Extractor.extract_iter`) into a new SQLite file, indexed on the
+            merge keys, replacing the file atomically if it exists.
+
+        :param path: path to the SQLite file to write
+        :param referential: path to the referential file
+        :param mergekey: the column(s) the referential will be looked up by
+        :param extractor: the extractor to use for extracting the referential, defaults to `Extractor()`
+        :param chunksize: the number of rows extracted & written at once
+        :param kwargs: additional parameters passed to the extractor
+        :return: the built store
+        """
+        keys = [mergekey] if isinstance(mergekey, str) else list(mergekey)
+        extractor = extractor if extractor is not None else Extractor()
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        dtypes: Dict[str, str] = {}
+        rows = 0
+        connection = sqlite3.connect(tmp_path)
+        try:
+            for chunk in extractor.extract_iter(referential, chunksize, **kwargs):
+                missing = [key for key in keys if key not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Merge keys {missing} not found in referential {referential}")
+                for column, dtype in chunk.dtypes.items():
+                    dtypes[column] = _common_dtype(dtypes.get(column, str(dtype)), str(dtype))
+                chunk.to_sql(_TABLE, connection, if_exists="append", index=False)
+                rows += len(chunk)
+            connection.execute(f"CREATE INDEX {_TABLE}_keys ON {_TABLE} ({', '.join(_quote(key) for key in keys)})")
+            connection.execute("CREATE TABLE meta (value TEXT)")
+            connection.execute("INSERT INTO meta VALUES (?)", (json.dumps({"keys": keys, "dtypes": dtypes}),))
+            connection.commit()
+            os.replace(tmp_path, path)
+        finally:
+            connection.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if get_config()["LOGS"]:
+            logger.info(f"Stored {rows} rows of referential \'{referential}\' in \'{path}\'")
+        return cls(path)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The current thread's connection to the SQLite file."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if not os.path.isfile(self.path):
+                raise FileNotFoundError(f"No referential store at {self.path}, please build it beforehands")
+            # only used by this thread, but closed by whichever thread calls `close`
+            connection = self._local.connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @property
+    def keys(self) -> List[str]:
+        """The merge keys the referential is indexed on."""
+        return self._read_meta()["keys"]
+
+    def _read_meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = json.loads(self.connection.execute("SELECT value FROM meta").fetchone()[0])
+        return self._meta
+
+    def lookup(self, keys: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the rows of the referential whose merge keys are among the passed ones.
+
+        :param keys: a dataframe of merge keys, one column per key
+        :return: the matching rows of the referential, with the referential's dtypes
+        """
+        meta = self._read_meta()
+        columns = [_quote(key) for key in meta["keys"]]
+        values = keys[meta["keys"]].drop_duplicates().dropna()
+        cursor = self.connection.cursor()
+        cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS lookup ({', '.join(columns)})")
+        try:
+            cursor.executemany(f"INSERT INTO temp.lookup VALUES ({', '.join('?' * len(columns))})",
+                               values.astype(object).itertuples(index=False, name=None))
+            condition = " AND ".join(f"r.{column} = k.{column}" for column in columns)
+            matches = pd.read_sql_query(f"SELECT r.* FROM {_TABLE} AS r JOIN temp.lookup AS k ON {condition}",
+                                        self.connection)
+        finally:
+            cursor.execute("DELETE FROM temp.lookup")
+        for column, dtype in meta["dtypes"].items():
+            if dtype.startswith("datetime64"):
+                matches[column] = pd.to_datetime(matches[column])
+            elif dtype != "object" and (dtype != "bool" or not matches[column].isna().any()):
+                matches[column] = matches[column].astype(dtype)
+        return matches
+
+    def close(self) -> None:
+        """Closes the connections of every thread to the SQLite file."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._local = threading.local()
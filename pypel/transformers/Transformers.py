@@ -1,13 +1,233 @@
 import os
+import re
 from pypel.extractors.Extractors import Extractor
+from pypel.transformers.ReferentialCache import get_referential_cache
+from pypel.transformers.ReferentialStore import ReferentialStore
 import warnings
-from typing import List, Dict, Optional, Any, Union
-from pandas import DataFrame, to_datetime, NA
+from typing import List, Dict, Optional, Any, Union, Callable
+from pandas import DataFrame, Series, RangeIndex, CategoricalDtype, StringDtype, to_datetime, factorize, isna
+from pandas.api.types import infer_dtype
+import numpy as np
 import abc
+from collections import OrderedDict
+
+_REGEX_CHARACTERS = set(".^$*+?{}[]\\|()")
+
+
+def _map_unique(values: np.ndarray, function: Callable[[Any], Any], cache: "OrderedDict[Any, Any]",
+                cache_size: Optional[int]) -> np.ndarray:
+    """
+    Returns an object array of the function's results for every value, calling it once per distinct value: the values
+        are factorized, the distinct values missing from the cache are computed and the results taken back by code.
+        Null values are left untouched, and columns mixing types are mapped value by value since factorizing them would
+        merge values comparing equal, e.g. 1 and True.
+
+    :param values: the values to map
+    :param function: the function to apply to every non-null value
+    :param cache: least recently used results of the function keyed by type and value, updated in place
+    :param cache_size: the maximum number of results kept in the cache, unbounded if None
+    :return: an object array of the mapped values
+    """
+    if values.dtype == object and infer_dtype(values, skipna=True).startswith("mixed"):
+        nulls = isna(values)
+        result = np.array(values, dtype=object)
+        for i in np.flatnonzero(~nulls):
+            result[i] = function(values[i])
+        return result
+    codes, uniques = factorize(values)  # nulls are coded -1
+    mapped = np.empty(len(uniques), dtype=object)
+    for i, value in enumerate(uniques):
+        key = (type(value), value)  # 1 == 1.0 == True
+        try:
+            mapped[i] = cache[key]
+            cache.move_to_end(key)
+        except KeyError:
+            mapped[i] = cache[key] = function(value)
+    while cache_size is not None and len(cache) > cache_size:
+        cache.popitem(last=False)
+    result = mapped.take(codes) if len(mapped) else np.empty(len(values), dtype=object)
+    nulls = codes == -1
+    if nulls.any():
+        result[nulls] = np.asarray(values, dtype=object)[nulls]
+    return result
+
+
+def _replace_na_by_none(df: DataFrame, inplace: bool = False) -> DataFrame:
+    """
+    Returns a dataframe where NaNs, NaTs, pd.NA & Nones of the passed dataframe are replaced by None, working column by
+        column with null masks. Only columns containing null values are converted to the object dtype.
+
+    :param df: the dataframe to treat
+    :param inplace: if True and the dataframe's column names are unique, replaces the columns of the passed dataframe
+    :return: a dataframe with Nones instead of null values
+    """
+    inplace = inplace and df.columns.is_unique
+    columns = {}
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        mask = column.isna().to_numpy()
+        if mask.any():
+            values = column.to_numpy(dtype=object, copy=True)
+            values[mask] = None
+            column = Series(values, index=df.index, name=column.name, dtype=object)
+            if inplace:
+                df[column.name] = column
+        columns[i] = column
+    if inplace:
+        return df
+    result = DataFrame(columns, index=df.index)
+    result.columns = df.columns
+    return result
+
+
+_ISO_UNITS = {"%Y": "Y", "%Y-%m": "M", "%Y-%m-%d": "D", "%Y-%m-%dT%H:%M": "m", "%Y-%m-%dT%H:%M:%S": "s",
+              "%Y-%m-%dT%H:%M:%S.%f": "us"}
+
+
+def _format_datetimes(column: Series, date_format: str) -> Series:
+    """
+    Returns the column's datetimes formatted like `Series.dt.strftime` does, NaTs becoming NaNs. Only the distinct
+        datetimes are formatted, by `numpy.datetime_as_string` for naive datetimes in the ISO formats of `_ISO_UNITS`.
+
+    :param column: the column of datetimes to format
+    :param date_format: the strftime format
+    :raise AttributeError: if the column does not hold datetimes
+    :return: the formatted column, of object dtype
+    """
+    column.dt  # raises AttributeError for non datetime-like columns, like .dt.strftime
+    codes, uniques = factorize(column)  # NaTs are coded -1
+    if column.dtype == "datetime64[ns]" and date_format in _ISO_UNITS:
+        formatted = np.datetime_as_string(uniques.to_numpy(), unit=_ISO_UNITS[date_format]).astype(object)
+    else:
+        formatted = uniques.strftime(date_format).to_numpy(dtype=object)
+    formatted = np.append(formatted, np.nan).take(codes)
+    return Series(formatted, index=column.index, name=column.name, dtype=object)
+
+
+def _set_column(df: DataFrame, i: int, values: Series) -> None:
+    """Replaces the `i`-th column of the dataframe, even if its name is duplicated, without `DataFrame.isetitem`."""
+    if df.columns.is_unique:
+        df[df.columns[i]] = values
+        return
+    columns = df.columns
+    df.columns = RangeIndex(len(columns))
+    try:
+        df[i] = values
+    finally:
+        df.columns = columns
+
+
+class _ContentReplacer:
+    """
+    Replaces the contents of string cells like `DataFrame.replace(replace_dict, regex=True)` does: pairs are applied in
+        order to the cells their pattern matched before any replacement, a string replacement substitutes every match
+        (backreferences included) while any other replacement value replaces the whole cell.
+
+    Patterns are compiled once, and only object columns are walked, once each, every cell going through all the
+        replacements. Literal patterns use `str.replace`, and consecutive literal pairs that cannot interfere with each
+        other (no character of a pattern found in the previous patterns or replacements) are merged in a single
+        alternation. Dictionnaries with non-string or empty keys fall back to `DataFrame.replace`.
+
+    Cells are replaced once per distinct value, cf `_map_unique`.
+
+    :param replace_dict: dictionnary of format {"old": "new"} where old is a regex matching the string to replace
+    """
+    cache_size = 100000
+
+    def __init__(self, replace_dict: Dict[Any, Any]):
+        self.replace_dict = replace_dict
+        self.exact = any(not isinstance(old, str) or not old for old in replace_dict)
+        self.keeps_objects = all(new is None for new in replace_dict.values())
+        self._cache = OrderedDict()
+        self.steps = []
+        if self.exact:
+            return
+        group, group_characters = {}, set()
+        for old, new in replace_dict.items():
+            literal = isinstance(new, str) and not _REGEX_CHARACTERS & set(old) and "\\" not in new
+            if not literal or group_characters & set(old):
+                self._add_literals(group)
+                group, group_characters = {}, set()
+            if literal:
+                group[old] = new
+                group_characters |= set(old) | set(new)
+            else:
+                self.steps.append(("sub" if isinstance(new, str) else "match", re.compile(old), new))
+        self._add_literals(group)
+
+    def _add_literals(self, group: Dict[str, str]) -> None:
+        if len(group) == 1:
+            (old, new), = group.items()
+            self.steps.append(("literal", old, new))
+        elif group:
+            self.steps.append(("literals", re.compile("|".join(re.escape(old) for old in group)), group))
+
+    def _replace_value(self, value: Any) -> Any:
+        return self._replace(value) if isinstance(value, str) else value
+
+    def _replace(self, original: str) -> Any:
+        value = original
+        for kind, pattern, new in self.steps:
+            if not isinstance(value, str):
+                break
+            if kind == "literal":
+                if pattern in original:
+                    value = value.replace(pattern, new)
+            elif kind == "literals":
+                present = new if value == original else {old: new[old] for old in new if old in original}
+                value = pattern.sub(lambda match: present.get(match.group(), match.group()), value)
+            elif kind == "sub":
+                if value == original or pattern.search(original) is not None:
+                    value = pattern.sub(new, value)
+            elif pattern.search(original) is not None and pattern.search(value) is not None:
+                value = new
+        return value
+
+    def replace(self, df: DataFrame, columns: Optional[List[str]] = None) -> DataFrame:
+        """
+        Replaces the contents of the string columns of the dataframe, in place.
+
+        :param df: the dataframe to modify
+        :param columns: if passed, only these columns are modified
+        :return: the modified dataframe
+        """
+        if columns is not None:
+            for column in columns:
+                if column not in df.columns:
+                    warnings.warn(f"No such column {column} in passed dataframe")
+            columns = [column for column in columns if column in df.columns]
+        if not self.replace_dict:
+            return df
+        if self.exact:
+            targets = df if columns is None else df[columns]
+            replaced = targets.replace(self.replace_dict, regex=True)
+            for i, column in enumerate(targets.columns):
+                df[column] = replaced.iloc[:, i]
+            return df
+        for i in range(df.shape[1]):
+            if columns is not None and df.columns[i] not in columns:
+                continue
+            column = df.iloc[:, i]
+            if column.dtype == object:
+                replaced = _map_unique(column.to_numpy(), self._replace_value, self._cache, self.cache_size)
+                replaced = Series(replaced, index=df.index, name=column.name)
+                _set_column(df, i, replaced if self.keeps_objects else replaced.infer_objects())
+            elif isinstance(column.dtype, (CategoricalDtype, StringDtype)):
+                _set_column(df, i, column.replace(self.replace_dict, regex=True))
+        return df
 
 
 class BaseTransformer:
-    """Dummy class that all Transformers must inherit from."""
+    """
+    Dummy class that all Transformers must inherit from.
+
+    `supports_chunks` must be set to True by transformers whose output for a dataframe is the concatenation of their
+        outputs for any split of said dataframe (i.e. row-wise transformers), allowing their use in streaming Processes.
+    `inplace` is set to True by Processes running in place: the transformer then owns the dataframe it receives and
+        may modify it instead of working on a copy.
+    """
+    supports_chunks = False
+    inplace = False
 
     @abc.abstractmethod
     def transform(self, *args, **kwargs) -> Any:
@@ -31,19 +251,25 @@ class Transformer(BaseTransformer):
         or [the docs](https://docs.python.org/3/library/datetime.html#strftime-and-strptime-format-codes)
     :param date_columns:
         list of columns that are to be parsed as dates
+    :param replace_columns:
+        list of columns whose contents `df_replace` applies to, defaults to all string columns
     """
+    supports_chunks = True
 
     def __init__(self,
                  strip: Optional[List[str]] = None,
                  column_replace: Optional[Dict[str, str]] = None,
                  df_replace: Optional[Dict[Any, Any]] = None,
                  date_format: Optional[str] = None,
-                 date_columns: Optional[List[str]] = None):
+                 date_columns: Optional[List[str]] = None,
+                 replace_columns: Optional[List[str]] = None):
         self.column_replace = {} if not column_replace else column_replace
         self.df_replace = {} if not df_replace else df_replace
         self.columns_to_strip = [] if not strip else strip
         self.date_format = date_format
         self.date_columns = date_columns
+        self.replace_columns = replace_columns
+        self._content_replacer = _ContentReplacer(self.df_replace)
 
     def transform(self,
                   dataframe: DataFrame) -> DataFrame:
@@ -54,7 +280,7 @@ class Transformer(BaseTransformer):
             the dataframe to transform
         :return:
         """
-        df = dataframe.copy()
+        df = dataframe if self.inplace else dataframe.copy()
         self._format_str_columns(df)
         self._format_contents(df)
         self._format_dates(df)
@@ -81,12 +307,12 @@ class Transformer(BaseTransformer):
         """
         returns df with normalized contents, replacing every value using self.df_replace
         self.df_replace should be in the following format : {"value_to_replace": "replacement_value"}
+        Only the string cells of self.replace_columns (or of every column) are visited, cf `_ContentReplacer`.
 
         :param df: the dataframe to normalize
         :return: the normalized dataframe
         """
-        df.replace(self.df_replace, regex=True, inplace=True)
-        return df
+        return self._content_replacer.replace(df, self.replace_columns)
 
     def _format_na(self, df: DataFrame) -> DataFrame:
         """
@@ -95,8 +321,7 @@ class Transformer(BaseTransformer):
         :param df: the dataframe that is to be treated
         :return: the modified dataframe, with Nones instead of NaNs & NaTs
         """
-        df = df.applymap(lambda x: None if x != x else x)
-        return df
+        return _replace_na_by_none(df, self.inplace)
 
     def _format_dates(self, df: DataFrame, date_format: Optional[str] = None,
                       date_columns: Optional[List[str]] = None) -> DataFrame:
@@ -112,7 +337,7 @@ class Transformer(BaseTransformer):
         cols = date_columns if date_columns else self.date_columns
         if cols is not None and date_format is not None:
             for col in cols:
-                df[col] = df[col].dt.strftime(date_format)
+                df[col] = _format_datetimes(df[col], date_format)
         elif date_format is None and cols is not None:
             warnings.warn("Incorrect usage : date_format not specified as argument nor in Transformer's constructor")
         elif cols is None and date_format is not None:
@@ -131,6 +356,8 @@ class Transformer(BaseTransformer):
         """
         Enrich passed dataframe by merging it with a referential, either passed as dataframe
             or by a path to extract from, and then return it. Additional keyword parameters are passed to the Extractor.
+            Referentials extracted from a file are kept in the process-wide `ReferentialCache`, so that merging all the
+            files of a directory with the same referential only extracts it once.
 
         :param df: the dataframe to enrich
         :param mergekey: the mergekeys the merge will be executed upon (pandas merge's on parameter)
@@ -143,76 +370,158 @@ class Transformer(BaseTransformer):
             return df.merge(referential, how=how, on=mergekey)
         elif extractor is not None:
             assert isinstance(extractor, Extractor)
-            return df.merge(extractor.extract(referential, **kwargs),
-                            how=how,
-                            on=mergekey)
         else:
             try:
                 assert isinstance(referential, str) or isinstance(referential, os.PathLike)
             except AssertionError as e:
                 raise ValueError("Pass a string or an os.PathLike object pointing to the referential !") from e
-            return df.merge(Extractor()
-                            .extract(referential, **kwargs),
-                            how=how,
-                            on=mergekey)
+            extractor = Extractor()
+        if not isinstance(referential, (str, os.PathLike)) or not os.path.isfile(referential):
+            return df.merge(extractor.extract(referential, **kwargs), how=how, on=mergekey)
+        return get_referential_cache().merge(df, referential, lambda: extractor.extract(referential, **kwargs),
+                                             extractor, kwargs, mergekey, how)
 
 
 class ColumnStripperTransformer(BaseTransformer):
     """Strips column names, removing trailing and leading whitespaces."""
+    supports_chunks = True
 
     def transform(self, df: DataFrame) -> DataFrame:
-        return df.rename(columns=str.strip)
+        return df.rename(columns=str.strip, copy=not self.inplace)
 
 
 class ColumnReplacerTransformer(BaseTransformer):
     """Allows replacing column names."""
+    supports_chunks = True
 
     def transform(self, df: DataFrame, column_replace_dict: Dict[str, str]) -> DataFrame:
-        return df.rename(columns=column_replace_dict)
+        return df.rename(columns=column_replace_dict, copy=not self.inplace)
 
 
 class ColumnCapitaliserTransformer(BaseTransformer):
     """Capitalizes column names."""
+    supports_chunks = True
 
     def transform(self, df: DataFrame) -> DataFrame:
-        return df.rename(columns=str.capitalize)
+        return df.rename(columns=str.capitalize, copy=not self.inplace)
 
 
-class ColumnContenStripperTransformer(BaseTransformer):
-    """Strips/trims the contents of a column. Said column(s) must contain only str values."""
+class ElementWiseTransformer(BaseTransformer):
+    """
+    Base of the transformers applying a function to every value of some columns, which must implement
+        `transform_value`. The function is only called once per distinct value of a column (cf `_map_unique`), and
+        its results are kept in a bounded least recently used cache shared by all the chunks and files transformed by
+        the instance: the cost scales with the columns' cardinality rather than their length.
 
-    def transform(self, df: DataFrame, columns_to_strip: List[str]) -> DataFrame:
-        df_ = df.copy()
-        for column in columns_to_strip:
-            try:
-                df_[column] = df_[column].str.strip()
-            except KeyError:
+    :param columns: the columns to transform
+    :param cache_size: the maximum number of results kept between calls, unbounded if None
+    """
+    supports_chunks = True
+
+    def __init__(self, columns: Optional[List[str]] = None, cache_size: Optional[int] = 100000):
+        self.columns = columns
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    @abc.abstractmethod
+    def transform_value(self, value: Any) -> Any:
+        """Returns the transformed value, null values are never passed."""
+
+    def transform_column(self, column: Series) -> Series:
+        """
+        :param column: the column to transform
+        :return: the transformed column, categorical columns only have their categories transformed
+        """
+        if isinstance(column.dtype, CategoricalDtype):
+            categories = column.cat.categories
+            mapped = _map_unique(categories.to_numpy(), self.transform_value, self._cache, self.cache_size)
+            return column.map(dict(zip(categories, mapped)))
+        mapped = _map_unique(column.to_numpy(), self.transform_value, self._cache, self.cache_size)
+        return Series(mapped, index=column.index, name=column.name)
+
+    def transform(self, df: DataFrame, columns: Optional[List[str]] = None) -> DataFrame:
+        """
+        :param df: the dataframe to modify
+        :param columns: columns to transform instead of those passed at instanciation
+        :return: the modified dataframe
+        """
+        df_ = df if self.inplace else df.copy()
+        for column in columns if columns is not None else self.columns or []:
+            if column not in df_.columns:
                 warnings.warn(f"No such column {column} in passed dataframe")
-            except AttributeError:
-                warnings.warn(f"Column {column} is not of type `str`, cannot strip.")
+                continue
+            df_[column] = self.transform_column(df_[column])
         return df_
 
 
+class ColumnContenStripperTransformer(ElementWiseTransformer):
+    """
+    Strips/trims the contents of a column. Said column(s) must contain only str values.
+
+    :param columns_to_strip: the columns to strip
+    :param cache_size: the maximum number of stripped values kept between calls, cf `ElementWiseTransformer`
+    """
+    def __init__(self, columns_to_strip: Optional[List[str]] = None, cache_size: Optional[int] = 100000):
+        super().__init__(columns_to_strip, cache_size)
+
+    def transform_value(self, value: Any) -> Any:
+        return value.strip() if isinstance(value, str) else np.nan
+
+    def transform_column(self, column: Series) -> Series:
+        try:
+            column.str
+        except AttributeError:
+            warnings.warn(f"Column {column.name} is not of type `str`, cannot strip.")
+            return column
+        return super().transform_column(column)
+
+    def transform(self, df: DataFrame, columns_to_strip: Optional[List[str]] = None) -> DataFrame:
+        return super().transform(df, columns_to_strip)
+
+
 class ContentReplacerTransformer(BaseTransformer):
-    """Allows replacing contents of a column"""
+    """
+    Allows replacing contents of a column, like `DataFrame.replace(replace_dict, regex=True)`.
+        The replacements passed at instanciation are compiled once, cf `_ContentReplacer`.
+
+    :param replace_dict: dictionnary of format {"old": "new"} where old is a regex matching the string to replace
+    :param columns: the columns to modify, defaults to all string columns
+    """
+    supports_chunks = True
+
+    def __init__(self, replace_dict: Optional[Dict[Any, Any]] = None, columns: Optional[List[str]] = None):
+        self.replace_dict = replace_dict
+        self.columns = columns
+        self._content_replacer = _ContentReplacer(replace_dict or {})
 
-    def transform(self, df: DataFrame, replace_dict: Dict[Any, Any]) -> DataFrame:
-        return df.replace(replace_dict, regex=True)
+    def transform(self, df: DataFrame, replace_dict: Optional[Dict[Any, Any]] = None,
+                  columns: Optional[List[str]] = None) -> DataFrame:
+        """
+        :param df: the dataframe to modify
+        :param replace_dict: replacements to apply instead of those passed at instanciation
+        :param columns: columns to modify instead of those passed at instanciation
+        :return: the modified dataframe
+        """
+        replacer = self._content_replacer if replace_dict is None else _ContentReplacer(replace_dict)
+        df_ = df if self.inplace else df.copy()
+        return replacer.replace(df_, columns if columns is not None else self.columns)
 
 
 class NullValuesReplacerTransformer(BaseTransformer):
     """Replaces NaNs, NaTs or similar values by None, because None is understood by elasticsearc where nans arent."""
+    supports_chunks = True
 
     def transform(self, df: DataFrame) -> DataFrame:
         """
-        We use x != x because we want to check for both NaN & NaT at the same time, also any value that do pass this
-        check should probably be taken care of anyway.
+        Null values are detected column by column using pandas' null masks (`isna`), which catch NaN, NaT, pd.NA & None
+        at once. Columns without null values keep their dtype.
         """
-        return df.applymap(lambda x: None if x is NA or x != x else x)
+        return _replace_na_by_none(df, self.inplace)
 
 
 class DateFormatterTransformer(BaseTransformer):
-    """Allows changing the date format of specific datetime columns"""
+    """Allows changing the date format of specific datetime columns, cf `_format_datetimes`"""
+    supports_chunks = True
 
     def transform(self, df: DataFrame, date_columns: List[str], date_format="%Y-%m-%d") -> DataFrame:
         """
@@ -221,10 +530,10 @@ class DateFormatterTransformer(BaseTransformer):
         :param date_format: the desired dateformat. Defaults to yyyy-MM-dd
         :return: the modified dataframe
         """
-        df_ = df.copy()
+        df_ = df if self.inplace else df.copy()
         for col in date_columns:
             try:
-                df_[col] = df_[col].dt.strftime(date_format)
+                df_[col] = _format_datetimes(df_[col], date_format)
             except AttributeError as e:
                 raise ValueError(f"Column {col} has non-datetime values, the columns to format must be datetimes. "
                                  f"Please parse beforehands.") from e
@@ -233,6 +542,7 @@ class DateFormatterTransformer(BaseTransformer):
 
 class DateParserTransformer(BaseTransformer):
     """Converts passed columns' values to datetime objects. Date parsing is prefered at extraction."""
+    supports_chunks = True
 
     def transform(self, df: DataFrame, date_columns: List[str], date_format: str = "%Y-%m-%d") -> DataFrame:
         """
@@ -242,23 +552,75 @@ class DateParserTransformer(BaseTransformer):
         :param date_format: the strftime format to parse from
         :return:
         """
-        df_ = df.copy()
+        df_ = df if self.inplace else df.copy()
         for col in date_columns:
             df_[col] = to_datetime(df_[col], format=date_format)
         return df_
 
 
 class MergerTransformer(BaseTransformer):
-    def transform(self, df: DataFrame, ref: DataFrame, mergekey: Optional[Union[str, List[str]]] = None,
-                  how: str = "inner") -> DataFrame:
+    """
+    Enriches dataframes by merging them with a referential. Referentials passed as a path are extracted once and kept in
+        the process-wide `ReferentialCache`.
+
+    :param referential: the referential to merge with, either a `DataFrame` or a path to extract it from
+    :param mergekey: the mergekeys the merge will be executed upon (pandas merge's on parameter)
+    :param how: the mergetype e.g. `inner`, `outer` etc... equivalent to pandas.merge's `how` parameter.
+    :param kwargs: additional parameters passed to the `Extractor` extracting the referential
+    """
+    def __init__(self, referential: Optional[Union[str, os.PathLike, DataFrame]] = None,
+                 mergekey: Optional[Union[str, List[str]]] = None,
+                 how: str = "inner",
+                 **kwargs):
+        self.referential = referential
+        self.mergekey = mergekey
+        self.how = how
+        self.extract_kwargs = kwargs
+
+    def transform(self, df: DataFrame, ref: Optional[Union[str, os.PathLike, DataFrame]] = None,
+                  mergekey: Optional[Union[str, List[str]]] = None, how: Optional[str] = None) -> DataFrame:
         """
-        Enrich passed dataframe by merging it with a referential passed as dataframe.
+        Enrich passed dataframe by merging it with a referential passed as dataframe or path.
             Uses pandas.DataFrame.merge.
 
         :param df: the dataframe to enrich
-        :param mergekey: the mergekeys the merge will be executed upon (pandas merge's on parameter)
-        :param ref: the referential to merge with
-        :param how: the mergetype e.g. `inner`, `outer` etc... equivalent to pandas.merge's `how` parameter.
+        :param mergekey: the mergekeys the merge will be executed upon, defaults to the instance's
+        :param ref: the referential to merge with, defaults to the instance's
+        :param how: the mergetype, defaults to the instance's
+        :return: pd.Dataframe: the enriched dataframe
+        """
+        ref = ref if ref is not None else self.referential
+        mergekey = mergekey if mergekey is not None else self.mergekey
+        how = how if how is not None else self.how
+        if isinstance(ref, DataFrame):
+            return df.merge(ref, how=how, on=mergekey)
+        if not isinstance(ref, (str, os.PathLike)):
+            raise ValueError("Pass a DataFrame, a string or an os.PathLike object pointing to the referential !")
+        extractor = Extractor()
+        return get_referential_cache().merge(df, ref, lambda: extractor.extract(ref, **self.extract_kwargs),
+                                             extractor, self.extract_kwargs, mergekey, how)
+
+
+class StoreMergerTransformer(BaseTransformer):
+    """
+    Enriches dataframes with a referential stored on disk by `ReferentialStore.build`, looking up the keys of each
+        dataframe in the store instead of loading the whole referential: memory is proportional to the dataframe.
+        Equivalent to a `left` or `inner` merge with the referential, except for null keys which never match.
+
+    :param store: the store, or the path to its SQLite file
+    :param how: `left` or `inner`
+    """
+    supports_chunks = True
+
+    def __init__(self, store: Union[ReferentialStore, str, os.PathLike], how: str = "left"):
+        if how not in ("left", "inner"):
+            raise ValueError(f"Unsupported merge type {how}, referential stores only support left & inner merges")
+        self.store = store if isinstance(store, ReferentialStore) else ReferentialStore(store)
+        self.how = how
+
+    def transform(self, df: DataFrame) -> DataFrame:
+        """
+        :param df: the dataframe to enrich
         :return: pd.Dataframe: the enriched dataframe
         """
-        return df.merge(ref, how=how, on=mergekey)
+        return df.merge(self.store.lookup(df), how=self.how, on=self.store.keys)
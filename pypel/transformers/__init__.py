@@ -1,8 +1,12 @@
 from .Transformers import (BaseTransformer, Transformer, ColumnStripperTransformer, ColumnReplacerTransformer,
                            ContentReplacerTransformer, ColumnCapitaliserTransformer, ColumnContenStripperTransformer,
                            NullValuesReplacerTransformer, DateParserTransformer, DateFormatterTransformer,
-                           MergerTransformer)
+                           MergerTransformer, ElementWiseTransformer, StoreMergerTransformer)
+from .ReferentialCache import ReferentialCache, get_referential_cache
+from .ReferentialStore import ReferentialStore
 
 __all__ = ["BaseTransformer", "Transformer", "ColumnReplacerTransformer", "ColumnCapitaliserTransformer",
            "ColumnStripperTransformer", "ColumnContenStripperTransformer", "ContentReplacerTransformer",
-           "NullValuesReplacerTransformer", "DateFormatterTransformer", "DateParserTransformer", "MergerTransformer"]
+           "NullValuesReplacerTransformer", "DateFormatterTransformer", "DateParserTransformer", "MergerTransformer",
+           "ElementWiseTransformer", "ReferentialCache", "get_referential_cache", "StoreMergerTransformer",
+           "ReferentialStore"]
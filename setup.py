@@ -11,4 +11,5 @@ setup(name='pypel',
                         "openpyxl >= 3.0.0",
                         "numpy >= 1.19.1",
                         "unidecode",
-                        "xlrd >= 2.0.0"])
+                        "xlrd >= 2.0.0"],
+      extras_require={"arrow": ["pyarrow"], "zstd": ["zstandard"]})
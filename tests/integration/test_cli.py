@@ -82,7 +82,10 @@ class TestGetArgs:
         expected = {
             "source_path": "/home/user/data.csv",
             "config_file": "./conf/config.json",
-            "process": "all"}
+            "process": "all",
+            "chunksize": None,
+            "workers": None,
+            "no_cache": False}
         actual = get_args(["-f", "/home/user/data.csv"])
         for key in actual.__dict__:
             assert actual.__getattribute__(key) == expected[key]
@@ -91,8 +94,12 @@ class TestGetArgs:
         expected = {
             "source_path": "/file",
             "config_file": "/home/user/pypel_conf.json",
-            "process": "MYPROCESS"}
-        actual = get_args(["-f", "/file", "-c", "/home/user/pypel_conf.json", "-p", "MYPROCESS"])
+            "process": "MYPROCESS",
+            "chunksize": 1000,
+            "workers": 4,
+            "no_cache": True}
+        actual = get_args(["-f", "/file", "-c", "/home/user/pypel_conf.json", "-p", "MYPROCESS", "-s", "1000",
+                           "-w", "4", "--no-cache"])
         for key in actual.__dict__:
             assert actual.__getattribute__(key) == expected[key]
 
@@ -117,12 +124,26 @@ class TestProcessFromConfig:
         process_from_config(process_config, "./tests/fake_data/test_init_df.csv")
 
     def test_directory(self, monkeypatch, process_config):
-        def bulk_assert_called_with(_, list_):  # _ is self here
+        def bulk_assert_called_with(_, list_, continue_on_error):  # _ is self here
+            assert continue_on_error
             assert list_ == [os.path.join("./tests/fake_data/", file) for file in os.listdir("./tests/fake_data/")]
 
         monkeypatch.setattr(pypel.processes.Process, "bulk", bulk_assert_called_with)
         process_from_config(process_config, "./tests/fake_data/")
 
+    def test_directory_raises_if_files_failed(self, monkeypatch, process_config):
+        monkeypatch.setattr(pypel.processes.Process, "bulk", lambda _, list_, **kwargs: {list_[0]: ValueError()})
+        with pytest.raises(RuntimeError, match="1 files could not be processed"):
+            process_from_config(process_config, "./tests/fake_data/")
+
+    def test_chunksize_streams_file(self, monkeypatch, process_config):
+        def stream_assert_called_with(self, file_path):
+            assert self.chunksize == 2
+            assert file_path == "./tests/fake_data/test_init_df.csv"
+
+        monkeypatch.setattr(pypel.processes.Process, "stream", stream_assert_called_with)
+        process_from_config(process_config, "./tests/fake_data/test_init_df.csv", chunksize=2)
+
 
 class TestSelectProcessFromConfig:
     def test_raises_if_processes_not_found(self):
@@ -7,6 +7,8 @@ import pypel.loaders.Loaders as loader
 from pandas import DataFrame
 import elasticsearch
 import ssl
+from numpy import nan
+from pandas import NaT, Timestamp
 
 
 class LoaderTest(loader.Loader):
@@ -47,6 +49,14 @@ class TestLoader:
             loader_ = LoaderTest(es_conf, es_indice, backup=True, path_to_export_folder=path)
             loader_.load(df)
 
+    def test_load_iter_exports_header_once(self, es_conf, es_indice, monkeypatch):
+        df = DataFrame(data=[[6, 6], [7, 7]], columns=["0", "1"])
+        monkeypatch.setattr(loader.Loader, "_bulk_into_elastic", lambda _, actions: list(actions))
+        with tempfile.TemporaryDirectory() as path:
+            loader.Loader(es_conf, es_indice, backup=True, path_to_export_folder=path).load_iter([df, df, df])
+            with open(os.path.join(path, os.listdir(path)[0])) as f:
+                assert f.read().splitlines() == ["0|1"] + ["6|6", "7|7"] * 3
+
     def test_loading_no_export(self, es_conf, es_indice):
         df = DataFrame(data=[[6, 6, 6, 6, 6],
                              [7, 7, 7, 7, 7],
@@ -66,6 +76,19 @@ class TestLoader:
             loader_ = LoaderTest(es_conf, es_indice, backup=True, path_to_export_folder=path, name_export="name")
             loader_.load(df)
 
+    def test_load_iter_recreates_indice_once(self, es_conf, es_indice, df, monkeypatch):
+        recreated = []
+        loader_ = LoaderTest(es_conf, es_indice, overwrite=True)
+        monkeypatch.setattr(loader_, "_recreate_indice", lambda: recreated.append(True))
+        loader_.load_iter([df, df, df])
+        assert recreated == [True]
+
+    def test_load_iter_wraps_all_chunks(self, es_conf, es_indice, df, monkeypatch):
+        loaded = []
+        monkeypatch.setattr(loader.Loader, "_bulk_into_elastic", lambda _, actions: loaded.extend(actions))
+        loader.Loader(es_conf, es_indice).load_iter([df, df])
+        assert [action["_source"]["0"] for action in loaded] == [0, 1, 2, 0, 1, 2]
+
     def test_bad_folder_crashes(self, es_conf, es_indice):
         with pytest.raises(ValueError):
             loader.Loader(es_conf, es_indice, path_to_export_folder="/this_folder_does_not_exist", backup=True)
@@ -82,28 +105,43 @@ class TestLoader:
 
     def test_bulk_into_elastic(self, monkeypatch, es_conf, es_indice):
         monkeypatch.setattr(loader.elasticsearch.helpers, "streaming_bulk", mock_streaming_bulk_no_error)
-        loader.Loader(es_conf, es_indice)._bulk_into_elastic([])
+        assert loader.Loader(es_conf, es_indice)._bulk_into_elastic([]) == 0
 
     def test_bulk_into_elastic_warns_on_error(self, monkeypatch, es_conf, es_indice, caplog):
         monkeypatch.setattr(loader.elasticsearch.helpers, "streaming_bulk",
                             mock_streaming_bulk_some_errors)
         with caplog.at_level(logging.DEBUG, logger="pypel.loaders.Loaders"):
-            loader.Loader(es_conf, es_indice)._bulk_into_elastic([])
+            assert loader.Loader(es_conf, es_indice)._bulk_into_elastic([]) == 3
             assert ("pypel.loaders.Loaders", logging.WARNING, "3 errors detected") in caplog.record_tuples
             assert ("pypel.loaders.Loaders", logging.DEBUG,
                     "Error details : [{'error': {'fake_reason': 'fake_error'}}, "
                     "{'error': {'fake_reason': 'fake_error'}}, {'error': {'fake_reason': 'fake_error'}}]")\
                    in caplog.record_tuples
 
+    def test_bulk_into_elastic_uses_parallel_bulk_with_threads(self, monkeypatch, es_conf, es_indice, caplog):
+        def mock_parallel_bulk(client, actions, thread_count, chunk_size, max_chunk_bytes, raise_on_error):
+            assert (thread_count, chunk_size, max_chunk_bytes, raise_on_error) == (4, 100, 1000, False)
+            return mock_streaming_bulk_some_errors()
+
+        monkeypatch.setattr(loader.elasticsearch.helpers, "parallel_bulk", mock_parallel_bulk)
+        with caplog.at_level(logging.INFO, logger="pypel.loaders.Loaders"):
+            loader.Loader(es_conf, es_indice, thread_count=4, chunk_size=100,
+                          max_chunk_bytes=1000)._bulk_into_elastic([])
+            assert ("pypel.loaders.Loaders", logging.WARNING, "3 errors detected") in caplog.record_tuples
+
+    def test_bad_thread_count_crashes(self, es_conf, es_indice):
+        with pytest.raises(ValueError):
+            loader.Loader(es_conf, es_indice, thread_count=0)
+
     def test_change_time_freq(self, es_conf, es_indice, df, monkeypatch):
         def assert_bulk_called_with(_, action):  # _ is placeholder for self
             y = datetime.datetime.now().strftime("_%Y")
-            assert action == [{"_index": "test_indice" + y,
-                               "_source": {"0": 0}},
-                              {"_index": "test_indice" + y,
-                               "_source": {"0": 1}},
-                              {"_index": "test_indice" + y,
-                               "_source": {"0": 2}}]
+            assert list(action) == [{"_index": "test_indice" + y,
+                                     "_source": {"0": 0}},
+                                    {"_index": "test_indice" + y,
+                                     "_source": {"0": 1}},
+                                    {"_index": "test_indice" + y,
+                                     "_source": {"0": 2}}]
 
         loader_ = loader.Loader(es_conf, es_indice, time_freq="_%Y")
         monkeypatch.setattr(loader.Loader, "_bulk_into_elastic", assert_bulk_called_with)
@@ -112,17 +150,48 @@ class TestLoader:
     def test_default_time_freq(self, es_conf, es_indice, df, monkeypatch):
         def assert_bulk_called_with(_, action):  # _ is placeholder for self
             y = datetime.datetime.now().strftime("_%m_%Y")
-            assert action == [{"_index": "test_indice" + y,
-                               "_source": {"0": 0}},
-                              {"_index": "test_indice" + y,
-                               "_source": {"0": 1}},
-                              {"_index": "test_indice" + y,
-                               "_source": {"0": 2}}]
+            assert list(action) == [{"_index": "test_indice" + y,
+                                     "_source": {"0": 0}},
+                                    {"_index": "test_indice" + y,
+                                     "_source": {"0": 1}},
+                                    {"_index": "test_indice" + y,
+                                     "_source": {"0": 2}}]
 
         loader_ = loader.Loader(es_conf, es_indice)
         monkeypatch.setattr(loader.Loader, "_bulk_into_elastic", assert_bulk_called_with)
         loader_.load(df)
 
+    def test_wrap_df_in_actions_is_lazy_and_batched(self, es_conf, es_indice):
+        df = DataFrame({"0": range(5)})
+        actions = loader.Loader(es_conf, es_indice)._wrap_df_in_actions(df, batch_size=2)
+        assert not isinstance(actions, list)
+        assert [action["_source"] for action in actions] == [{"0": i} for i in range(5)]
+
+    def test_wrap_df_in_actions_keeps_duplicated_index_rows(self, es_conf, es_indice):
+        df = DataFrame({"0": [0, 1, 2]}, index=[0, 0, 1])
+        actions = list(loader.Loader(es_conf, es_indice)._wrap_df_in_actions(df))
+        assert [action["_source"] for action in actions] == [{"0": 0}, {"0": 1}, {"0": 2}]
+
+    def test_columnar_actions_are_encoded_documents(self, es_conf, es_indice):
+        df = DataFrame({"int": [1, 2], "float": [0.5, nan], "str": ["é", None],
+                        "date": [Timestamp("2019-05-12"), NaT], "bool": [True, False]})
+        loader_ = loader.Loader(es_conf, es_indice, columnar=True)
+        actions = list(loader_._wrap_df_in_actions(df))
+        assert [action["_source"] for action in actions] == [
+            '{"int":1,"float":0.5,"str":"é","date":"2019-05-12T00:00:00","bool":true}',
+            '{"int":2,"float":null,"str":null,"date":null,"bool":false}']
+        assert loader_._expand_encoded_action(actions[0]) == (f'{{"index":{{"_index":"{loader_.indice}"}}}}',
+                                                              actions[0]["_source"])
+
+    def test_columnar_bulk_uses_encoded_actions_expansion(self, monkeypatch, es_conf, es_indice):
+        def mock_streaming_bulk(client, actions, expand_action_callback, **kwargs):
+            assert expand_action_callback == loader_._expand_encoded_action
+            return mock_streaming_bulk_no_error()
+
+        loader_ = loader.Loader(es_conf, es_indice, columnar=True)
+        monkeypatch.setattr(loader.elasticsearch.helpers, "streaming_bulk", mock_streaming_bulk)
+        loader_._bulk_into_elastic([])
+
     def test_es_indices_exists(self, es_conf, es_indice, df, monkeypatch):
         def mock_indices_exists(indice):
             assert indice == es_indice + datetime.datetime.now().strftime("_%m_%Y")
@@ -2,14 +2,17 @@ from pypel import get_config, set_config
 
 
 def test_default_config_getter():
-    assert get_config() == {"LOGS": True, "LOGS_LEVEL": "INFO"}
+    assert get_config() == {"LOGS": True, "LOGS_LEVEL": "INFO", "EXTRACTION_CACHE": True,
+                            "REFERENTIAL_CACHE_SIZE": 512 * 1024 ** 2}
 
 
 def test_config_setter():
     set_config(LOGS=False)
-    assert get_config() == {"LOGS": False, "LOGS_LEVEL": "INFO"}
+    assert get_config() == {"LOGS": False, "LOGS_LEVEL": "INFO", "EXTRACTION_CACHE": True,
+                            "REFERENTIAL_CACHE_SIZE": 512 * 1024 ** 2}
     set_config(LOGS=True)
 
 
 def test_disable_logs_fixture(disable_logs):
-    assert get_config() == {"LOGS": False, "LOGS_LEVEL": "INFO"}
+    assert get_config() == {"LOGS": False, "LOGS_LEVEL": "INFO", "EXTRACTION_CACHE": True,
+                            "REFERENTIAL_CACHE_SIZE": 512 * 1024 ** 2}
@@ -1,7 +1,17 @@
+import logging
 import pytest
-from pypel.extractors import Extractor, CSVExtractor, XLSExtractor, XLSXExtractor
+from pypel.extractors import Extractor, CSVExtractor, XLSExtractor, XLSXExtractor, ExtractionCache, DtypePlanner, \
+    CheckpointStore
+from pypel import set_config
+import bz2
+import json
+import gzip
+import lzma
+import shutil
+import tempfile
+import openpyxl
 import pandas as pd
-from pandas.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal, assert_series_equal
 import os
 
 
@@ -140,6 +150,39 @@ class TestExtractor:
         df = ex.extract(path_xls)
         assert_frame_equal(expected_xls, df)
 
+    def test_extract_csv_with_pyarrow_engine(self):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        df = Extractor(engine="pyarrow", arrow_strings=True).extract(path_csv, converters={"a": str})
+        assert df["a"].dtype == "string[pyarrow]"
+        assert df["a"].tolist() == [str(i) for i in range(1, 10)]
+
+    def test_extract_iter_csv(self, ex):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        chunks = list(ex.extract_iter(path_csv, chunksize=5))
+        assert [len(chunk) for chunk in chunks] == [5, 4]
+
+    def test_extract_sheets_concatenated_with_sheet_column(self, ex):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        df = ex.extract_sheets(path, sheet_names=["Feuille1", "TEST"], workers=2, sheet_column="SHEET",
+                               usecols=["a"])
+        assert_frame_equal(pd.DataFrame({"a": [1, 2, 3, 4, 5, 6, 7, 8, 9, 9],
+                                         "SHEET": ["Feuille1"] * 9 + ["TEST"]}), df)
+
+    def test_extract_sheets_raises_if_not_excel(self, ex):
+        with pytest.raises(ValueError):
+            ex.extract_sheets("./setup.py")
+
+    def test_extract_iter_xls_yields_whole_sheet(self, ex):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xls")
+        chunks = list(ex.extract_iter(path))
+        assert len(chunks) == 1
+        assert_frame_equal(ex.extract(path), chunks[0])
+
+    def test_extract_iter_xlsx_streams_chunks(self, ex):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        chunks = list(ex.extract_iter(path, chunksize=5))
+        assert [len(chunk) for chunk in chunks] == [5, 4]
+
 
 class TestCSVExtractor:
     def test_extract_csv(self, csv):
@@ -170,6 +213,114 @@ class TestCSVExtractor:
         df = csv.extract(path_csv)
         assert_frame_equal(expected_csv, df)
 
+    def test_logs_parsed_row_count(self, csv, caplog):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        with caplog.at_level(logging.DEBUG, logger="pypel.extractors.Extractors"):
+            csv.extract(path_csv)
+        assert ("pypel.extractors.Extractors", logging.DEBUG,
+                "9 rows (excluding header) read from the csv test_init_df.csv") in caplog.record_tuples
+
+    def test_extract_iter_yields_bounded_chunks(self, csv):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        chunks = list(csv.extract_iter(path_csv, chunksize=4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+        assert_frame_equal(csv.extract(path_csv), pd.concat(chunks))
+
+    def test_extract_iter_applies_converters(self, csv):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        chunk = next(csv.extract_iter(path_csv, chunksize=2, converters={"a": str}))
+        assert chunk["a"].tolist() == ["1", "2"]
+
+    def test_pyarrow_engine_matches_default_engine(self, csv):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        assert_frame_equal(csv.extract(path_csv, usecols=["a", "c"]),
+                           CSVExtractor(engine="pyarrow").extract(path_csv, usecols=["a", "c"]))
+
+    def test_pyarrow_engine_converters_get_raw_strings(self, tmp_path):
+        path_csv = str(tmp_path / "codes.csv")
+        with open(path_csv, "w") as f:
+            f.write("code,label\n007,a\n,b\n")
+        df = CSVExtractor(engine="pyarrow").extract(path_csv, converters={"code": lambda x: f"<{x}>"})
+        assert df["code"].tolist() == ["<007>", "<>"]
+
+    @pytest.mark.parametrize("compressed", [False, True])
+    def test_pyarrow_engine_dtypes_and_dates_like_default_engine(self, tmp_path, compressed):
+        path_csv = str(tmp_path / "typed.csv") + (".gz" if compressed else "")
+        with (gzip.open if compressed else open)(path_csv, "wt") as f:
+            f.write("code,day,at,amount\n00123,2021-03-01,2021-03-01 10:00:00,1\n"
+                    "00456,2021-03-02,2021-03-02 11:30:00,2\n")
+        kwargs = {"dtype": {"code": str, "amount": "float32"}, "dates": ["at"]}
+        expected = CSVExtractor().extract(path_csv, **kwargs)
+        actual = CSVExtractor(engine="pyarrow").extract(path_csv, **kwargs)
+        assert actual["code"].tolist() == ["00123", "00456"]
+        assert actual["day"].tolist() == ["2021-03-01", "2021-03-02"]
+        assert_frame_equal(expected, actual)
+
+    def test_pyarrow_engine_raises_on_unsupported_args(self):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        with pytest.raises(ValueError, match="not supported by the pyarrow csv engine"):
+            CSVExtractor(engine="pyarrow").extract(path_csv, thousands=" ")
+
+    def test_plan_parts_aligns_on_quoted_records(self, csv, tmp_path):
+        path_csv = str(tmp_path / "quoted.csv")
+        with open(path_csv, "w") as f:
+            f.write("id,text\n" + "".join(f'{i},"line\n""{i}""\nend"\n' for i in range(50)))
+        plan = csv.plan_parts(path_csv, 7)
+        assert len(plan) > 1
+        parts = [csv.extract_part(**part) for part in plan]
+        assert_frame_equal(csv.extract(path_csv), pd.concat(parts, ignore_index=True))
+
+    def test_parts_share_sampled_dtypes(self, csv, tmp_path):
+        path_csv = str(tmp_path / "mixed.csv")
+        with open(path_csv, "w") as f:
+            f.write("code,value\n" + "".join(f"{i},{i}\n" for i in range(20)) + "A1,1.5\n")
+        parts = [csv.extract_part(**part) for part in csv.plan_parts(path_csv, 4, sample_rows=30)]
+        assert all(list(part.dtypes) == [object, "float64"] for part in parts)
+        assert pd.concat(parts)["code"].tolist()[:2] == ["0", "1"]
+
+    def test_parts_not_fitting_sampled_dtypes(self, csv, tmp_path):
+        path_csv = str(tmp_path / "late.csv")
+        with open(path_csv, "w") as f:
+            f.write("code,value\n" + "".join(f"{i},{i}\n" for i in range(40)) + "A1,\n")
+        plan = csv.plan_parts(path_csv, 4, sample_rows=10)
+        assert plan[0]["sampled_dtype"] == {"code": "int64", "value": "int64"}
+        with pytest.warns(UserWarning, match=r"Columns \['code', 'value'\] of bytes"):
+            parts = [csv.extract_part(**part) for part in plan]
+        assert list(parts[0].dtypes) == ["int64", "int64"]
+        assert list(parts[-1].dtypes) == [object, "float64"]
+        df = pd.concat(parts, ignore_index=True)
+        assert df["code"].iloc[-1] == "A1"
+        assert_series_equal(csv.extract(path_csv)["value"], df["value"])
+
+    def test_plan_parts_rejects_row_positioning_args(self, csv):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        with pytest.raises(ValueError, match="Argument skiprows is not supported"):
+            csv.plan_parts(path_csv, 2, skiprows=1)
+
+    def test_extract_parts_in_parallel(self, csv):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        parts = list(csv.extract_parts(path_csv, parts=3, workers=2))
+        assert_frame_equal(csv.extract(path_csv), pd.concat(parts, ignore_index=True))
+
+    @pytest.mark.parametrize("engine", [None, "pyarrow"])
+    def test_arrow_strings(self, tmp_path, engine):
+        path_csv = str(tmp_path / "strings.csv")
+        with open(path_csv, "w") as f:
+            f.write("name,value\nfoo,1\n,2\n")
+        df = CSVExtractor(engine=engine, arrow_strings=True).extract(path_csv)
+        assert df["name"].dtype == "string[pyarrow]"
+        assert df["name"].isna().tolist() == [False, True]
+        assert df["value"].dtype == "int64"
+
+    def test_arrow_strings_require_pandas_1_3(self, monkeypatch):
+        class StringDtype:  # pandas<1.3's StringDtype has no storage argument
+            def __init__(self):
+                pass
+
+        monkeypatch.setattr(pd, "StringDtype", StringDtype)
+        with pytest.raises(ValueError, match="arrow_strings requires pandas>=1.3"):
+            CSVExtractor(arrow_strings=True)
+
 
 class TestXLSXExtractor:
     def test_extract_xlsx(self, xlsx):
@@ -216,6 +367,57 @@ class TestXLSXExtractor:
         obtained_sheetname = xlsx.extract(path, sheet_name="TEST")
         assert_frame_equal(expected_sheetname, obtained_sheetname)
 
+    def test_extract_sheets_in_parallel(self, xlsx):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        sheets = xlsx.extract_sheets(path, workers=2)
+        assert list(sheets) == ["Feuille1", "TEST"]
+        assert_frame_equal(xlsx.extract(path, sheet_name="TEST"), sheets["TEST"])
+
+    def test_extract_iter_matches_extract(self, xlsx):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        chunks = list(xlsx.extract_iter(path, chunksize=4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+        assert_frame_equal(xlsx.extract(path), pd.concat(chunks, ignore_index=True))
+
+    def test_extract_iter_names_and_indexes_like_read_excel(self, xlsx, tmp_path):
+        path = str(tmp_path / "headers.xlsx")
+        wb = openpyxl.Workbook()
+        wb.active.append(["a", None, "a", "a.1", "a"])
+        for i in range(5):
+            wb.active.append([i] * 5)
+        wb.save(path)
+        chunks = list(xlsx.extract_iter(path, chunksize=2))
+        assert [chunk.index.tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+        assert_frame_equal(xlsx.extract(path), pd.concat(chunks))
+
+    def test_extract_iter_passes_pandas_args(self, xlsx):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        chunks = list(xlsx.extract_iter(path, chunksize=4, nrows=6))
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert_frame_equal(xlsx.extract(path, nrows=6), pd.concat(chunks))
+
+    def test_extract_iter_skiprows_no_header(self, xlsx):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        actual = pd.concat(xlsx.extract_iter(path, skiprows=5, header=None), ignore_index=True)
+        assert_frame_equal(xlsx.extract(path, skiprows=5, header=None), actual)
+
+    def test_extract_iter_usecols_and_converters(self, xlsx):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        chunk = next(xlsx.extract_iter(path, chunksize=2, usecols=["a", "c"], converters={"a": str}))
+        assert_frame_equal(pd.DataFrame({"a": ["1", "2"], "c": [1, 2]}), chunk)
+
+    def test_extract_iter_raises_on_multiple_sheets(self, xlsx):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        with pytest.raises(ValueError):
+            next(xlsx.extract_iter(path, sheet_name=[0, "TEST"]))
+
+    def test_logs_row_count_of_sheet(self, xlsx, caplog):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        with caplog.at_level(logging.DEBUG, logger="pypel.extractors.Extractors"):
+            xlsx.extract(path, sheet_name="TEST")
+        assert ("pypel.extractors.Extractors", logging.DEBUG,
+                "2 rows in the excel sheet 'TEST'   from file 'test_init_df.xlsx'") in caplog.record_tuples
+
     def test_raises_if_badly_named_file(self, xlsx):
         with pytest.warns(UserWarning):
             xlsx.extract(os.path.join(os.getcwd(), "tests", "fake_data", "test_bad_filename$.xlsx"))
@@ -259,3 +461,296 @@ class TestXLSExtractor:
                                           [9, 9, 9, 9, 9]], columns=["a", "b", "c", "d", "e"])
         df = xls.extract(path_xls)
         assert_frame_equal(expected_xls, df)
+
+
+@pytest.fixture
+def cache_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+class TestExtractionCache:
+    def test_cached_extraction_is_reused(self, cache_dir, monkeypatch):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        extractor = XLSXExtractor(cache_dir=cache_dir)
+        expected = extractor.extract(path, usecols=["a", "b"])
+        assert len(os.listdir(cache_dir)) == 1
+        monkeypatch.setattr(pd, "read_excel", None)
+        assert_frame_equal(expected, extractor.extract(path, usecols=["a", "b"]))
+
+    def test_cached_extraction_is_reused_without_planning(self, cache_dir, monkeypatch):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        extractor = XLSXExtractor(cache_dir=cache_dir, dtype_planner=DtypePlanner())
+        expected = extractor.extract(path)
+        assert expected.dtypes.tolist() == ["Int8"] * 5
+        monkeypatch.setattr(pd, "read_excel", None)
+        assert_frame_equal(expected, extractor.extract(path))
+        assert len(os.listdir(cache_dir)) == 1
+        with pytest.raises(TypeError):  # planned with another configuration
+            XLSXExtractor(cache_dir=cache_dir, dtype_planner={"sample_rows": 4}).extract(path)
+
+    def test_cache_keyed_by_parameters(self, cache_dir):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        extractor = Extractor(cache_dir=cache_dir)
+        extractor.extract(path)
+        assert_frame_equal(pd.DataFrame(data=[[9]], columns=["a"]), extractor.extract(path, sheet_name="TEST"))
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_cache_bypassed_by_config(self, cache_dir):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xls")
+        set_config(EXTRACTION_CACHE=False)
+        try:
+            XLSExtractor(cache_dir=cache_dir).extract(path)
+        finally:
+            set_config(EXTRACTION_CACHE=True)
+        assert os.listdir(cache_dir) == []
+
+    def test_uncachable_dataframe_is_skipped(self, cache_dir):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        df = XLSXExtractor(cache_dir=cache_dir).extract(path, skiprows=5, header=None)
+        assert list(df.columns) == [0, 1, 2, 3, 4]
+        assert os.listdir(cache_dir) == []
+
+    def test_cache_keyed_by_converters_code(self, cache_dir):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        cache = ExtractionCache(cache_dir)
+
+        def add(n):
+            return lambda x: x + n
+
+        assert cache.key(path, {"converters": {"a": lambda x: x + 1}}) != \
+            cache.key(path, {"converters": {"a": lambda x: x * 2}})
+        assert cache.key(path, {"converters": {"a": lambda x: x.upper()}}) != \
+            cache.key(path, {"converters": {"a": lambda x: x.lower()}})
+        assert cache.key(path, {"converters": {"a": add(1)}}) != cache.key(path, {"converters": {"a": add(2)}})
+        assert cache.key(path, {"converters": {"a": add(1)}}) == cache.key(path, {"converters": {"a": add(1)}})
+
+    def test_unsupported_arrow_type_is_skipped(self, cache_dir):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        ExtractionCache(cache_dir).put(path, {}, pd.DataFrame({"a": [1j]}))
+        assert os.listdir(cache_dir) == []
+
+    def test_evicts_least_recently_used(self, cache_dir):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        cache = ExtractionCache(cache_dir)
+        df = pd.DataFrame({"a": range(1000)})
+        cache.put(path, {"key": 1}, df)
+        cache.max_size = os.path.getsize(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+        os.utime(os.path.join(cache_dir, os.listdir(cache_dir)[0]), (0, 0))
+        cache.put(path, {"key": 2}, df)
+        assert cache.get(path, {"key": 1}) is None
+        assert_frame_equal(df, cache.get(path, {"key": 2}))
+
+
+class TestDtypePlanner:
+    def test_infer(self):
+        sample = pd.DataFrame({"departement": ["75", "75", "13", "75"],
+                               "label": ["a", "b", "c", "d"],
+                               "count": [1, 2, 3, 100],
+                               "missing": [1, None, 3, 4],
+                               "price": [1.5, 2.25, None, 3.0],
+                               "precise": [0.123456789, 1, 2, 3]})
+        assert DtypePlanner().infer(sample, skipped=["precise"]) == {
+            "departement": "category", "label": "string", "count": "Int16", "missing": "Int8", "price": "float32"}
+
+    def test_keeps_float64_when_digits_would_be_lost(self):
+        assert DtypePlanner().infer(pd.DataFrame({"amount": [12345678.91, 2.5]})) == {"amount": "float64"}
+
+    def test_csv_parsed_with_planned_dtypes(self, tmp_path):
+        path_csv = str(tmp_path / "data.csv")
+        with open(path_csv, "w") as f:
+            f.write("status,amount,code\n" + "ok,1,a\nko,2,b\nok,,c\nok,4,d\n")
+        df = CSVExtractor(dtype_planner={"sample_rows": 4}).extract(path_csv, converters={"code": str})
+        assert df.dtypes.to_dict() == {"status": "category", "amount": "Int8", "code": object}
+        assert df["amount"].isna().tolist() == [False, False, True, False]
+
+    def test_explicit_dtypes_win(self):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        df = CSVExtractor(dtype_planner=DtypePlanner()).extract(path_csv, dtype={"a": "int64"})
+        assert df["a"].dtype == "int64"
+        assert df["b"].dtype == "Int8"
+
+    def test_planned_dtypes_saved_per_name(self, tmp_path, monkeypatch):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        extractor = Extractor(dtype_planner={"name": "MY_PROCESS", "schema_dir": str(tmp_path)})
+        extractor.extract(path)
+        assert os.listdir(tmp_path) == ["MY_PROCESS.json"]
+        monkeypatch.setattr(DtypePlanner, "infer", None)
+        assert extractor.extract(path).dtypes.tolist() == ["Int8"] * 5
+
+    def test_does_not_plan_integers_overflowing_twice_their_range(self):
+        assert DtypePlanner().infer(pd.DataFrame({"big": [2 ** 62, 1]})) == {}
+
+    def test_values_out_of_sampled_range_keep_parsed_dtype(self, tmp_path):
+        path_csv = str(tmp_path / "data.csv")
+        with open(path_csv, "w") as f:
+            f.write("count,price\n" + "1,1.5\n2,2.5\n" * 5 + "100000,0.123456789\n")
+        expected_warnings = ["Column count holds values its planned dtype Int8 cannot",
+                             "Column price holds values its planned dtype float32 cannot"]
+        with pytest.warns(UserWarning) as record:
+            df = CSVExtractor(dtype_planner={"sample_rows": 4}).extract(path_csv)
+        assert sorted(str(warning.message).split(",")[0] for warning in record) == expected_warnings
+        assert df.dtypes.to_dict() == {"count": "int64", "price": "float64"}
+        assert df["count"].iloc[-1] == 100000
+        assert df["price"].iloc[-1] == 0.123456789
+        with pytest.warns(UserWarning) as record:
+            chunks = list(CSVExtractor(dtype_planner={"sample_rows": 4}).extract_iter(path_csv, chunksize=6))
+        assert sorted(str(warning.message).split(",")[0] for warning in record) == expected_warnings
+        assert chunks[0].dtypes.to_dict() == {"count": "Int8", "price": "float32"}
+
+    def test_xlsx_extract_iter_plans_from_streamed_rows(self, monkeypatch):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        monkeypatch.setattr(pd, "read_excel", None)
+        chunks = list(XLSXExtractor(dtype_planner={"sample_rows": 4}).extract_iter(path, chunksize=4))
+        assert [chunk.dtypes.tolist() for chunk in chunks] == [["Int8"] * 5] * 3
+
+    def test_planned_again_if_columns_changed(self, tmp_path):
+        path_csv = str(tmp_path / "data.csv")
+        with open(path_csv, "w") as f:
+            f.write("a,b\n1,x\n2,x\n")
+        extractor = CSVExtractor(dtype_planner={"name": "MY_PROCESS", "schema_dir": str(tmp_path / "schemas")})
+        assert extractor.extract(path_csv).dtypes.to_dict() == {"a": "Int8", "b": "category"}
+        with open(path_csv, "w") as f:
+            f.write("b,a\n1,x\n2,x\n")
+        assert extractor.extract(path_csv).dtypes.to_dict() == {"b": "Int8", "a": "category"}
+        with open(tmp_path / "schemas" / "MY_PROCESS.json") as f:
+            assert json.load(f)["columns"] == ["b", "a"]
+
+
+class TestProjectionAndFilters:
+    @pytest.fixture
+    def path_csv(self, tmp_path):
+        path = str(tmp_path / "projects.csv")
+        with open(path, "w") as f:
+            f.write("dep,amount,label,unused\n" + "".join(f"{i % 3},{i},p{i},x\n" for i in range(10)))
+        return path
+
+    def test_columns_only_parses_allowed_columns(self, path_csv):
+        df = CSVExtractor(columns=["label", "amount"]).extract(path_csv)
+        assert list(df.columns) == ["amount", "label"]
+
+    def test_filters_rows_chunk_by_chunk(self, path_csv, monkeypatch):
+        monkeypatch.setattr(CSVExtractor, "filter_chunksize", 3)
+        df = CSVExtractor(columns=["label"], filters=[["dep", "==", 1], ["amount", ">=", 4]]).extract(path_csv)
+        assert_frame_equal(pd.DataFrame({"label": ["p4", "p7"]}), df)
+
+    def test_filters_chunks_while_iterating(self, path_csv):
+        extractor = CSVExtractor(filters=[["label", "in", ["p0", "p1", "p9"]]])
+        chunks = list(extractor.extract_iter(path_csv, chunksize=5))
+        assert [chunk["label"].tolist() for chunk in chunks] == [["p0", "p1"], ["p9"]]
+
+    def test_filters_parts(self, path_csv):
+        extractor = CSVExtractor(columns=["amount"], filters=[["dep", "!=", 0]])
+        parts = [extractor.extract_part(**part) for part in extractor.plan_parts(path_csv, 3)]
+        assert pd.concat(parts)["amount"].tolist() == [1, 2, 4, 5, 7, 8]
+        assert all(list(part.columns) == ["amount"] for part in parts)
+
+    def test_filters_with_pyarrow_engine(self, path_csv):
+        df = CSVExtractor(engine="pyarrow", filters=[["amount", "<", 2]]).extract(path_csv)
+        assert df["label"].tolist() == ["p0", "p1"]
+
+    def test_filters_excel(self):
+        path = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.xlsx")
+        expected = pd.DataFrame(data=[[7, 7], [8, 8]], columns=["a", "b"])
+        assert_frame_equal(expected, Extractor(columns=["a", "b"], filters=[["c", "in", [7, 8]]]).extract(path))
+        chunks = Extractor(columns=["a", "b"], filters=[["c", "in", [7, 8]]]).extract_iter(path, chunksize=7)
+        assert_frame_equal(expected, pd.concat(chunks, ignore_index=True))
+
+    def test_raises_on_bad_filter(self):
+        with pytest.raises(ValueError, match="Bad filter"):
+            CSVExtractor(filters=[["dep", "~", 1]])
+
+
+class TestIncrementalExtraction:
+    @pytest.fixture
+    def log(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        with open(path, "w") as f:
+            f.write('id,message\n1,"multi\nline"\n2,b\n')
+        return path
+
+    @pytest.fixture
+    def extractor(self, tmp_path):
+        return CSVExtractor(checkpoints=str(tmp_path / "checkpoints.json"))
+
+    def test_only_appended_records_are_parsed_once_committed(self, log, extractor):
+        assert extractor.extract(log)["id"].tolist() == [1, 2]
+        assert extractor.extract(log)["id"].tolist() == [1, 2]  # nothing committed yet
+        extractor.commit(log)
+        with open(log, "a") as f:
+            f.write("3,c\n4,d\n")
+        assert_frame_equal(pd.DataFrame({"id": [3, 4], "message": ["c", "d"]}), extractor.extract(log))
+        extractor.commit(log)
+        assert extractor.extract(log).empty
+
+    def test_incomplete_record_left_for_next_run(self, log, extractor):
+        with open(log, "a") as f:
+            f.write('3,"unfinished\n')
+        assert extractor.extract(log)["id"].tolist() == [1, 2]
+        extractor.commit(log)
+        with open(log, "a") as f:
+            f.write('record"\n')
+        assert extractor.extract(log)["message"].tolist() == ["unfinished\nrecord"]
+
+    def test_rewritten_file_is_extracted_in_full(self, log, extractor, caplog):
+        extractor.extract(log)
+        extractor.commit(log)
+        with open(log, "w") as f:
+            f.write("id,message\n7,x\n8,y\n9,z\n")
+        assert extractor.extract(log)["id"].tolist() == [7, 8, 9]
+        assert "changed since its last extraction" in caplog.text
+
+    def test_extract_iter_from_checkpoint(self, log, extractor):
+        extractor.extract(log)
+        extractor.commit(log)
+        with open(log, "a") as f:
+            f.write("3,c\n4,d\n5,e\n")
+        assert [chunk["id"].tolist() for chunk in extractor.extract_iter(log, chunksize=2)] == [[3, 4], [5]]
+
+    def test_rejects_skiprows(self, log, extractor):
+        with pytest.raises(ValueError, match="skiprows cannot be combined with checkpoints"):
+            next(extractor.extract_iter(log, skiprows=1))
+
+    def test_extractor_commits_through_csv_extractor(self, log, tmp_path):
+        extractor = Extractor(checkpoints=CheckpointStore(str(tmp_path / "checkpoints.json")))
+        extractor.extract(log)
+        assert extractor.checkpoint(log)["offset"] == os.path.getsize(log)
+        extractor.commit(log)
+        assert extractor.extract(log).empty
+
+
+class TestCompressedExtraction:
+    @pytest.fixture(params=[".gz", ".bz2", ".xz", ".zst"])
+    def compressed_csv(self, request, tmp_path):
+        import zstandard
+        openers = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open, ".zst": zstandard.open}
+        path = str(tmp_path / f"test_init_df.csv{request.param}")
+        with open(os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv"), "rb") as source, \
+                openers[request.param](path, "wb") as target:
+            target.write(source.read())
+        return path
+
+    def test_extract(self, ex, compressed_csv):
+        path_csv = os.path.join(os.getcwd(), "tests", "fake_data", "test_init_df.csv")
+        assert_frame_equal(ex.extract(path_csv), ex.extract(compressed_csv))
+
+    def test_extract_iter(self, ex, compressed_csv):
+        assert [len(chunk) for chunk in ex.extract_iter(compressed_csv, chunksize=4)] == [4, 4, 1]
+
+    def test_pyarrow_engine(self, compressed_csv):
+        assert len(Extractor(engine="pyarrow").extract(compressed_csv, usecols=["a"])) == 9
+
+    def test_extracted_in_full_despite_checkpoints(self, compressed_csv, tmp_path):
+        extractor = CSVExtractor(checkpoints=str(tmp_path / "checkpoints.json"))
+        extractor.extract(compressed_csv)
+        extractor.commit(compressed_csv)
+        assert len(extractor.extract(compressed_csv)) == 9
+
+    def test_raises_on_compressed_excel(self, ex):
+        with pytest.raises(ValueError, match="Only csv files can be extracted from compressed files"):
+            ex.extract("/data/file.xlsx.gz")
+
+    def test_cannot_parse_by_parts(self, csv, compressed_csv):
+        with pytest.raises(ValueError, match="cannot be parsed by parts"):
+            csv.plan_parts(compressed_csv, 2)
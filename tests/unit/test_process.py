@@ -11,6 +11,25 @@ class FakeExtractor:
     pass
 
 
+class NoChunksTransformer(pypel.transformers.BaseTransformer):
+    def transform(self, df):
+        return df
+
+
+class ChunksRecordingLoader(LoaderTest):
+    def __init__(self, es_conf, es_indice):
+        super().__init__(es_conf, es_indice)
+        self.chunks = []
+        self.frames = []
+
+    def _wrap_df_in_actions(self, df, batch_size=10000):
+        self.frames.append(len(df))
+        return super()._wrap_df_in_actions(df, batch_size)
+
+    def _bulk_into_elastic(self, actions):
+        self.chunks.append(len(list(actions)))
+
+
 def assert_process_called_with_es_indice_to_file1(_, file):
     assert file == "file1"
 
@@ -47,6 +66,27 @@ class TestProcessInstanciation:
         with pytest.raises(ValueError):
             pypel.processes.Process(transformer=[0, 0])
 
+    def test_chunksize_with_chunkable_classes_instanciates(self):
+        pypel.processes.Process(transformer=[pypel.transformers.Transformer(),
+                                             pypel.transformers.ColumnStripperTransformer()], chunksize=10)
+
+    def test_chunksize_rejects_transformer_without_chunks_support(self):
+        with pytest.raises(ValueError, match="Transformer NoChunksTransformer does not support chunks"):
+            pypel.processes.Process(transformer=[pypel.transformers.Transformer(), NoChunksTransformer()],
+                                    chunksize=10)
+
+    def test_chunksize_rejects_loader_without_chunks_support(self):
+        with pytest.raises(ValueError, match="Loader CSVWriter does not support chunks"):
+            pypel.processes.Process(loader=pypel.loaders.CSVWriter(), chunksize=10)
+
+    def test_chunksize_rejects_extractor_without_extract_iter(self):
+        class NoIterExtractor(pypel.extractors.BaseExtractor):
+            def extract(self, *args, **kwargs):
+                pass
+
+        with pytest.raises(ValueError, match="Extractor NoIterExtractor does not implement extract_iter"):
+            pypel.processes.Process(extractor=NoIterExtractor(), chunksize=10)
+
 
 class TestProcessMethods:
     def test_transform_instanced_no_args(self, df):
@@ -84,6 +124,164 @@ class TestProcessMethods:
         process.bulk(["file1", "file2"])
         assert processed_dic == {"file1": "test_indice", "file2": "test_indice"}
 
+    def test_inplace_transformers_own_the_dataframe(self, df):
+        transformer = pypel.transformers.Transformer(date_format="", date_columns=[])
+        process = pypel.processes.Process(transformer=[transformer], inplace=True)
+        assert process.transformer[0].inplace
+        assert process.transform(df) is df
+
+    def test_inplace_leaves_passed_transformers_unchanged(self, df):
+        transformer = pypel.transformers.Transformer(date_format="", date_columns=[])
+        pypel.processes.Process(transformer=transformer, inplace=True)
+        assert not transformer.inplace
+        assert transformer.transform(df) is not df
+
+    def test_default_transformers_copy_the_dataframe(self, df):
+        process = pypel.processes.Process(transformer=[pypel.transformers.Transformer(date_format="", date_columns=[])])
+        assert process.transform(df) is not df
+
+    def test_process_streams_by_chunks(self, es_conf, es_indice):
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=pypel.transformers.ColumnStripperTransformer(), loader=loader,
+                                          chunksize=4)
+        process.process("tests/fake_data/test_init_df.csv")
+        assert loader.chunks == [9]
+        assert loader.frames == [4, 4, 1]
+
+    def test_process_in_parts(self, es_conf, es_indice):
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()], loader=loader,
+                                          parts=3, workers=2)
+        process.process("tests/fake_data/test_init_df.csv")
+        assert loader.chunks == [9]
+
+    def test_parts_rejects_extractor_without_plan_parts(self):
+        with pytest.raises(ValueError, match="Extractor Extractor does not implement plan_parts"):
+            pypel.processes.Process(extractor=pypel.extractors.Extractor(), parts=2)
+
+    def test_process_commits_incremental_extraction_once_loaded(self, tmp_path, es_conf, es_indice):
+        path = str(tmp_path / "log.csv")
+        with open(path, "w") as f:
+            f.write("a,b\n1,2\n")
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        extractor = pypel.extractors.CSVExtractor(checkpoints=str(tmp_path / "checkpoints.json"))
+        process = pypel.processes.Process(extractor=extractor,
+                                          transformer=pypel.transformers.ColumnStripperTransformer(), loader=loader)
+        process.process(path)
+        with open(path, "a") as f:
+            f.write("3,4\n5,6\n")
+        process.bulk([path], workers=2)
+        process.process(path)
+        assert loader.chunks == [1, 2, 0]
+
+    @pytest.mark.parametrize("chunksize", [None, 1])
+    def test_process_does_not_commit_if_documents_failed_to_load(self, tmp_path, es_conf, es_indice, chunksize):
+        path = str(tmp_path / "log.csv")
+        with open(path, "w") as f:
+            f.write("a,b\n1,2\n")
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        loader._bulk_into_elastic = lambda actions: len(list(actions))  # every document fails
+        extractor = pypel.extractors.CSVExtractor(checkpoints=str(tmp_path / "checkpoints.json"))
+        process = pypel.processes.Process(extractor=extractor, loader=loader, chunksize=chunksize,
+                                          transformer=pypel.transformers.ColumnStripperTransformer())
+        process.process(path)
+        assert extractor.checkpoints.get(path) is None
+
+    def test_bulk_reports_failures_without_aborting(self, monkeypatch, es_conf, es_indice):
+        processed = []
+
+        def mock_process_failing_on_file1(_, file):
+            if file == "file1":
+                raise ValueError("bad file")
+            processed.append(file)
+
+        monkeypatch.setattr(pypel.processes.Process, "process", mock_process_failing_on_file1)
+        process = pypel.processes.Process(transformer=pypel.transformers.Transformer(),
+                                          loader=pypel.loaders.Loader(es_conf, es_indice))
+        failures = process.bulk(["file1", "file2"], continue_on_error=True)
+        assert processed == ["file2"]
+        assert list(failures) == ["file1"]
+
+    def test_bulk_raises_first_failure_by_default(self, monkeypatch, es_conf, es_indice):
+        processed = []
+
+        def mock_process_failing_on_file1(_, file):
+            if file == "file1":
+                raise ValueError("bad file")
+            processed.append(file)
+
+        monkeypatch.setattr(pypel.processes.Process, "process", mock_process_failing_on_file1)
+        process = pypel.processes.Process(transformer=pypel.transformers.Transformer(),
+                                          loader=pypel.loaders.Loader(es_conf, es_indice))
+        with pytest.raises(ValueError, match="bad file"):
+            process.bulk(["file1", "file2"])
+        assert processed == []
+
+    def test_bulk_in_parallel_raises_failure_by_default(self, es_conf, es_indice):
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()],
+                                          loader=ChunksRecordingLoader(es_conf, es_indice))
+        with pytest.raises(FileNotFoundError):
+            process.bulk(["tests/fake_data/does_not_exist.csv"], workers=2)
+
+    def test_bulk_in_parallel_rejects_chunksize(self, es_conf, es_indice):
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()],
+                                          loader=ChunksRecordingLoader(es_conf, es_indice), chunksize=2)
+        with pytest.raises(ValueError, match="chunksize cannot be combined with more than 1 worker"):
+            process.bulk(["tests/fake_data/test_init_df.csv"], workers=2)
+
+    def test_bulk_in_parallel(self, es_conf, es_indice):
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()], loader=loader)
+        failures = process.bulk(["tests/fake_data/test_init_df.csv", "tests/fake_data/does_not_exist.csv",
+                                 "tests/fake_data/test_bad_filename$.csv"], workers=2, max_in_flight=2,
+                                continue_on_error=True)
+        assert list(failures) == ["tests/fake_data/does_not_exist.csv"]
+        assert loader.chunks == [9, 9]
+
+    def test_bulk_pipelined(self, es_conf, es_indice):
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()], loader=loader)
+        failures = process.bulk(["tests/fake_data/test_init_df.csv", "tests/fake_data/does_not_exist.csv",
+                                 "tests/fake_data/test_bad_filename$.csv"], pipelined=True, max_in_flight=1,
+                                continue_on_error=True)
+        assert list(failures) == ["tests/fake_data/does_not_exist.csv"]
+        assert loader.chunks == [9, 9]
+
+    def test_bulk_pipelined_stops_extracting_after_failure_by_default(self, es_conf, es_indice, mocker):
+        spy = mocker.spy(pypel.processes.Process, "extract")
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()], loader=loader)
+        file_list = ["tests/fake_data/does_not_exist.csv"] + ["tests/fake_data/test_init_df.csv"] * 20
+        with pytest.raises(FileNotFoundError):
+            process.bulk(file_list, pipelined=True, max_in_flight=1)
+        assert loader.chunks == []
+        assert spy.call_count < len(file_list)
+
+    def test_bulk_pipelined_by_chunks(self, es_conf, es_indice):
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=[pypel.transformers.ColumnStripperTransformer()], loader=loader,
+                                          chunksize=2, pipelined=True)
+        failures = process.bulk(["tests/fake_data/test_init_df.csv", "tests/fake_data/test_bad_filename$.csv"])
+        assert failures == {}
+        assert loader.chunks == [9, 9]
+
+    def test_bulk_pipelined_drops_rest_of_file_if_transform_fails(self, es_conf, es_indice):
+        class FailingOnceTransformer(pypel.transformers.ColumnStripperTransformer):
+            calls = 0
+
+            def transform(self, df):
+                FailingOnceTransformer.calls += 1
+                if FailingOnceTransformer.calls == 2:
+                    raise ValueError("bad chunk")
+                return df
+
+        loader = ChunksRecordingLoader(es_conf, es_indice)
+        process = pypel.processes.Process(transformer=[FailingOnceTransformer()], loader=loader, chunksize=4)
+        failures = process.bulk(["tests/fake_data/test_init_df.csv", "tests/fake_data/test_bad_filename$.csv"],
+                                pipelined=True, continue_on_error=True)
+        assert list(failures) == ["tests/fake_data/test_init_df.csv"]
+        assert loader.chunks == [9]
+
     def test_single_bulk_with_single_file(self, monkeypatch, es_conf, es_indice):
         process = pypel.processes.Process(transformer=pypel.transformers.Transformer(),
                                           loader=pypel.loaders.Loader(es_conf, es_indice))
@@ -1,11 +1,14 @@
 import pytest
 from pypel.transformers import (Transformer, ColumnStripperTransformer, ColumnReplacerTransformer,
                                 ContentReplacerTransformer, ColumnCapitaliserTransformer,
-                                ColumnContenStripperTransformer, MergerTransformer,
-                                NullValuesReplacerTransformer, DateParserTransformer, DateFormatterTransformer)
+                                ColumnContenStripperTransformer, MergerTransformer, ElementWiseTransformer,
+                                NullValuesReplacerTransformer, DateParserTransformer, DateFormatterTransformer,
+                                ReferentialCache, get_referential_cache, ReferentialStore, StoreMergerTransformer)
 from pypel.extractors import Extractor
+import concurrent.futures
 import os
-from pandas import DataFrame, NA, NaT, to_datetime
+import pickle
+from pandas import DataFrame, Series, NA, NaT, to_datetime
 from numpy import nan
 from pandas.testing import assert_frame_equal
 
@@ -42,6 +45,10 @@ class TestTransformer:
         with pytest.warns(UserWarning):
             transformer._format_dates(df)
 
+    def test_format_na_replaces_nulls_by_none(self, transformer):
+        actual = transformer._format_na(DataFrame({"0": [nan, 1.0], "1": ["a", NA]}))
+        assert actual.to_dict(orient="list") == {"0": [None, 1.0], "1": ["a", None]}
+
     def test_merge_referential_passing_dataframe(self, df, transformer):
         transformer.merge_referential(df, mergekey="0", referential=df)
 
@@ -98,6 +105,15 @@ class TestAtomicTransformers:
         actual = tr.transform(DataFrame(data=[[NA], [NaT], [nan]], columns=[0]))
         assert_frame_equal(expected, actual)
 
+    def test_null_values_replacer_per_dtype(self):
+        tr = NullValuesReplacerTransformer()
+        actual = tr.transform(DataFrame({"int": [1, 2], "float": [1.5, nan], "date": [to_datetime("2020-01-01"), NaT],
+                                         "nullable": Series([1, NA], dtype="Int64")}))
+        assert actual["int"].dtype == "int64"
+        assert actual["float"].tolist() == [1.5, None]
+        assert actual["date"].tolist() == [to_datetime("2020-01-01"), None]
+        assert actual["nullable"].tolist() == [1, None]
+
     def test_date_parser(self):
         tr = DateParserTransformer()
         expected = DataFrame(data=[[to_datetime("13-01-1970")]], columns=["to_parse"])
@@ -117,6 +133,89 @@ class TestAtomicTransformers:
             tr.transform(DataFrame(data=[["22 01 1970"]], columns=["to_format"]), ["to_format"])
 
 
+class TestContentReplacer:
+    @pytest.fixture
+    def contents(self):
+        return DataFrame({"text": ["a.b", "abc", None, "xyz", "ab-ab"],
+                          "other": ["abc", "cab", "b", "a", nan],
+                          "number": [1, 2, 3, 4, 5]})
+
+    @pytest.mark.parametrize("replace_dict", [
+        {"a": "b"},
+        {"a": "b", "b": "c"},
+        {"a": "x", "y": "z"},
+        {r"\.": "-", "ab": "ba"},
+        {r"(a)(b)": r"\2\1"},
+        {"^abc$": nan, "b": "B"},
+        {"x": 1, "a": "A"},
+    ])
+    def test_same_as_pandas_replace(self, contents, replace_dict):
+        expected = contents.replace(replace_dict, regex=True)
+        actual = ContentReplacerTransformer(replace_dict).transform(contents)
+        assert_frame_equal(expected, actual)
+
+    def test_non_str_keys_fall_back_to_pandas(self, contents):
+        expected = contents.replace({1: 10, "a": "A"}, regex=True)
+        actual = ContentReplacerTransformer({1: 10, "a": "A"}).transform(contents)
+        assert_frame_equal(expected, actual)
+
+    def test_only_replaces_passed_columns(self, contents):
+        expected = contents.copy()
+        expected["other"] = expected["other"].replace({"a": "A"}, regex=True)
+        actual = ContentReplacerTransformer({"a": "A"}, columns=["other"]).transform(contents)
+        assert_frame_equal(expected, actual)
+
+    def test_does_not_modify_passed_dataframe(self, contents):
+        expected = contents.copy()
+        ContentReplacerTransformer({"a": "A"}).transform(contents)
+        assert_frame_equal(expected, contents)
+
+    def test_duplicated_column_names(self, contents):
+        contents.columns = ["text", "text", "number"]
+        expected = contents.replace({"a": "A"}, regex=True)
+        actual = ContentReplacerTransformer({"a": "A"}).transform(contents)
+        assert_frame_equal(expected, actual)
+
+    def test_categorical_columns(self):
+        df = DataFrame({"text": Series(["ab", "b", "ab"], dtype="category")})
+        expected = df.replace({"a": "A"}, regex=True)
+        actual = ContentReplacerTransformer({"a": "A"}).transform(df)
+        assert_frame_equal(expected, actual)
+
+    def test_warns_if_column_not_in_df(self, contents):
+        with pytest.warns(UserWarning, match="No such column not_in_df in passed dataframe"):
+            ContentReplacerTransformer({"a": "A"}, columns=["not_in_df"]).transform(contents)
+
+    def test_transformer_replace_columns(self, contents):
+        expected = contents.copy()
+        expected["text"] = expected["text"].replace({"a": "A"}, regex=True)
+        actual = Transformer(df_replace={"a": "A"}, replace_columns=["text"])._format_contents(contents.copy())
+        assert_frame_equal(expected, actual)
+
+
+class TestDates:
+    @pytest.fixture
+    def dates(self):
+        return Series(to_datetime(["2021-03-04 05:06:07", None, "1999-12-31", "2021-03-04 05:06:07"]), name="date")
+
+    @pytest.mark.parametrize("date_format", ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y", "%d/%m/%Y %H:%M"])
+    def test_formatter_same_as_strftime(self, dates, date_format):
+        expected = DataFrame({"date": dates.dt.strftime(date_format)})
+        actual = DateFormatterTransformer().transform(DataFrame({"date": dates}), ["date"], date_format)
+        assert_frame_equal(expected, actual)
+
+    def test_formatter_timezone_aware(self, dates):
+        dates = dates.dt.tz_localize("Europe/Paris")
+        expected = DataFrame({"date": dates.dt.strftime("%Y-%m-%d %z")})
+        actual = DateFormatterTransformer().transform(DataFrame({"date": dates}), ["date"], "%Y-%m-%d %z")
+        assert_frame_equal(expected, actual)
+
+    def test_transformer_formats_dates(self, dates):
+        expected = DataFrame({"date": dates.dt.strftime("%d/%m/%Y")})
+        actual = Transformer(date_format="%d/%m/%Y", date_columns=["date"])._format_dates(DataFrame({"date": dates}))
+        assert_frame_equal(expected, actual)
+
+
 class TestColumnContentStripper:
     def test_column_content_stripping(self):
         tr = ColumnContenStripperTransformer()
@@ -135,8 +234,204 @@ class TestColumnContentStripper:
             tr.transform(DataFrame(data=[[0]], columns=["not_str"]), columns_to_strip=["not_str"])
 
 
+class TestElementWiseTransformer:
+    class Upper(ElementWiseTransformer):
+        calls = 0
+
+        def transform_value(self, value):
+            self.calls += 1
+            return value.upper()
+
+    def test_calls_function_once_per_distinct_value(self):
+        tr = self.Upper(columns=["text"])
+        df = DataFrame({"text": ["a", "b", "a", None, "b", "a"]})
+        expected = DataFrame({"text": ["A", "B", "A", None, "B", "A"]})
+        assert_frame_equal(expected, tr.transform(df))
+        assert tr.calls == 2
+
+    def test_cache_kept_across_calls(self):
+        tr = self.Upper(columns=["text"])
+        tr.transform(DataFrame({"text": ["a", "b"]}))
+        tr.transform(DataFrame({"text": ["b", "a", "c"]}))
+        assert tr.calls == 3
+
+    def test_cache_bounded(self):
+        tr = self.Upper(columns=["text"], cache_size=1)
+        tr.transform(DataFrame({"text": ["a", "b"]}))
+        assert len(tr._cache) == 1
+        tr.transform(DataFrame({"text": ["a"]}))
+        assert tr.calls == 3
+
+    def test_categorical_column(self):
+        tr = self.Upper(columns=["text"])
+        df = DataFrame({"text": Series(["a", "b", "a", None], dtype="category")})
+        expected = DataFrame({"text": Series(["A", "B", "A", None], dtype="category")})
+        assert_frame_equal(expected, tr.transform(df))
+
+    def test_mixed_types_mapped_value_by_value(self):
+        tr = ContentReplacerTransformer({"x": "X"})
+        actual = tr.transform(DataFrame({"mixed": [1, True, "x", 1.0]}))["mixed"].tolist()
+        assert [type(value) for value in actual] == [int, bool, str, float]
+
+    def test_does_not_modify_passed_dataframe(self):
+        df = DataFrame({"text": ["a"]})
+        self.Upper(columns=["text"]).transform(df)
+        assert_frame_equal(DataFrame({"text": ["a"]}), df)
+
+
 class TestMerger:
     def test_merge_with_self(self, df, merger):
         expected = df.copy()
         actual = merger.transform(df, mergekey="0", ref=df)
         assert_frame_equal(expected, actual)
+
+    def test_merge_with_referential_path(self, tmp_path):
+        DataFrame({"key": [1, 2], "label": ["a", "b"]}).to_csv(tmp_path / "ref.csv", index=False)
+        expected = DataFrame({"key": [2, 3], "label": ["b", nan]})
+        actual = MergerTransformer(str(tmp_path / "ref.csv"), "key", "left").transform(DataFrame({"key": [2, 3]}))
+        assert_frame_equal(expected, actual)
+
+    def test_raises_if_ref_is_not_path_nor_dataframe(self, df, merger):
+        with pytest.raises(ValueError, match="Pass a DataFrame, a string or an os.PathLike object"):
+            merger.transform(df, ref=0)
+
+
+class TestReferentialCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        get_referential_cache().clear()
+        yield
+        get_referential_cache().clear()
+
+    @pytest.fixture
+    def referential(self, tmp_path):
+        path = tmp_path / "ref.csv"
+        DataFrame({"key": [1, 2, 3], "key2": ["a", "a", "b"], "label": ["x", "y", "z"], "value": [1, 2, 3]}
+                  ).to_csv(path, index=False)
+        return str(path)
+
+    @pytest.fixture
+    def data(self):
+        return DataFrame({"key": [3, 1, 4, 1], "key2": ["b", "b", "a", "a"], "value": [0, 1, 2, 3]}, index=[5, 6, 7, 8])
+
+    @pytest.mark.parametrize("mergekey", ["key", ["key", "key2"]])
+    @pytest.mark.parametrize("how", ["left", "inner", "outer", "right"])
+    def test_same_as_merge(self, referential, data, mergekey, how):
+        ref = Extractor().extract(referential)
+        expected = data.merge(ref, how=how, on=mergekey)
+        cache = ReferentialCache()
+        for _ in range(2):
+            actual = cache.merge(data, referential, lambda: Extractor().extract(referential), Extractor(), {},
+                                 mergekey, how)
+            if how == "inner":  # pandas<2.2 groups inner merges by key
+                expected = expected.sort_values("value_x").reset_index(drop=True)
+            assert_frame_equal(expected, actual)
+
+    def test_extracts_once(self, referential, data, mocker):
+        spy = mocker.spy(Extractor, "extract")
+        transformer = Transformer()
+        for _ in range(3):
+            transformer.merge_referential(data, referential, "key", how="left")
+        assert spy.call_count == 1
+
+    def test_extracts_again_if_file_changed(self, referential, data, mocker):
+        spy = mocker.spy(Extractor, "extract")
+        MergerTransformer(referential, "key").transform(data)
+        stat = os.stat(referential)
+        os.utime(referential, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        MergerTransformer(referential, "key").transform(data)
+        assert spy.call_count == 2
+
+    def test_extracts_again_if_params_changed(self, referential, data, mocker):
+        spy = mocker.spy(Extractor, "extract")
+        MergerTransformer(referential, "key").transform(data)
+        MergerTransformer(referential, "key", dtype={"label": str}).transform(data)
+        assert spy.call_count == 2
+
+    def test_extracts_again_if_converters_changed(self, referential, data, mocker):
+        spy = mocker.spy(Extractor, "extract")
+        MergerTransformer(referential, "key", converters={"label": lambda x: x.upper()}).transform(data)
+        actual = MergerTransformer(referential, "key", converters={"label": lambda x: x * 2}).transform(data)
+        assert spy.call_count == 2
+        assert sorted(actual["label"]) == ["xx", "xx", "zz"]
+
+    def test_extracts_again_if_extractor_configuration_changed(self, referential, data):
+        transformer = Transformer()
+        filtered = transformer.merge_referential(data, referential, "key", how="inner",
+                                                 extractor=Extractor(filters=[["key", "==", 3]]))
+        selected = transformer.merge_referential(data, referential, "key", how="inner",
+                                                 extractor=Extractor(columns=["key", "label"]))
+        assert list(filtered["key"]) == [3]
+        assert list(selected.columns) == ["key", "key2", "value", "label"]
+        assert sorted(selected["label"]) == ["x", "x", "z"]
+
+    def test_evicts_least_recently_used(self, tmp_path, data):
+        cache = ReferentialCache(max_size=10 ** 6)
+        for i in range(3):
+            DataFrame({"key": [i]}).to_csv(tmp_path / f"{i}.csv", index=False)
+            cache.get(tmp_path / f"{i}.csv", lambda: DataFrame({"key": [i], "label": ["x" * 400000]}), None, {}, "key")
+        assert len(cache._entries) == 2
+        assert cache.size <= cache.max_size
+
+    def test_disabled(self, referential, data, mocker):
+        spy = mocker.spy(Extractor, "extract")
+        cache = ReferentialCache(max_size=0)
+        for _ in range(2):
+            cache.merge(data, referential, lambda: Extractor().extract(referential), Extractor(), {}, "key")
+        assert spy.call_count == 2
+
+
+class TestReferentialStore:
+    @pytest.fixture
+    def referential(self, tmp_path):
+        path = tmp_path / "ref.csv"
+        DataFrame({"key": ["1", "2", "3", "4"], "key2": [1, 1, 2, 2], "label": ["x", "y", "z", nan],
+                   "value": [1, 2, 3, nan], "flag": [True, False, True, True],
+                   "date": ["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-04"]}).to_csv(path, index=False)
+        return str(path)
+
+    @pytest.fixture
+    def data(self):
+        return DataFrame({"key": ["3", "1", "5", "1"], "key2": [2, 2, 1, 1], "other": [0, 1, 2, 3]})
+
+    @pytest.mark.parametrize("mergekey", ["key", ["key", "key2"]])
+    @pytest.mark.parametrize("how", ["left", "inner"])
+    def test_same_as_merge(self, tmp_path, referential, data, mergekey, how):
+        kwargs = {"converters": {"key": str}, "dates": ["date"]}
+        store = ReferentialStore.build(tmp_path / "ref.db", referential, mergekey, chunksize=2, **kwargs)
+        expected = data.merge(Extractor().extract(referential, **kwargs), how=how, on=mergekey)
+        actual = StoreMergerTransformer(store, how).transform(data)
+        sort = ["other"]
+        assert_frame_equal(expected.sort_values(sort).reset_index(drop=True),
+                           actual.sort_values(sort).reset_index(drop=True))
+
+    def test_lookup_only_returns_matching_rows(self, tmp_path, referential):
+        store = ReferentialStore.build(tmp_path / "ref.db", referential, "key", converters={"key": str})
+        assert store.lookup(DataFrame({"key": ["2", "2", None, "9"]}))["label"].tolist() == ["y"]
+
+    def test_build_raises_if_key_missing(self, tmp_path, referential):
+        with pytest.raises(ValueError, match=r"Merge keys \['missing'\] not found in referential"):
+            ReferentialStore.build(tmp_path / "ref.db", referential, "missing")
+        assert os.listdir(tmp_path) == ["ref.csv"]
+
+    def test_raises_if_store_not_built(self, tmp_path, data):
+        with pytest.raises(FileNotFoundError, match="No referential store at"):
+            StoreMergerTransformer(str(tmp_path / "ref.db")).transform(data)
+
+    def test_raises_if_unsupported_merge_type(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported merge type outer"):
+            StoreMergerTransformer(str(tmp_path / "ref.db"), "outer")
+
+    def test_picklable_once_used(self, tmp_path, referential, data):
+        transformer = StoreMergerTransformer(ReferentialStore.build(tmp_path / "ref.db", referential, "key2"))
+        expected = transformer.transform(data)
+        assert_frame_equal(expected, pickle.loads(pickle.dumps(transformer)).transform(data))
+
+    def test_usable_from_other_threads(self, tmp_path, referential, data):
+        transformer = StoreMergerTransformer(ReferentialStore.build(tmp_path / "ref.db", referential, "key2"))
+        expected = transformer.transform(data)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(transformer.transform, [data] * 4))
+        for actual in results:
+            assert_frame_equal(expected, actual)
+        transformer.store.close()